@@ -0,0 +1,97 @@
+"""Adaptiver Rate-Limiter für BookStack-Requests, gemeinsam genutzt von beiden Migrationsskripten."""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+class RateLimiter:
+    """Geteilter Token-Bucket für BookStack-Requests mit adaptiver Rate.
+
+    Die Rate steigt bei erfolgreichen Antworten langsam an (bis zur aus ``X-RateLimit-Limit`` abgeleiteten
+    Obergrenze), halbiert sich bei 429/503 und pausiert alle Threads, solange ``Retry-After`` es verlangt.
+    """
+
+    _shared: Dict[str, "RateLimiter"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, rate: float = 5.0, min_rate: float = 0.5, max_rate: float = 25.0, burst: float = 5.0):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_host(cls, base_url: str) -> "RateLimiter":
+        host = urlparse(base_url).netloc or base_url
+        with cls._shared_lock:
+            return cls._shared.setdefault(host, cls())
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_response(self, status_code: int, headers) -> None:
+        with self._lock:
+            limit = self._header_float(headers, "X-RateLimit-Limit")
+            remaining = self._header_float(headers, "X-RateLimit-Remaining")
+            if limit:
+                # BookStack zählt pro Minute; etwas Reserve für andere Clients lassen
+                self.max_rate = max(self.min_rate, limit / 60.0 * 0.9)
+
+            if status_code in (429, 503):
+                self.rate = max(self.min_rate, self.rate * 0.5)
+                retry_after = self._retry_after(headers)
+                if retry_after:
+                    self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            elif status_code < 400:
+                if limit and remaining is not None and remaining < limit * 0.1:
+                    self.rate = max(self.min_rate, self.rate * 0.8)
+                else:
+                    self.rate = min(self.max_rate, self.rate + 0.1)
+            self.rate = min(self.rate, self.max_rate)
+
+    def retry_delay(self, attempt: int, headers=None) -> float:
+        retry_after = self._retry_after(headers) if headers is not None else None
+        if retry_after:
+            return retry_after
+        return min(30.0, 0.5 * 2 ** attempt) * random.uniform(0.5, 1.5)
+
+    @staticmethod
+    def _header_float(headers, name: str) -> Optional[float]:
+        value = headers.get(name) if headers is not None else None
+        try:
+            return float(value) if value is not None else None
+        except (TypeError, ValueError):
+            return None
+
+    @classmethod
+    def _retry_after(cls, headers) -> Optional[float]:
+        seconds = cls._header_float(headers, "Retry-After")
+        if seconds is not None:
+            return max(0.0, seconds)
+        value = headers.get("Retry-After") if headers is not None else None
+        if not value:
+            return None
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            return None
@@ -1,20 +1,37 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
 import base64
+import hashlib
 import html
 import json
 import os
+import queue
 import re
+import sqlite3
 import sys
-import tempfile
+import threading
 import time
-from datetime import datetime
+import weakref
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Set
-from urllib.parse import parse_qs, urljoin, urlparse
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Set
+from urllib.parse import parse_qs, unquote, urlencode, urljoin, urlparse
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from bookstack_rate_limiter import RateLimiter
+
+# Verbindungspool je Session und Obergrenze gleichzeitiger Requests der Async-Clients (gemeinsam anheben)
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+# CQL wertet lastmodified in der Zeitzone des API-Users aus; die Überlappung deckt alle UTC-Offsets ab.
+SYNC_OVERLAP = timedelta(hours=14)
+# Mindestgröße der Queues zwischen den Pipeline-Stufen (begrenzt den Speicher für vorab geladene Seiten)
+PIPELINE_QUEUE_SIZE = 8
 
 
 @dataclass
@@ -29,12 +46,261 @@ class Config:
     book_name_prefix: str
 
 
+@dataclass(frozen=True)
+class PageFacts:
+    """Einmal je Seitenversion und Body ermittelte Kennzahlen des Confluence-Inhalts."""
+
+    has_view: bool
+    has_storage: bool
+    image_count: int  # eindeutige Bildquellen des Quell-HTML
+    text_length: int
+    sample: str
+    content_hash: str  # SHA-256 des Quell-HTML (View, sonst Storage) - zugleich Schlüssel der Storage-Konvertierung
+
+    @property
+    def has_content(self) -> bool:
+        return self.has_view or self.has_storage
+
+
+def _page_version(page: dict) -> Optional[int]:
+    version = (page.get("version") or {}).get("number")
+    try:
+        return int(version) if version is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_PIPELINE_DONE = object()
+
+
+class _OrderedQueue:
+    """Reorder-Puffer vor einer Stufe: gibt ``(position, wert)`` erst in Positionsreihenfolge weiter."""
+
+    def __init__(self, maxsize: int = 0) -> None:
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._pending: Dict[int, Tuple[int, object]] = {}
+        self._next_position = 0
+        self._lock = threading.Lock()
+
+    def put(self, task) -> None:
+        if task is _PIPELINE_DONE:
+            self._queue.put(task)
+            return
+        with self._lock:
+            self._pending[task[0]] = task
+            while self._next_position in self._pending:
+                self._queue.put(self._pending.pop(self._next_position))
+                self._next_position += 1
+
+    def get(self):
+        return self._queue.get()
+
+
+def run_pipeline(items: List, stages: List[Tuple], queue_size: int = PIPELINE_QUEUE_SIZE) -> List:
+    """Schickt ``items`` durch überlappende Stufen ``(funktion, threads[, geordnet])``, verbunden über begrenzte Queues.
+
+    Eine volle Queue bremst die vorherige Stufe (Backpressure). Stufen reichen Elemente in der Reihenfolge
+    weiter, in der sie fertig werden; eine Stufe mit ``geordnet=True`` bekommt sie über einen Reorder-Puffer
+    wieder in Eingabereihenfolge. Ergebnisse kommen in Eingabereihenfolge zurück; schlägt eine Stufe fehl,
+    durchläuft das Element die restlichen Stufen unverändert und der erste Fehler (nach Position) wird am
+    Ende erneut ausgelöst.
+    """
+    results: List = [None] * len(items)
+    errors: Dict[int, Exception] = {}
+    queues: List = [queue.Queue()] + [
+        _OrderedQueue(queue_size) if len(stage) > 2 and stage[2] else queue.Queue(maxsize=queue_size)
+        for stage in stages[1:]
+    ]
+    for position, item in enumerate(items):
+        queues[0].put((position, item))
+
+    def work(func: Callable, source, target) -> None:
+        while True:
+            task = source.get()
+            if task is _PIPELINE_DONE:
+                return
+            position, value = task
+            if position not in errors:
+                try:
+                    value = func(value)
+                except Exception as exc:
+                    errors[position] = exc
+            if target is None:
+                results[position] = value
+            else:
+                target.put((position, value))
+
+    stage_threads: List[List[threading.Thread]] = []
+    for index, (func, workers, *_) in enumerate(stages):
+        target = queues[index + 1] if index + 1 < len(stages) else None
+        threads = [
+            threading.Thread(target=work, args=(func, queues[index], target), daemon=True)
+            for _ in range(max(1, workers))
+        ]
+        for thread in threads:
+            thread.start()
+        stage_threads.append(threads)
+
+    for index, threads in enumerate(stage_threads):
+        for _ in threads:
+            queues[index].put(_PIPELINE_DONE)
+        for thread in threads:
+            thread.join()
+
+    if errors:
+        raise errors[min(errors)]
+    return results
+
+
+class PageCache:
+    """Lokaler SQLite-Cache für Confluence-Seiten, gültig je Seite und Versionsnummer.
+
+    Storage->View-Umwandlungen liegen inhaltsadressiert in einer eigenen Tabelle; ``max_bytes`` gilt je Tabelle.
+    """
+
+    # Tabelle -> Schlüsselspalte
+    TABLES = {"pages": "page_id", "conversions": "digest"}
+
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "page_id TEXT PRIMARY KEY, version INTEGER NOT NULL, payload TEXT NOT NULL, "
+            "size INTEGER NOT NULL, accessed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at);"
+            "CREATE TABLE IF NOT EXISTS conversions ("
+            "digest TEXT PRIMARY KEY, payload TEXT NOT NULL, size INTEGER NOT NULL, accessed_at REAL NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_conversions_accessed ON conversions (accessed_at);"
+            # Ältere Cache-Dateien legten Umwandlungen als Pseudo-Seiten "view:<digest>" ab
+            "DELETE FROM pages WHERE page_id LIKE 'view:%';"
+        )
+        self._conn.commit()
+        self._total_bytes: Dict[str, int] = {}
+        for table in self.TABLES:
+            row = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {table}").fetchone()
+            self._total_bytes[table] = int(row[0])
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, page_id: str, version: Optional[int]) -> Optional[dict]:
+        if version is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT version, payload FROM pages WHERE page_id = ?", (str(page_id),)
+            ).fetchone()
+            if row is not None and int(row[0]) != version:
+                self._delete("pages", str(page_id))
+                self._conn.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._touch("pages", str(page_id))
+        return json.loads(row[1])
+
+    def put(self, page: dict) -> None:
+        page_id = str(page.get("id", ""))
+        version = _page_version(page)
+        if not page_id or version is None:
+            return
+        self._put("pages", page_id, json.dumps(page, ensure_ascii=False), version=version)
+
+    def get_conversion(self, digest: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM conversions WHERE digest = ?", (digest,)).fetchone()
+            if row is None:
+                return None
+            self._touch("conversions", digest)
+        return row[0]
+
+    def put_conversion(self, digest: str, view_html: str) -> None:
+        self._put("conversions", digest, view_html)
+
+    def _touch(self, table: str, key: str) -> None:
+        self._conn.execute(
+            f"UPDATE {table} SET accessed_at = ? WHERE {self.TABLES[table]} = ?", (time.time(), key)
+        )
+        self._conn.commit()
+
+    def _put(self, table: str, key: str, payload: str, version: Optional[int] = None) -> None:
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._delete(table, key)
+            if table == "pages":
+                self._conn.execute(
+                    "INSERT INTO pages (page_id, version, payload, size, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                    (key, version, payload, size, time.time()),
+                )
+            else:
+                self._conn.execute(
+                    "INSERT INTO conversions (digest, payload, size, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, payload, size, time.time()),
+                )
+            self._total_bytes[table] += size
+            self._evict(table)
+            self._conn.commit()
+
+    def _delete(self, table: str, key: str) -> None:
+        column = self.TABLES[table]
+        row = self._conn.execute(f"SELECT size FROM {table} WHERE {column} = ?", (key,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+        self._total_bytes[table] -= int(row[0])
+
+    def _evict(self, table: str) -> None:
+        if self._total_bytes[table] <= self.max_bytes:
+            return
+        # Am längsten nicht genutzte Einträge entfernen, bis 90% des Limits erreicht sind
+        column = self.TABLES[table]
+        target = int(self.max_bytes * 0.9)
+        for key, size in self._conn.execute(f"SELECT {column}, size FROM {table} ORDER BY accessed_at").fetchall():
+            if self._total_bytes[table] <= target:
+                break
+            self._conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (key,))
+            self._total_bytes[table] -= int(size)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
 class ConfluenceClient:
-    def __init__(self, base_url: str, email: str, api_token: str):
+    PAGE_EXPAND = "body.storage,body.view,ancestors,version"
+    SKELETON_EXPAND = "ancestors,version"
+
+    # Prozessweiter Speicher des Space-Verzeichnisses je Base-URL: (Zeitpunkt, Key -> Space)
+    _space_directories: Dict[str, Tuple[float, Dict[str, dict]]] = {}
+    _space_directories_lock = threading.Lock()
+
+    def __init__(
+        self,
+        base_url: str,
+        email: str,
+        api_token: str,
+        cache: Optional[PageCache] = None,
+        space_directory_file: Optional[str] = None,
+        space_directory_ttl: int = 3600,
+    ):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
         auth = base64.b64encode(f"{email}:{api_token}".encode("utf-8")).decode("ascii")
         self.session.headers.update({"Authorization": f"Basic {auth}", "Accept": "application/json"})
+        self.cache = cache
+        self._known_versions: Dict[str, int] = {}
+        self._attachment_index: Dict[str, Dict[str, str]] = {}
+        self._attachment_lock = threading.Lock()
+        self._direct_download_denied = False
+        self.space_directory_file = Path(space_directory_file) if space_directory_file else None
+        self.space_directory_ttl = space_directory_ttl
 
     def _get_json(self, path: str, params: Optional[dict] = None) -> dict:
         url = f"{self.base_url}{path}"
@@ -43,6 +309,9 @@ class ConfluenceClient:
         return response.json()
 
     def get_space_name(self, space_key: str) -> str:
+        space = self.get_space_directory().get(space_key)
+        if space is not None:
+            return space.get("name") or space_key
         data = self._get_json(f"/wiki/rest/api/space/{space_key}")
         return data.get("name") or space_key
 
@@ -58,6 +327,51 @@ class ConfluenceClient:
             start += limit
         return spaces
 
+    def get_space_directory(self, refresh: bool = False) -> Dict[str, dict]:
+        """Space-Key -> Space aus einem einzigen list_all_spaces-Abruf, im Prozess und optional auf Platte gecacht."""
+        now = time.time()
+        with self._space_directories_lock:
+            memo = self._space_directories.get(self.base_url)
+        if memo is not None and not refresh and now - memo[0] < self.space_directory_ttl:
+            return memo[1]
+
+        fetched_at, directory = now, None
+        if not refresh:
+            fetched_at, directory = self._read_space_directory_file(now)
+        if directory is None:
+            fetched_at = now
+            directory = {space["key"]: space for space in self.list_all_spaces(limit=100) if space.get("key")}
+            self._write_space_directory_file(fetched_at, directory)
+
+        with self._space_directories_lock:
+            self._space_directories[self.base_url] = (fetched_at, directory)
+        return directory
+
+    def _read_space_directory_file(self, now: float) -> Tuple[float, Optional[Dict[str, dict]]]:
+        if self.space_directory_file is None or not self.space_directory_file.exists():
+            return now, None
+        try:
+            data = json.loads(self.space_directory_file.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return now, None
+        fetched_at = float(data.get("fetched_at", 0))
+        if data.get("base_url") != self.base_url or now - fetched_at >= self.space_directory_ttl:
+            return now, None
+        return fetched_at, {space["key"]: space for space in data.get("spaces", []) if space.get("key")}
+
+    def _write_space_directory_file(self, fetched_at: float, directory: Dict[str, dict]) -> None:
+        if self.space_directory_file is None:
+            return
+        spaces = [
+            {"key": space.get("key"), "name": space.get("name"), "type": space.get("type")}
+            for space in directory.values()
+        ]
+        payload = {"base_url": self.base_url, "fetched_at": fetched_at, "spaces": spaces}
+        try:
+            self.space_directory_file.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        except OSError as exc:
+            print(f"[WARN] Space-Verzeichnis konnte nicht gespeichert werden: {exc}", flush=True)
+
     def resolve_space_key(self, requested_space_key: str) -> str:
         requested = (requested_space_key or "").strip()
         if not requested:
@@ -74,6 +388,12 @@ class ConfluenceClient:
         if mapped:
             candidates.append(mapped)
 
+        directory = self.get_space_directory()
+        for candidate in candidates:
+            if candidate in directory:
+                return candidate
+
+        # Nicht im Verzeichnis (z. B. archivierte Spaces): einzeln prüfen
         seen: set[str] = set()
         for candidate in candidates:
             if candidate in seen:
@@ -90,9 +410,37 @@ class ConfluenceClient:
 
         raise RuntimeError(f"Confluence-Space nicht gefunden: {requested_space_key}")
 
-    def list_pages_in_space(self, space_key: str) -> List[dict]:
+    def list_pages_in_space(
+        self,
+        space_key: str,
+        include_body: bool = True,
+        modified_since: Optional[datetime] = None,
+    ) -> List[dict]:
         pages: List[dict] = []
-        limit = 50
+        for batch in self.iter_pages_in_space(space_key, include_body=include_body, modified_since=modified_since):
+            pages.extend(batch)
+        return pages
+
+    def iter_pages_in_space(
+        self,
+        space_key: str,
+        include_body: bool = True,
+        modified_since: Optional[datetime] = None,
+    ) -> Iterator[List[dict]]:
+        """Liefert die Seiten eines Space batchweise, sobald der jeweilige Cursor-Abruf vorliegt.
+
+        Mit ``include_body=False`` wird nur das Skelett (ID, Titel, Ancestors, Version) geladen;
+        die Seiten haben dann keinen ``body``-Schlüssel und werden bei Bedarf per get_page_detail ergänzt.
+        Ist ein Cache gesetzt, wird immer das Skelett gelistet und nur für geänderte Seiten der Body geladen.
+        Mit ``modified_since`` werden nur Seiten geliefert, die danach geändert wurden (CQL ``lastmodified``).
+        """
+        cql = f'space="{space_key}" and type=page'
+        if modified_since is not None:
+            cql += f' and lastmodified > "{modified_since.strftime("%Y/%m/%d %H:%M")}"'
+
+        use_cache = include_body and self.cache is not None
+        expand = self.PAGE_EXPAND if include_body and not use_cache else self.SKELETON_EXPAND
+        limit = 50 if expand == self.PAGE_EXPAND else 100
         cursor: Optional[str] = None
         seen_cursors: set[str] = set()
         seen_page_ids: set[str] = set()
@@ -107,8 +455,8 @@ class ConfluenceClient:
                 )
 
             params = {
-                "cql": f'space="{space_key}" and type=page',
-                "expand": "body.storage,body.view,ancestors",
+                "cql": cql,
+                "expand": expand,
                 "limit": limit,
             }
             if cursor:
@@ -121,19 +469,25 @@ class ConfluenceClient:
             if not batch:
                 break
 
-            new_items = 0
+            new_items: List[dict] = []
             for item in batch:
                 page_id = str(item.get("id", ""))
                 if page_id and page_id in seen_page_ids:
                     continue
                 if page_id:
                     seen_page_ids.add(page_id)
-                pages.append(item)
-                new_items += 1
+                new_items.append(item)
 
-            if new_items == 0:
+            if not new_items:
                 break
 
+            for item in new_items:
+                self._remember_version(item)
+            if use_cache:
+                new_items = self._attach_cached_bodies(new_items)
+
+            yield new_items
+
             links = data.get("_links", {})
             next_link = links.get("next") if isinstance(links, dict) else None
             if not next_link:
@@ -157,7 +511,35 @@ class ConfluenceClient:
             seen_cursors.add(next_cursor)
             cursor = next_cursor
 
-        return pages
+    def _remember_version(self, page: dict) -> None:
+        version = _page_version(page)
+        if version is not None:
+            self._known_versions[str(page.get("id", ""))] = version
+
+    def _attach_cached_bodies(self, items: List[dict]) -> List[dict]:
+        """Ersetzt Skelett-Einträge durch gecachte Seiten; fehlende Bodies werden per ``id in (...)`` nachgeladen."""
+        result: List[dict] = []
+        positions: Dict[str, int] = {}
+        for item in items:
+            page_id = str(item.get("id", ""))
+            cached = self.cache.get(page_id, _page_version(item))
+            if cached is None:
+                positions[page_id] = len(result)
+            result.append(cached if cached is not None else item)
+
+        missing = list(positions)
+        for start in range(0, len(missing), 50):
+            chunk = missing[start : start + 50]
+            data = self._get_json(
+                "/wiki/rest/api/content/search",
+                params={"cql": f"id in ({','.join(chunk)})", "expand": self.PAGE_EXPAND, "limit": len(chunk)},
+            )
+            for detail in data.get("results", []):
+                page_id = str(detail.get("id", ""))
+                if page_id in positions:
+                    self.cache.put(detail)
+                    result[positions[page_id]] = detail
+        return result
 
     def convert_storage_to_view(self, storage_html: str) -> str:
         url = f"{self.base_url}/wiki/rest/api/contentbody/convert/view"
@@ -168,10 +550,18 @@ class ConfluenceClient:
         return data.get("value", storage_html)
 
     def get_page_detail(self, page_id: str) -> dict:
-        return self._get_json(
+        if self.cache is not None:
+            cached = self.cache.get(str(page_id), self._known_versions.get(str(page_id)))
+            if cached is not None:
+                return cached
+
+        detail = self._get_json(
             f"/wiki/rest/api/content/{page_id}",
-            params={"expand": "body.storage,body.view,ancestors"},
+            params={"expand": self.PAGE_EXPAND},
         )
+        if self.cache is not None:
+            self.cache.put(detail)
+        return detail
 
     def _has_meaningful_content(self, html: str) -> bool:
         """Check if HTML has actual content beyond empty tags"""
@@ -186,14 +576,47 @@ class ConfluenceClient:
 
     def download_binary(self, url: str) -> bytes:
         final_url = url if url.startswith("http") else urljoin(self.base_url, url)
+        if self._direct_download_denied:
+            # Direkte Download-Links wurden bereits abgelehnt: gleich über den Attachment-Index gehen
+            fallback = self._download_via_attachment_api(final_url)
+            if fallback is not None:
+                return fallback
         response = self.session.get(final_url, timeout=120)
         if response.status_code in (401, 403):
+            self._direct_download_denied = True
             fallback = self._download_via_attachment_api(final_url)
             if fallback is not None:
                 return fallback
         response.raise_for_status()
         return response.content
 
+    def get_attachment_index(self, page_id: str) -> Dict[str, str]:
+        """Dateiname -> Attachment-ID für alle Anhänge einer Seite (einmal pro Seite geladen)."""
+        with self._attachment_lock:
+            cached = self._attachment_index.get(page_id)
+        if cached is not None:
+            return cached
+
+        index: Dict[str, str] = {}
+        limit = 100
+        start = 0
+        while True:
+            list_url = f"{self.base_url}/wiki/rest/api/content/{page_id}/child/attachment"
+            list_response = self.session.get(list_url, params={"limit": limit, "start": start}, timeout=60)
+            if list_response.status_code >= 400:
+                break
+            results = list_response.json().get("results", [])
+            for item in results:
+                title = item.get("title")
+                if title and item.get("id"):
+                    index.setdefault(title, str(item["id"]))
+            if len(results) < limit:
+                break
+            start += limit
+
+        with self._attachment_lock:
+            return self._attachment_index.setdefault(page_id, index)
+
     def _download_via_attachment_api(self, image_url: str) -> Optional[bytes]:
         decoded_url = html.unescape(image_url)
         match = re.search(r"/download/(?:thumbnails|attachments)/(\d+)/([^/?]+)", decoded_url)
@@ -201,17 +624,8 @@ class ConfluenceClient:
             return None
 
         page_id, filename = match.group(1), match.group(2)
-        list_url = f"{self.base_url}/wiki/rest/api/content/{page_id}/child/attachment"
-        list_response = self.session.get(list_url, params={"filename": filename, "limit": 25}, timeout=60)
-        if list_response.status_code >= 400:
-            return None
-
-        data = list_response.json()
-        results = data.get("results", [])
-        if not results:
-            return None
-
-        attachment_id = results[0].get("id")
+        index = self.get_attachment_index(page_id)
+        attachment_id = index.get(filename) or index.get(unquote(filename))
         if not attachment_id:
             return None
 
@@ -222,10 +636,169 @@ class ConfluenceClient:
         return download_response.content
 
 
+class StorageConverter:
+    """Wandelt Storage-XHTML parallel in View-HTML um und merkt sich Ergebnisse per Inhalts-Hash."""
+
+    def __init__(self, conf: ConfluenceClient, workers: int = 4, cache: Optional[PageCache] = None):
+        self.conf = conf
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers))
+        self._lock = threading.Lock()
+        self._results: Dict[str, str] = {}
+        self._pending: Dict[str, Future] = {}
+
+    @staticmethod
+    def _digest(storage_html: str) -> str:
+        return hashlib.sha256(storage_html.encode("utf-8")).hexdigest()
+
+    def submit(self, storage_html: str, digest: Optional[str] = None) -> None:
+        """Startet die Umwandlung im Hintergrund, sofern das Ergebnis noch nicht bekannt ist."""
+        digest = digest or self._digest(storage_html)
+        with self._lock:
+            if digest in self._results or digest in self._pending:
+                return
+            self._pending[digest] = self._pool.submit(self._convert, digest, storage_html)
+
+    def convert(self, storage_html: str, digest: Optional[str] = None) -> str:
+        """Liefert das View-HTML; bei Fehlern wird wie bisher das Storage-HTML zurückgegeben."""
+        digest = digest or self._digest(storage_html)
+        with self._lock:
+            if digest in self._results:
+                return self._results[digest]
+            future = self._pending.get(digest)
+        if future is not None:
+            return future.result()
+        return self._convert(digest, storage_html)
+
+    def _convert(self, digest: str, storage_html: str) -> str:
+        view_html = self.cache.get_conversion(digest) if self.cache is not None else None
+        if view_html is None:
+            try:
+                view_html = self.conf.convert_storage_to_view(storage_html)
+            except Exception as exc:
+                print(f"  [WARN] Storage-Konvertierung fehlgeschlagen: {exc}", flush=True)
+                view_html = storage_html
+            else:
+                if self.cache is not None:
+                    self.cache.put_conversion(digest, view_html)
+        with self._lock:
+            self._results[digest] = view_html
+            self._pending.pop(digest, None)
+        return view_html
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+class BookStackCatalog:
+    """Einmal vollständig geladene Books, Chapters und Shelves mit Namens- und ID-Index.
+
+    Jede Art wird beim ersten Zugriff komplett (paginiert) geladen und danach bei Create/Update/Delete
+    über den BookStackClient aktuell gehalten.
+    """
+
+    KINDS = {"books": "/api/books", "chapters": "/api/chapters", "shelves": "/api/shelves"}
+
+    def __init__(self, bs: "BookStackClient"):
+        self.bs = bs
+        self._lock = threading.RLock()
+        self._by_id: Dict[str, Dict[int, dict]] = {}
+        self._by_name: Dict[str, Dict[object, dict]] = {}
+        self._book_chapters: Dict[int, Dict[str, dict]] = {}
+
+    def _name_key(self, kind: str, item: dict) -> object:
+        if kind == "chapters":
+            return (int(item.get("book_id", -1)), item.get("name"))
+        return item.get("name")
+
+    def _ensure(self, kind: str) -> None:
+        with self._lock:
+            if kind in self._by_id:
+                return
+            items = get_all_bookstack_items(self.bs, self.KINDS[kind])
+            self._by_id[kind] = {}
+            self._by_name[kind] = {}
+            for item in items:
+                self._add(kind, item)
+
+    def _add(self, kind: str, item: dict) -> None:
+        item_id = int(item.get("id", -1))
+        previous = self._by_id[kind].get(item_id)
+        if previous is not None and self._by_name[kind].get(self._name_key(kind, previous)) is previous:
+            del self._by_name[kind][self._name_key(kind, previous)]
+        self._by_id[kind][item_id] = item
+        self._by_name[kind].setdefault(self._name_key(kind, item), item)
+
+    def all(self, kind: str) -> List[dict]:
+        self._ensure(kind)
+        with self._lock:
+            return list(self._by_id[kind].values())
+
+    def get(self, kind: str, item_id: int) -> Optional[dict]:
+        self._ensure(kind)
+        with self._lock:
+            return self._by_id[kind].get(int(item_id))
+
+    def find(self, kind: str, name: str, book_id: Optional[int] = None) -> Optional[dict]:
+        self._ensure(kind)
+        key = (int(book_id), name) if kind == "chapters" else name
+        with self._lock:
+            return self._by_name[kind].get(key)
+
+    def book_chapters(self, book_id: int, refresh: bool = False) -> Dict[str, dict]:
+        """Chapter eines Books (aus ``/api/books/{id}``), indiziert nach normalisiertem Namen."""
+        book_id = int(book_id)
+        with self._lock:
+            cached = self._book_chapters.get(book_id)
+        if cached is not None and not refresh:
+            return cached
+
+        detail = self.bs._request("GET", f"/api/books/{book_id}")
+        chapters: Dict[str, dict] = {}
+        for item in detail.get("contents", []):
+            if item.get("type") == "chapter":
+                chapters.setdefault(normalize_title_key(item.get("name", "")), item)
+        with self._lock:
+            self._book_chapters[book_id] = chapters
+        return chapters
+
+    def upsert(self, kind: str, item: dict) -> None:
+        with self._lock:
+            if kind == "chapters" and item.get("book_id") is not None:
+                contents = self._book_chapters.get(int(item["book_id"]))
+                if contents is not None:
+                    contents.setdefault(normalize_title_key(item.get("name", "")), item)
+            if kind in self._by_id and item.get("id") is not None:
+                self._add(kind, item)
+
+    def remove(self, kind: str, item_id: int) -> None:
+        with self._lock:
+            if kind == "chapters":
+                for contents in self._book_chapters.values():
+                    for name_key, chapter in list(contents.items()):
+                        if int(chapter.get("id", -1)) == int(item_id):
+                            del contents[name_key]
+            if kind not in self._by_id:
+                return
+            item = self._by_id[kind].pop(int(item_id), None)
+            if item is None:
+                return
+            name_key = self._name_key(kind, item)
+            if self._by_name[kind].get(name_key) is item:
+                del self._by_name[kind][name_key]
+                # Nächsten Eintrag mit gleichem Namen nachrücken lassen
+                for other in self._by_id[kind].values():
+                    if self._name_key(kind, other) == name_key:
+                        self._by_name[kind][name_key] = other
+                        break
+
+
 class BookStackClient:
     def __init__(self, base_url: str, token_id: str, token_secret: str):
         self.base_url = base_url.rstrip("/")
         self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
+        self.session.mount("http://", HTTPAdapter(pool_maxsize=HTTP_POOL_SIZE))
         self.session.headers.update(
             {
                 "Authorization": f"Token {token_id}:{token_secret}",
@@ -233,20 +806,44 @@ class BookStackClient:
                 "Content-Type": "application/json",
             }
         )
+        self.catalog = BookStackCatalog(self)
+        self.limiter = RateLimiter.for_host(self.base_url)
 
-    def _request(self, method: str, path: str, json_data: Optional[dict] = None) -> dict:
+    def _request(
+        self,
+        method: str,
+        path: str,
+        json_data: Optional[dict] = None,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        timeout: int = 60,
+    ) -> dict:
         url = f"{self.base_url}{path}"
         max_attempts = 6
+        # Formular-/Multipart-Requests: Session-Default "application/json" entfernen, requests setzt den Typ selbst.
+        headers = {"Content-Type": None} if data is not None or files is not None else None
 
         for attempt in range(1, max_attempts + 1):
             try:
-                response = self.session.request(method=method, url=url, json=json_data, timeout=60)
+                self.limiter.acquire()
+                response = self.session.request(
+                    method=method,
+                    url=url,
+                    json=json_data,
+                    data=data,
+                    files=files,
+                    headers=headers,
+                    timeout=timeout,
+                )
+                self.limiter.on_response(response.status_code, response.headers)
                 if response.status_code in (429, 500, 502, 503, 504) and attempt < max_attempts:
+                    delay = self.limiter.retry_delay(attempt, response.headers)
                     print(
-                        f"[BookStack] Retry {attempt}/{max_attempts} ({response.status_code}) {method} {path}",
+                        f"[BookStack] Retry {attempt}/{max_attempts} ({response.status_code}) {method} {path} "
+                        f"in {delay:.1f}s",
                         flush=True,
                     )
-                    time.sleep(min(2 * attempt, 10))
+                    time.sleep(delay)
                     continue
 
                 response.raise_for_status()
@@ -256,20 +853,17 @@ class BookStackClient:
             except (requests.Timeout, requests.ConnectionError) as exc:
                 if attempt >= max_attempts:
                     raise
+                delay = self.limiter.retry_delay(attempt)
                 print(
-                    f"[BookStack] Retry {attempt}/{max_attempts} ({type(exc).__name__}) {method} {path}",
+                    f"[BookStack] Retry {attempt}/{max_attempts} ({type(exc).__name__}) {method} {path} in {delay:.1f}s",
                     flush=True,
                 )
-                time.sleep(min(2 * attempt, 10))
+                time.sleep(delay)
 
         raise RuntimeError(f"BookStack request failed after {max_attempts} attempts: {method} {path}")
 
     def find_book_by_name(self, name: str) -> Optional[dict]:
-        data = self._request("GET", "/api/books?count=500")
-        for item in data.get("data", []):
-            if item.get("name") == name:
-                return item
-        return None
+        return self.catalog.find("books", name)
 
     def _trim_name(self, name: str, context: str) -> str:
         cleaned = (name or "").strip()
@@ -283,22 +877,32 @@ class BookStackClient:
 
     def create_book(self, name: str, description: str = "") -> dict:
         safe_name = self._trim_name(name, "book")
-        return self._request("POST", "/api/books", {"name": safe_name, "description": description})
+        book = self._request("POST", "/api/books", {"name": safe_name, "description": description})
+        self.catalog.upsert("books", book)
+        return book
+
+    def delete_book(self, book_id: int) -> None:
+        self._request("DELETE", f"/api/books/{book_id}")
+        self.catalog.remove("books", book_id)
 
-    def find_chapter_in_book(self, book_id: int, name: str) -> Optional[dict]:
-        """Find a chapter by name in a specific book"""
+    def find_chapter_in_book(self, book_id: int, name: str, refresh: bool = False) -> Optional[dict]:
+        """Find a chapter by name in a specific book (book contents are fetched once per book)"""
         try:
-            book_detail = self._request("GET", f"/api/books/{book_id}")
-            for item in book_detail.get("contents", []):
-                if item.get("type") == "chapter" and item.get("name") == name:
-                    return item
+            return self.catalog.book_chapters(book_id, refresh=refresh).get(normalize_title_key(name))
         except Exception:
-            pass
-        return None
+            return None
 
     def create_chapter(self, book_id: int, name: str, description: str = "") -> dict:
         safe_name = self._trim_name(name, "chapter")
-        return self._request("POST", "/api/chapters", {"book_id": book_id, "name": safe_name, "description": description})
+        chapter = self._request(
+            "POST", "/api/chapters", {"book_id": book_id, "name": safe_name, "description": description}
+        )
+        self.catalog.upsert("chapters", chapter)
+        return chapter
+
+    def delete_chapter(self, chapter_id: int) -> None:
+        self._request("DELETE", f"/api/chapters/{chapter_id}")
+        self.catalog.remove("chapters", chapter_id)
 
     def create_page(self, name: str, html: str, book_id: Optional[int] = None, chapter_id: Optional[int] = None) -> dict:
         safe_html = html if html and html.strip() else "<p></p>"
@@ -325,34 +929,19 @@ class BookStackClient:
             if status != 422:
                 raise
 
-            url = f"{self.base_url}/api/pages/{page_id}"
-            headers = {"Authorization": self.session.headers["Authorization"], "Accept": "application/json"}
-            response = requests.put(url, headers=headers, data={"name": safe_name, "html": html}, timeout=60)
-            response.raise_for_status()
-            if response.text.strip():
-                return response.json()
-            return {}
+            return self._request("PUT", f"/api/pages/{page_id}", data={"name": safe_name, "html": html})
 
     def upload_gallery_image(self, page_id: int, filename: str, binary: bytes) -> str:
-        url = f"{self.base_url}/api/image-gallery"
-        headers = {"Authorization": self.session.headers["Authorization"], "Accept": "application/json"}
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            tmp.write(binary)
-            tmp_path = tmp.name
+        # Bytes statt Dateiobjekt: der Body kann bei Retries erneut aufgebaut werden.
+        files = {"image": (filename, binary)}
+        data = {"uploaded_to": str(page_id), "type": "gallery", "name": filename}
+        result = self._request("POST", "/api/image-gallery", data=data, files=files, timeout=120)
+        return result["url"]
 
-        try:
-            with open(tmp_path, "rb") as file_obj:
-                files = {"image": (filename, file_obj)}
-                data = {"uploaded_to": str(page_id), "type": "gallery", "name": filename}
-                response = requests.post(url, headers=headers, files=files, data=data, timeout=120)
-                response.raise_for_status()
-                result = response.json()
-                return result["url"]
-        finally:
-            try:
-                os.remove(tmp_path)
-            except OSError:
-                pass
+    def gallery_image_exists(self, url: str) -> bool:
+        """Sucht ein Galerie-Bild über seinen Pfad; False, wenn es in BookStack nicht mehr existiert."""
+        query = urlencode({"filter[path]": urlparse(url).path, "count": 1})
+        return bool(self._request("GET", f"/api/image-gallery?{query}").get("data"))
 
     def check_access(self) -> dict:
         try:
@@ -365,27 +954,38 @@ class BookStackClient:
                 return {"app_name": "BookStack", "books_total": total}
             raise
 
-    def list_books(self, count: int = 500) -> List[dict]:
-        return self._request("GET", f"/api/books?count={count}").get("data", [])
+    def list_books(self) -> List[dict]:
+        return self.catalog.all("books")
 
-    def list_shelves(self, count: int = 500) -> List[dict]:
-        return self._request("GET", f"/api/shelves?count={count}").get("data", [])
+    def list_chapters(self) -> List[dict]:
+        return self.catalog.all("chapters")
+
+    def list_shelves(self) -> List[dict]:
+        return self.catalog.all("shelves")
 
     def find_shelf_by_name(self, name: str) -> Optional[dict]:
-        for shelf in self.list_shelves():
-            if shelf.get("name") == name:
-                return shelf
-        return None
+        return self.catalog.find("shelves", name)
 
     def create_shelf(self, name: str, description: str = "", books: Optional[List[int]] = None) -> dict:
         payload: dict = {"name": name, "description": description}
         if books is not None:
             payload["books"] = books
-        return self._request("POST", "/api/shelves", payload)
+        shelf = self._request("POST", "/api/shelves", payload)
+        self.catalog.upsert("shelves", shelf)
+        return shelf
 
     def update_shelf_books(self, shelf_id: int, name: str, books: List[int]) -> dict:
         payload = {"name": name, "books": books}
-        return self._request("PUT", f"/api/shelves/{shelf_id}", payload)
+        shelf = self._request("PUT", f"/api/shelves/{shelf_id}", payload)
+        self.catalog.upsert("shelves", shelf)
+        return shelf
+
+    def search_pages(self, query: str, count: int = 20) -> List[dict]:
+        data = self._request("GET", f"/api/search?{urlencode({'query': query, 'count': count})}")
+        return [item for item in data.get("data", []) if item.get("type") == "page"]
+
+    def get_page(self, page_id: int) -> dict:
+        return self._request("GET", f"/api/pages/{page_id}")
 
     def get_shelf_detail(self, shelf_id: int) -> dict:
         return self._request("GET", f"/api/shelves/{shelf_id}")
@@ -403,8 +1003,448 @@ class BookStackClient:
         return self.update_shelf_books(shelf_id, shelf.get("name", shelf_name), merged)
 
 
+class _AsyncClientBase:
+    """Asyncio-Fassade über einem blockierenden Client.
+
+    Jeder Aufruf läuft in einem eigenen Thread-Pool; ein Semaphore je Host und Limit begrenzt die gleichzeitig
+    offenen Requests über alle Instanzen mit diesem Limit hinweg. Retries, Rate-Limiter, Caches und die Session
+    (samt Verbindungspool mit ``HTTP_POOL_SIZE`` Verbindungen) des Sync-Clients werden unverändert mitbenutzt.
+
+    Mehr als ``HTTP_POOL_SIZE`` Requests (Default 32) sind nie gleichzeitig offen. Für mehrere hundert
+    Requests die Umgebungsvariable ``HTTP_POOL_SIZE`` anheben - sie setzt Verbindungspool und Limit gemeinsam;
+    jeder offene Request belegt dabei einen Thread.
+    """
+
+    _host_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Tuple[str, int], asyncio.Semaphore]]" = (
+        weakref.WeakKeyDictionary()
+    )
+
+    def __init__(self, client, limit: int):
+        self.sync = client
+        self.limit = max(1, int(limit))
+        self._host = urlparse(client.base_url).netloc
+        self._executor = ThreadPoolExecutor(max_workers=self.limit)
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphoren sind an die laufende Event-Loop gebunden, daher je Loop, Host und Limit anlegen
+        per_loop = self._host_limits.setdefault(asyncio.get_running_loop(), {})
+        key = (self._host, self.limit)
+        semaphore = per_loop.get(key)
+        if semaphore is None:
+            semaphore = per_loop[key] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    async def _call(self, func: Callable, *args, **kwargs):
+        async with self._semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+class AsyncConfluenceClient(_AsyncClientBase):
+    def __init__(self, client: ConfluenceClient, limit: int = HTTP_POOL_SIZE):
+        super().__init__(client, limit)
+
+    async def get_space_name(self, space_key: str) -> str:
+        return await self._call(self.sync.get_space_name, space_key)
+
+    async def iter_pages_in_space(
+        self, space_key: str, include_body: bool = True, modified_since: Optional[datetime] = None
+    ):
+        batches = self.sync.iter_pages_in_space(space_key, include_body=include_body, modified_since=modified_since)
+        while True:
+            batch = await self._call(next, batches, None)
+            if batch is None:
+                return
+            yield batch
+
+    async def list_pages_in_space(
+        self, space_key: str, include_body: bool = True, modified_since: Optional[datetime] = None
+    ) -> List[dict]:
+        pages: List[dict] = []
+        async for batch in self.iter_pages_in_space(space_key, include_body=include_body, modified_since=modified_since):
+            pages.extend(batch)
+        return pages
+
+    async def get_page_detail(self, page_id: str) -> dict:
+        return await self._call(self.sync.get_page_detail, page_id)
+
+    async def download_binary(self, url: str) -> bytes:
+        return await self._call(self.sync.download_binary, url)
+
+    async def get_attachment_index(self, page_id: str) -> Dict[str, str]:
+        return await self._call(self.sync.get_attachment_index, page_id)
+
+
+class AsyncBookStackClient(_AsyncClientBase):
+    def __init__(self, client: BookStackClient, limit: int = HTTP_POOL_SIZE):
+        super().__init__(client, limit)
+
+    async def get_page(self, page_id: int) -> dict:
+        return await self._call(self.sync.get_page, page_id)
+
+    async def create_page(
+        self, name: str, html: str, book_id: Optional[int] = None, chapter_id: Optional[int] = None
+    ) -> dict:
+        return await self._call(self.sync.create_page, name, html, book_id=book_id, chapter_id=chapter_id)
+
+    async def update_page_html(self, page_id: int, name: str, html: str) -> dict:
+        return await self._call(self.sync.update_page_html, page_id, name, html)
+
+    async def upload_gallery_image(self, page_id: int, filename: str, binary: bytes) -> str:
+        return await self._call(self.sync.upload_gallery_image, page_id, filename, binary)
+
+    async def create_chapter(self, book_id: int, name: str, description: str = "") -> dict:
+        return await self._call(self.sync.create_chapter, book_id, name, description)
+
+    async def find_book_by_name(self, name: str) -> Optional[dict]:
+        return await self._call(self.sync.find_book_by_name, name)
+
+    async def find_chapter_in_book(self, book_id: int, name: str, refresh: bool = False) -> Optional[dict]:
+        return await self._call(self.sync.find_chapter_in_book, book_id, name, refresh)
+
+    async def search_pages(self, query: str, count: int = 20) -> List[dict]:
+        return await self._call(self.sync.search_pages, query, count)
+
+    async def get_pages(self, page_ids: Iterable[int]) -> Dict[int, dict]:
+        """Lädt viele Seiten gleichzeitig; nicht ladbare Seiten fehlen im Ergebnis."""
+        page_ids = list(page_ids)
+        details = await asyncio.gather(*(self.get_page(page_id) for page_id in page_ids), return_exceptions=True)
+        return {page_id: detail for page_id, detail in zip(page_ids, details) if not isinstance(detail, BaseException)}
+
+
+def normalize_image_identity(src: str) -> str:
+    """Stabiler Schlüssel für ein Confluence-Bild, unabhängig von flüchtigen Query-Parametern."""
+    decoded = html.unescape(src)
+    parsed = urlparse(decoded)
+    query = parse_qs(parsed.query)
+    revision = "|".join(f"{key}={query[key][0]}" for key in ("version", "modificationDate") if query.get(key))
+    match = re.search(r"/download/(thumbnails|attachments)/(\d+)/([^/?]+)", parsed.path)
+    if match:
+        kind, page_id, filename = match.groups()
+        return f"{kind}:{page_id}/{unquote(filename)}@{revision}"
+    return f"url:{parsed.scheme}://{parsed.netloc}{parsed.path}@{revision}"
+
+
+class ImageRegistry:
+    """Migrationsweites Register bereits hochgeladener Bilder (Confluence-Identität/Inhalts-Hash -> BookStack-URL).
+
+    Einträge gelten nur für die BookStack-Instanz ``namespace`` (Basis-URL); Register-Datei und Zustand können
+    so gefahrlos für mehrere Ziele benutzt werden. Einträge aus Dateien ohne Namespace werden nicht übernommen.
+    """
+
+    SAVE_EVERY = 50
+
+    def __init__(self, path: Optional[str] = None, state: Optional["MigrationState"] = None, namespace: str = ""):
+        self.path = Path(path) if path else None
+        self.state = state
+        self.namespace = namespace.rstrip("/")
+        self._lock = threading.Lock()
+        self._identities: Dict[str, str] = {}
+        self._hashes: Dict[str, str] = {}
+        self._checked: Dict[str, bool] = {}
+        self._unsaved = 0
+        if self.path is not None and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self._identities = dict(data.get("namespaces", {}).get(self.namespace, {}).get("identities", {}))
+                self._hashes = dict(data.get("namespaces", {}).get(self.namespace, {}).get("hashes", {}))
+            except (OSError, ValueError, AttributeError) as exc:
+                print(f"[WARN] Bild-Register nicht lesbar ({self.path}): {exc}", flush=True)
+
+    def _key(self, value: str) -> str:
+        # Schlüssel im gemeinsamen Migrationszustand
+        return f"{self.namespace} {value}"
+
+    def lookup(self, identity: str) -> Optional[str]:
+        with self._lock:
+            digest = self._identities.get(identity)
+            if digest:
+                return self._hashes.get(digest)
+        if self.state is not None:
+            known = self.state.lookup_image(self._key(identity))
+            if known:
+                return known[1]
+        return None
+
+    def lookup_hash(self, digest: str) -> Optional[str]:
+        with self._lock:
+            url = self._hashes.get(digest)
+        if url is None and self.state is not None:
+            url = self.state.lookup_image_hash(self._key(digest))
+        return url
+
+    def record(self, identity: str, digest: str, url: str) -> None:
+        if self.state is not None:
+            self.state.record_image(self._key(identity), self._key(digest), url)
+        with self._lock:
+            self._identities[identity] = digest
+            self._hashes.setdefault(digest, url)
+            self._checked[url] = True
+            self._unsaved += 1
+            due = self._unsaved >= self.SAVE_EVERY
+        if due:
+            self.save()
+
+    def verify(self, url: str, exists: Callable[[str], bool]) -> bool:
+        """Prüft eine wiederverwendete URL einmal je Lauf; nicht mehr vorhandene Bilder werden vergessen."""
+        with self._lock:
+            known = self._checked.get(url)
+        if known is not None:
+            return known
+        try:
+            valid = exists(url)
+        except Exception as exc:
+            # Prüfung nicht möglich (z. B. fehlende Berechtigung): Eintrag behalten statt alles neu hochzuladen
+            print(f"    [WARN] Bild-URL nicht prüfbar ({url}): {exc}", flush=True)
+            valid = True
+        with self._lock:
+            self._checked[url] = valid
+            if not valid:
+                stale = {digest for digest, known_url in self._hashes.items() if known_url == url}
+                self._hashes = {digest: known_url for digest, known_url in self._hashes.items() if digest not in stale}
+                self._identities = {
+                    identity: digest for identity, digest in self._identities.items() if digest not in stale
+                }
+                self._unsaved += 1
+        if not valid and self.state is not None:
+            self.state.forget_image_url(url)
+        return valid
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._unsaved:
+                return
+            payload: dict = {"namespaces": {}}
+            if self.path.exists():
+                try:
+                    payload["namespaces"] = dict(json.loads(self.path.read_text(encoding="utf-8")).get("namespaces", {}))
+                except (OSError, ValueError, AttributeError):
+                    pass
+            payload["namespaces"][self.namespace] = {"identities": self._identities, "hashes": self._hashes}
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+
+
+class MigrationState:
+    """Persistenter Migrationszustand (SQLite): Zuordnungen Confluence -> BookStack, Bilder und Fortschritt.
+
+    ``kind`` ist ``book``, ``chapter`` oder ``page``; Lookups sind nach Confluence-ID, BookStack-ID und
+    normalisiertem Titel indiziert, damit Migrator, Verifier und Hilfsskripte ohne BookStack-Scan auskommen.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(
+            "CREATE TABLE IF NOT EXISTS entities ("
+            "kind TEXT NOT NULL, confluence_id TEXT NOT NULL, bookstack_id INTEGER NOT NULL, "
+            "book_id INTEGER, title TEXT NOT NULL DEFAULT '', title_key TEXT NOT NULL DEFAULT '', "
+            "content_hash TEXT, updated_at REAL NOT NULL, PRIMARY KEY (kind, confluence_id));"
+            "CREATE INDEX IF NOT EXISTS idx_entities_bookstack ON entities (kind, bookstack_id);"
+            "CREATE INDEX IF NOT EXISTS idx_entities_title ON entities (kind, title_key);"
+            "CREATE TABLE IF NOT EXISTS images ("
+            "identity TEXT PRIMARY KEY, digest TEXT NOT NULL, url TEXT NOT NULL);"
+            "CREATE INDEX IF NOT EXISTS idx_images_digest ON images (digest);"
+            "CREATE TABLE IF NOT EXISTS progress ("
+            "tool TEXT NOT NULL, confluence_id TEXT NOT NULL, status TEXT NOT NULL, "
+            "detail TEXT NOT NULL DEFAULT '', updated_at REAL NOT NULL, PRIMARY KEY (tool, confluence_id));"
+        )
+        self._conn.commit()
+
+    def record(
+        self,
+        kind: str,
+        confluence_id: str,
+        bookstack_id: int,
+        book_id: Optional[int] = None,
+        title: str = "",
+        content_hash: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entities "
+                "(kind, confluence_id, bookstack_id, book_id, title, title_key, content_hash, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    kind,
+                    str(confluence_id),
+                    int(bookstack_id),
+                    int(book_id) if book_id is not None else None,
+                    title or "",
+                    normalize_title_key(title),
+                    content_hash,
+                    time.time(),
+                ),
+            )
+            self._conn.commit()
+
+    def forget(self, kind: str, confluence_id: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entities WHERE kind = ? AND confluence_id = ?", (kind, str(confluence_id)))
+            self._conn.commit()
+
+    def lookup(self, kind: str, confluence_id: str) -> Optional[dict]:
+        return self._fetch_one("SELECT * FROM entities WHERE kind = ? AND confluence_id = ?", (kind, str(confluence_id)))
+
+    def find_by_bookstack_id(self, kind: str, bookstack_id: int) -> Optional[dict]:
+        return self._fetch_one("SELECT * FROM entities WHERE kind = ? AND bookstack_id = ?", (kind, int(bookstack_id)))
+
+    def find_by_title(self, kind: str, title: str) -> List[dict]:
+        return self._fetch_all(
+            "SELECT * FROM entities WHERE kind = ? AND title_key = ? ORDER BY updated_at DESC",
+            (kind, normalize_title_key(title)),
+        )
+
+    def items(self, kind: str) -> List[Tuple[str, dict]]:
+        return [(row["confluence_id"], row) for row in self._fetch_all("SELECT * FROM entities WHERE kind = ?", (kind,))]
+
+    def count(self, kind: str) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM entities WHERE kind = ?", (kind,)).fetchone()[0])
+
+    def record_image(self, identity: str, digest: str, url: str) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO images (identity, digest, url) VALUES (?, ?, ?)", (identity, digest, url))
+            self._conn.commit()
+
+    def lookup_image(self, identity: str) -> Optional[Tuple[str, str]]:
+        row = self._fetch_one("SELECT digest, url FROM images WHERE identity = ?", (identity,))
+        return (row["digest"], row["url"]) if row else None
+
+    def lookup_image_hash(self, digest: str) -> Optional[str]:
+        row = self._fetch_one("SELECT url FROM images WHERE digest = ? LIMIT 1", (digest,))
+        return row["url"] if row else None
+
+    def forget_image_url(self, url: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM images WHERE url = ?", (url,))
+            self._conn.commit()
+
+    def mark_progress(self, tool: str, confluence_id: str, status: str, detail: str = "") -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO progress (tool, confluence_id, status, detail, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (tool, str(confluence_id), status, detail, time.time()),
+            )
+            self._conn.commit()
+
+    def clear_progress(self, tool: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM progress WHERE tool = ?", (tool,))
+            self._conn.commit()
+
+    def progress(self, tool: str) -> Dict[str, dict]:
+        rows = self._fetch_all("SELECT * FROM progress WHERE tool = ?", (tool,))
+        return {row["confluence_id"]: row for row in rows}
+
+    def _fetch_one(self, query: str, params: tuple) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(query, params).fetchone()
+        return dict(row) if row is not None else None
+
+    def _fetch_all(self, query: str, params: tuple) -> List[dict]:
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class SpaceTree(Mapping):
+    """Einmal vorberechneter Seitenbaum eines Space.
+
+    Verhält sich wie das ``children``-Mapping (Seiten-ID -> Kind-IDs) und hält zusätzlich Elternzeiger,
+    Tiefe, Preorder-Reihenfolge und Teilbaumgrößen. Die Nachfahren eines Knotens liegen in der
+    Preorder-Liste zusammenhängend, sodass ``descendants`` ein Slice und ``subtree_size`` O(1) ist.
+    """
+
+    def __init__(self, children: Dict[str, List[str]], roots: Iterable[str]):
+        self._children = children
+        self._parent: Dict[str, Optional[str]] = {}
+        self._depth: Dict[str, int] = {}
+        self._start: Dict[str, int] = {}
+        self._size: Dict[str, int] = {}
+        self._order: List[str] = []
+
+        for root_id in list(roots) + list(children):
+            if root_id in self._start:
+                continue
+            # Iterativ statt rekursiv: tiefe Bäume sprengen sonst das Rekursionslimit
+            stack: List[Tuple[str, Optional[str], int]] = [(root_id, None, 0)]
+            while stack:
+                node_id, parent_id, depth = stack.pop()
+                if node_id in self._start:
+                    continue
+                self._start[node_id] = len(self._order)
+                self._order.append(node_id)
+                self._parent[node_id] = parent_id
+                self._depth[node_id] = depth
+                for child_id in reversed(children.get(node_id, [])):
+                    stack.append((child_id, node_id, depth + 1))
+
+        for node_id in reversed(self._order):
+            self._size[node_id] = 1 + sum(
+                self._size[child_id] for child_id in children.get(node_id, []) if self._parent.get(child_id) == node_id
+            )
+
+    def __getitem__(self, page_id: str) -> List[str]:
+        return self._children[page_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._children)
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def parent(self, page_id: str) -> Optional[str]:
+        return self._parent.get(page_id)
+
+    def depth(self, page_id: str) -> int:
+        return self._depth[page_id]
+
+    def subtree_size(self, page_id: str) -> int:
+        """Anzahl der Seiten im Teilbaum inklusive ``page_id``."""
+        return self._size[page_id]
+
+    def descendants(self, page_id: str) -> List[str]:
+        """``page_id`` gefolgt von allen Nachfahren in Preorder."""
+        start = self._start[page_id]
+        return self._order[start : start + self._size[page_id]]
+
+    def trail_titles(self, page_map: Dict[str, dict], root_id: str) -> Dict[str, str]:
+        """Pfadtitel ("Eltern / Kind") aller Nachfahren relativ zu ``root_id``.
+
+        Wird in Preorder von oben nach unten berechnet: jede Seite setzt den gecachten Präfix ihres
+        Elternknotens fort, statt die Vorfahrenliste für jede Seite neu aufzubauen.
+        """
+        prefixes: Dict[str, str] = {root_id: ""}
+        trails: Dict[str, str] = {}
+        for page_id in self.descendants(root_id)[1:]:
+            prefix = prefixes[self._parent[page_id]]
+            title = page_map[page_id].get("title", "Untitled")
+            trails[page_id] = f"{prefix} / {title}" if prefix else title
+            # Seiten ohne Titel tauchen im Pfad ihrer Nachfahren nicht auf
+            own = page_map[page_id].get("title")
+            prefixes[page_id] = (f"{prefix} / {own}" if prefix else own) if own else prefix
+        return trails
+
+
 class Migrator:
     IMG_SRC_PATTERN = re.compile(r'(<img\b[^>]*?src=["\'])([^"\']+)(["\'][^>]*>)', flags=re.IGNORECASE)
+    MARKER_PATTERN = re.compile(r"confluence_id:(\d+)(?: content_hash:([0-9a-f]{64}))?")
+    INTERNAL_LINK_PATTERN = re.compile(r'href=["\']([^"\']+/pages/(\d+)[^"\']*)["\']', flags=re.IGNORECASE)
+    IMAGE_HOLDER_TITLE = "Confluence-Bildablage"
 
     def __init__(
         self,
@@ -414,16 +1454,57 @@ class Migrator:
         auto_confirm: bool = False,
         overview_only: bool = False,
         overview_file: Optional[str] = None,
+        fetch_workers: int = 8,
+        skeleton: bool = False,
+        page_cache: Optional[PageCache] = None,
+        since_last_run: bool = False,
+        sync_state_file: Optional[str] = None,
+        image_registry_file: Optional[str] = None,
+        write_workers: int = 1,
+        single_write: bool = False,
+        state: Optional[MigrationState] = None,
+        marker_search: bool = False,
+        resume: bool = False,
+        catalog: Optional[BookStackCatalog] = None,
+        image_registry: Optional[ImageRegistry] = None,
     ):
         self.config = config
         self.space_key = space_key or config.confluence_space_key
         self.dry_run = dry_run
         self.auto_confirm = auto_confirm
         self.overview_only = overview_only
+        self.fetch_workers = max(1, int(fetch_workers or 1))
+        self.write_workers = max(1, int(write_workers or 1))
+        self.skeleton = skeleton
         default_overview = f"migration_overview_{self.space_key.lower()}.md"
         self.overview_file = Path(overview_file) if overview_file else Path(default_overview)
         self.conf = ConfluenceClient(config.confluence_base_url, config.confluence_email, config.confluence_api_token)
         self.bs = BookStackClient(config.bookstack_base_url, config.bookstack_token_id, config.bookstack_token_secret)
+        if catalog is not None:
+            # Parallel migrierte Spaces teilen sich den Katalog, damit Books/Shelves nur einmal geladen werden
+            self.bs.catalog = catalog
+        self.page_cache = page_cache
+        if page_cache is not None:
+            self.conf.cache = page_cache
+        self.converter = StorageConverter(self.conf, workers=self.fetch_workers, cache=page_cache)
+        self.since_last_run = since_last_run
+        self.sync_state_file = Path(sync_state_file) if sync_state_file else None
+        if image_registry is None:
+            image_registry = ImageRegistry(image_registry_file, state=state, namespace=config.bookstack_base_url)
+        self.image_registry = image_registry
+        self.single_write = single_write
+        self.state = state
+        self.marker_search = marker_search
+        self.resume = resume
+        if resume and state is None:
+            print("[WARN] --resume benötigt einen Migrationszustand (--state-db) - vollständiger Lauf.", flush=True)
+        self._link_targets: Dict[str, int] = {}
+        self._link_targets_lock = threading.Lock()
+        self._content_hashes: Dict[str, str] = {}
+        self._image_anchors: Dict[int, int] = {}
+        self._image_anchor_lock = threading.Lock()
+        self._facts: Dict[Tuple[str, Optional[int], bool, bool], PageFacts] = {}
+        self._facts_lock = threading.Lock()
 
     def run(self) -> dict:
         space_name = self.conf.get_space_name(self.space_key)
@@ -438,45 +1519,46 @@ class Migrator:
             "pages_total": 0,
         }
 
+        run_started = datetime.now(timezone.utc)
+        if self._journal_enabled():
+            if self.resume:
+                resumed = self._resume_from_checkpoint(summary)
+                if resumed is not None:
+                    return resumed
+            self.state.clear_progress(self._journal_tool())
+
+        modified_since: Optional[datetime] = None
+        if self.since_last_run:
+            modified_since = self._last_sync_time()
+            if modified_since is None:
+                print("Kein vorheriger Sync für diesen Space gefunden - vollständiger Lauf.")
+
         print(f"[1/7] Lade Seiten aus Space '{self.space_key}'...")
-        pages = self.conf.list_pages_in_space(self.space_key)
+        changed_ids: Optional[Set[str]] = None
+        if modified_since is not None:
+            pages, changed_ids, pages_without_content = self._load_changed_pages(modified_since)
+        else:
+            pages, pages_without_content = self._load_pages(
+                self.conf.iter_pages_in_space(self.space_key, include_body=not self.skeleton)
+            )
         if not pages:
             print("Keine Seiten gefunden.")
             return summary
-        print(f"Gefunden: {len(pages)} Seiten")
-        
-        # Fetch full content for pages missing body data
-        print(f"[1b/7] Prüfe Seitencontent...")
-        pages_without_content = 0
-        for idx, page in enumerate(pages):
-            page_id = str(page.get("id", ""))
-            view_html = page.get("body", {}).get("view", {}).get("value", "")
-            storage_html = page.get("body", {}).get("storage", {}).get("value", "")
-            
-            has_content = self.conf._has_meaningful_content(view_html) or self.conf._has_meaningful_content(storage_html)
-            
-            if not has_content:
-                pages_without_content += 1
-                try:
-                    if (idx + 1) % 10 == 0:
-                        print(f"  Lade fehlenden Content: {idx + 1}/{len(pages)}...", flush=True)
-                    detail = self.conf.get_page_detail(page_id)
-                    pages[idx] = detail  # Replace with full detail
-                except Exception as exc:
-                    print(f"  [WARN] Fehler beim Laden von Page {page_id}: {exc}", flush=True)
-        
+
+        if self.page_cache is not None:
+            print(f"  Cache: {self.page_cache.hits} Treffer, {self.page_cache.misses} neu/geändert")
         if pages_without_content > 0:
             print(f"  {pages_without_content} Seiten benötigten zusätzlichen Content-Abruf")
         
         summary["pages_total"] = len(pages)
         summary["pages_content_fetched"] = pages_without_content
 
-        page_map, children, top_level = self._build_structure(pages, space_name)
-        overview_text = self._build_overview_markdown(space_name, book_name, page_map, children, top_level)
-        self.overview_file.write_text(overview_text, encoding="utf-8")
+        page_map, tree, top_level = self._build_structure(pages, space_name)
+        del pages
+        self._write_overview_markdown(space_name, book_name, page_map, tree, top_level)
 
         print(f"[2/7] Übersicht erstellt: {self.overview_file}")
-        stats = self._compute_structure_stats(page_map, children, top_level)
+        stats = self._compute_structure_stats(page_map, tree, top_level)
         print(
             f"  Statistik: Bücher={stats['books']} | Chapter={stats['chapters']} | "
             f"Seiten(ab Ebene 3)={stats['pages_level_3_plus']}"
@@ -486,6 +1568,12 @@ class Migrator:
             print("Nur Übersicht erzeugt (--overview-only). Keine Migration ausgeführt.")
             return summary
 
+        if changed_ids is not None and not changed_ids:
+            print("Keine Änderungen seit dem letzten Sync.")
+            if not self.dry_run:
+                self._store_sync_time(run_started)
+            return summary
+
         if not self.dry_run and not self.auto_confirm:
             if not sys.stdin.isatty():
                 print("Nicht-interaktive Sitzung erkannt. Bitte mit --yes bestätigen oder --overview-only nutzen.")
@@ -499,12 +1587,14 @@ class Migrator:
         print("[3/7] Ermittele/erstelle Books pro Top-Level...")
         created_pages: List[Tuple[str, str, int, int]] = []
         book_ids: List[int] = []
+        if self.skeleton:
+            self._ensure_page_bodies(page_map, [chapter_id for root_id in top_level for chapter_id in tree[root_id]])
 
         for root_id in top_level:
             root_page = page_map[root_id]
             root_title = root_page.get("title", "Untitled")
-            has_children = len(children[root_id]) > 0
-            print(f"  Book: {root_title} (Kinder: {len(children[root_id])})", flush=True)
+            has_children = len(tree[root_id]) > 0
+            print(f"  Book: {root_title} (Kinder: {len(tree[root_id])})", flush=True)
 
             if self.dry_run:
                 book = {"id": -1, "name": root_title}
@@ -522,10 +1612,12 @@ class Migrator:
                     )
                     print(f"    Book erstellt: ID {book['id']}", flush=True)
                 book_ids.append(int(book["id"]))
+                if self.state is not None:
+                    self.state.record("book", root_id, int(book["id"]), int(book["id"]), root_title)
 
             if has_children:
-                print(f"    Erstelle {len(children[root_id])} Chapter...", flush=True)
-                for chapter_idx, chapter_id in enumerate(children[root_id], 1):
+                print(f"    Erstelle {len(tree[root_id])} Chapter...", flush=True)
+                for chapter_idx, chapter_id in enumerate(tree[root_id], 1):
                     chapter_title = page_map[chapter_id].get("title", "Untitled")
                     if self.dry_run:
                         bs_chapter_id = 0
@@ -534,7 +1626,7 @@ class Migrator:
                         if existing_chapter:
                             bs_chapter_id = int(existing_chapter.get("id", -1))
                             print(
-                                f"    ({chapter_idx}/{len(children[root_id])}) Kapitel vorhanden: {chapter_title} -> {bs_chapter_id}",
+                                f"    ({chapter_idx}/{len(tree[root_id])}) Kapitel vorhanden: {chapter_title} -> {bs_chapter_id}",
                                 flush=True,
                             )
                         else:
@@ -543,23 +1635,24 @@ class Migrator:
                                 chapter = self.bs.create_chapter(book["id"], chapter_title)
                                 bs_chapter_id = int(chapter["id"])
                                 print(
-                                    f"    ({chapter_idx}/{len(children[root_id])}) Kapitel: {chapter_title} -> {bs_chapter_id}",
+                                    f"    ({chapter_idx}/{len(tree[root_id])}) Kapitel: {chapter_title} -> {bs_chapter_id}",
                                     flush=True,
                                 )
-                                time.sleep(0.2)  # Small delay
                             except requests.HTTPError as exc:
-                                if exc.response and exc.response.status_code == 422:
-                                    # Chapter already exists - try to find it manually
-                                    existing_chapter = self.bs.find_chapter_in_book(int(book["id"]), chapter_title)
+                                if exc.response is not None and exc.response.status_code == 422:
+                                    # Chapter already exists - reload book contents once and look again
+                                    existing_chapter = self.bs.find_chapter_in_book(
+                                        int(book["id"]), chapter_title, refresh=True
+                                    )
                                     if existing_chapter:
                                         bs_chapter_id = int(existing_chapter.get("id", -1))
                                         print(
-                                            f"    ({chapter_idx}/{len(children[root_id])}) Kapitel existiert bereits: {chapter_title} -> {bs_chapter_id}",
+                                            f"    ({chapter_idx}/{len(tree[root_id])}) Kapitel existiert bereits: {chapter_title} -> {bs_chapter_id}",
                                             flush=True,
                                         )
                                     else:
                                         print(
-                                            f"    ({chapter_idx}/{len(children[root_id])}) Kapitel existiert bereits: {chapter_title} (ID unbekannt)",
+                                            f"    ({chapter_idx}/{len(tree[root_id])}) Kapitel existiert bereits: {chapter_title} (ID unbekannt)",
                                             flush=True,
                                         )
                                         bs_chapter_id = -1
@@ -575,23 +1668,17 @@ class Migrator:
                                 bs_chapter_id = -1
                                 continue
 
-                    chapter_view = page_map[chapter_id].get("body", {}).get("view", {}).get("value", "")
-                    chapter_storage = page_map[chapter_id].get("body", {}).get("storage", {}).get("value", "")
-                    chapter_has_content = self.conf._has_meaningful_content(chapter_view) or self.conf._has_meaningful_content(
-                        chapter_storage
-                    )
-                    if chapter_has_content:
+                    if self.state is not None and bs_chapter_id > 0:
+                        self.state.record("chapter", chapter_id, bs_chapter_id, int(book["id"]), chapter_title)
+
+                    if self._page_facts(page_map[chapter_id]).has_content:
                         chapter_content_title = f"{chapter_title} (Kapitelinhalt)"
                         if self.dry_run:
                             created_pages.append((chapter_id, chapter_content_title, 0, int(book["id"])))
                         elif bs_chapter_id > 0:
                             created_pages.append((chapter_id, chapter_content_title, bs_chapter_id, int(book["id"])))
 
-                    descendants = self._collect_descendants(chapter_id, children)
-                    for child_id in descendants:
-                        if child_id == chapter_id:
-                            continue
-                        trail = self._build_trail_under_chapter(child_id, page_map, chapter_id)
+                    for child_id, trail in tree.trail_titles(page_map, chapter_id).items():
                         if self.dry_run:
                             created_pages.append((child_id, trail, 0, int(book["id"])))
                         elif bs_chapter_id > 0:  # Only add if chapter was created successfully
@@ -601,197 +1688,685 @@ class Migrator:
 
         summary["book_ids"] = book_ids
 
+        if changed_ids is not None:
+            created_pages = [entry for entry in created_pages if entry[0] in changed_ids]
+
+        if self._journal_enabled():
+            self._write_checkpoint(created_pages, book_ids, run_started)
+        return self._transfer_pages(summary, page_map, created_pages, book_ids, run_started)
+
+    def _transfer_pages(
+        self,
+        summary: dict,
+        page_map: Dict[str, dict],
+        created_pages: List[Tuple[str, str, int, int]],
+        book_ids: List[int],
+        run_started: datetime,
+        completed: Optional[Dict[str, int]] = None,
+        completed_links: Optional[Dict[str, Set[str]]] = None,
+    ) -> dict:
+        """Schritte 4-7: Seiten-Index, Inhalte übertragen, Links umschreiben, Zusammenfassung.
+
+        ``completed``/``completed_links`` enthalten bei --resume die bereits geschriebenen Seiten und deren
+        noch offene Links aus dem Journal.
+        """
         # Index existing pages to rehydrate missing content (skip in dry-run)
         existing_index: Dict[Tuple[int, int, str], int] = {}
         marker_index: Dict[str, int] = {}
         if not self.dry_run:
-            existing_pages = get_all_bookstack_items(self.bs, "/api/pages")
-            marker_pattern = re.compile(r"confluence_id:(\d+)")
-            for item in existing_pages:
-                b_id = int(item.get("book_id", -1))
-                if b_id not in book_ids:
-                    continue
-                ch_id = int(item.get("chapter_id") or 0)
-                name_key = self._normalize_title(item.get("name", ""))
-                if name_key:
-                    existing_index[(b_id, ch_id, name_key)] = int(item.get("id", -1))
-                page_id = int(item.get("id", -1))
-                if page_id <= 0:
-                    continue
-                try:
-                    detail = self.bs._request("GET", f"/api/pages/{page_id}")
-                    html_text = detail.get("raw_html") or detail.get("html") or ""
-                    for match in marker_pattern.findall(html_text):
-                        marker_index.setdefault(match, page_id)
-                except Exception:
-                    continue
+            existing_index, marker_index = self._index_existing_pages(book_ids, created_pages)
 
         print(f"[5/7] Übertrage Inhalte ({len(created_pages)} Seiten)...")
-        confluence_to_bookstack_page: Dict[str, int] = {}
+        self._submit_storage_conversions(page_map, created_pages)
+        confluence_to_bookstack_page: Dict[str, int] = dict(completed or {})
         migration_stats = {
             "created": 0,
             "updated": 0,
             "skipped_no_content": 0,
             "skipped_error": 0,
             "placeholder_content": 0,
+            "unchanged": 0,
+            "source_images": 0,
+            "source_text_length": 0,
         }
 
-        for idx, (conf_page_id, target_title, chapter_id, book_id) in enumerate(created_pages, start=1):
-            page_data = page_map[conf_page_id]
-            view_html = page_data.get("body", {}).get("view", {}).get("value", "")
-            storage_html = page_data.get("body", {}).get("storage", {}).get("value", "")
+        if self.single_write and not self.dry_run:
+            self._preallocate_page_ids(created_pages, existing_index, marker_index)
 
-            # Check if we have meaningful content
-            has_view = self.conf._has_meaningful_content(view_html)
-            has_storage = self.conf._has_meaningful_content(storage_html)
-            
-            if not has_view and not has_storage:
-                try:
-                    detail = self.conf.get_page_detail(str(conf_page_id))
-                    view_html = detail.get("body", {}).get("view", {}).get("value", "")
-                    storage_html = detail.get("body", {}).get("storage", {}).get("value", "")
-                    has_view = self.conf._has_meaningful_content(view_html)
-                    has_storage = self.conf._has_meaningful_content(storage_html)
-                except Exception as exc:
-                    print(f"  [WARN] Confluence-Detail nicht geladen ({conf_page_id}): {exc}", flush=True)
-            
-            # Still no content? Use placeholder instead of skipping
-            if not has_view and not has_storage:
-                print(
-                    f"  [WARN] ({idx}/{len(created_pages)}) Keine Inhalte für '{target_title}' gefunden - Platzhalter wird erstellt",
-                    flush=True,
-                )
-                rendered_html = "<p><em>Hinweis: Kein Inhalt in Confluence gefunden.</em></p>"
+        results = self._run_page_pipeline(created_pages, page_map, existing_index, marker_index)
+        for (conf_page_id, _, _, _), result in zip(created_pages, results):
+            facts = self._page_facts(page_map[conf_page_id])
+            migration_stats["source_images"] += facts.image_count
+            migration_stats["source_text_length"] += facts.text_length
+            if result["placeholder"]:
                 migration_stats["placeholder_content"] += 1
-            elif view_html and has_view:
-                rendered_html = view_html
-            elif storage_html and has_storage:
-                try:
-                    rendered_html = self.conf.convert_storage_to_view(storage_html)
-                except Exception:
-                    rendered_html = storage_html
-            else:
-                rendered_html = "<p>Kein Inhalt verfügbar</p>"
+            if result["stat"]:
+                migration_stats[result["stat"]] += 1
+            bs_page_id = result["bs_page_id"]
+            if bs_page_id:
+                confluence_to_bookstack_page[conf_page_id] = bs_page_id
+            if result["stat"] == "created":
+                marker_index[str(conf_page_id)] = bs_page_id
 
-            rendered_html = self._normalize_html_links(rendered_html)
-            rendered_html = self._inject_confluence_marker(rendered_html, str(conf_page_id))
-            if not rendered_html or not rendered_html.strip():
-                rendered_html = "<p></p>"
+        self.image_registry.save()
 
-            safe_title = self.bs._trim_name(target_title, "page")
+        print("[6/7] Interne Links umschreiben...")
+        if not self.dry_run and self.single_write:
+            pending = [
+                conf_page_id
+                for (conf_page_id, _, _, _), result in zip(created_pages, results)
+                if result["bs_page_id"] and result["pending_links"] & confluence_to_bookstack_page.keys()
+            ]
+            # Seiten aus dem abgebrochenen Lauf, deren Linkziele erst jetzt angelegt wurden
+            pending.extend(
+                conf_page_id
+                for conf_page_id, links in (completed_links or {}).items()
+                if links & confluence_to_bookstack_page.keys()
+            )
+            print(f"  Nachträglich zu verlinken: {len(pending)} Seiten", flush=True)
+            self._rewrite_internal_links(page_map, confluence_to_bookstack_page, page_ids=pending)
+        elif not self.dry_run:
+            self._rewrite_internal_links(page_map, confluence_to_bookstack_page)
 
-            if self.dry_run:
-                print(f"  [dry-run] ({idx}/{len(created_pages)}) {safe_title}")
-                continue
+        summary["migration_stats"] = migration_stats
+        if not self.dry_run and migration_stats["skipped_error"] == 0:
+            self._store_sync_time(run_started)
+            if self._journal_enabled():
+                self.state.clear_progress(self._journal_tool())
+        print(f"\n[7/7] Migration abgeschlossen!")
+        print(f"  Erstellt: {migration_stats['created']}")
+        print(f"  Aktualisiert: {migration_stats['updated']}")
+        print(f"  Unverändert: {migration_stats['unchanged']}")
+        print(f"  Platzhalter (kein Content): {migration_stats['placeholder_content']}")
+        print(f"  Übersprungen (kein Content): {migration_stats['skipped_no_content']}")
+        print(f"  Übersprungen (Fehler): {migration_stats['skipped_error']}")
+        print(
+            f"  Quelle: {migration_stats['source_images']} Bilder, "
+            f"{migration_stats['source_text_length']} Zeichen Text"
+        )
+        
+        if self.dry_run:
+            print("\nDry-run beendet. Keine Änderungen in BookStack vorgenommen.")
+        return summary
 
-            marker_page_id = marker_index.get(str(conf_page_id))
-            if marker_page_id:
-                bs_page_id = marker_page_id
-                self.bs.update_page_html(bs_page_id, safe_title, rendered_html)
-                confluence_to_bookstack_page[conf_page_id] = bs_page_id
+    CHECKPOINT_KEY = "stage:structure"
+
+    def _journal_enabled(self) -> bool:
+        return self.state is not None and not self.dry_run and not self.overview_only
 
-                html_with_local_images, image_count = self._migrate_images(rendered_html, bs_page_id)
-                if image_count > 0 and html_with_local_images and html_with_local_images.strip():
-                    self.bs.update_page_html(bs_page_id, safe_title, html_with_local_images)
+    def _journal_tool(self) -> str:
+        return f"run:{self.space_key}"
+
+    def _write_checkpoint(self, created_pages: List[Tuple[str, str, int, int]], book_ids: List[int], run_started: datetime) -> None:
+        """Hält die fertige Struktur (Schritte 1-3) fest, damit --resume direkt bei Schritt 4 einsteigen kann."""
+        detail = json.dumps(
+            {"run_started": run_started.isoformat(), "book_ids": book_ids, "created_pages": created_pages},
+            ensure_ascii=False,
+        )
+        self.state.mark_progress(self._journal_tool(), self.CHECKPOINT_KEY, "done", detail)
+
+    def _journal_page(self, entry: Tuple[str, str, int, int], result: dict) -> dict:
+        """Protokolliert eine erfolgreich geschriebene Seite sofort (auch aus Worker-Threads)."""
+        if self.state is None or self.dry_run or not result["bs_page_id"]:
+            return result
+        conf_page_id, target_title, _, book_id = entry
+        self.state.record("page", conf_page_id, result["bs_page_id"], book_id, target_title, result["content_hash"])
+        # Offene Links (Single-Write) mitschreiben, damit --resume sie in Schritt 6 noch umschreiben kann
+        detail = json.dumps(
+            {"bookstack_id": int(result["bs_page_id"]), "pending_links": sorted(result.get("pending_links") or ())}
+        )
+        self.state.mark_progress(self._journal_tool(), conf_page_id, "done", detail)
+        return result
+
+    @staticmethod
+    def _parse_journal_page(detail: str) -> Tuple[int, Set[str]]:
+        data = json.loads(detail)
+        if isinstance(data, int):
+            # Journal eines älteren Laufs: nur die BookStack-ID
+            return data, set()
+        return int(data["bookstack_id"]), set(data.get("pending_links") or ())
+
+    def _resume_from_checkpoint(self, summary: dict) -> Optional[dict]:
+        journal = self.state.progress(self._journal_tool())
+        checkpoint = journal.pop(self.CHECKPOINT_KEY, None)
+        if checkpoint is None:
+            print("[Resume] Kein Checkpoint für diesen Space gefunden - vollständiger Lauf.")
+            return None
 
-                migration_stats["updated"] += 1
-                print(f"  ({idx}/{len(created_pages)}) Aktualisiert (Marker): {safe_title} -> Seite {bs_page_id}, Bilder: {image_count}")
+        data = json.loads(checkpoint["detail"])
+        created_pages = [tuple(entry) for entry in data["created_pages"]]
+        completed: Dict[str, int] = {}
+        completed_links: Dict[str, Set[str]] = {}
+        for conf_id, row in journal.items():
+            if row["status"] != "done":
                 continue
+            completed[conf_id], links = self._parse_journal_page(row["detail"])
+            if links:
+                completed_links[conf_id] = links
+        remaining = [entry for entry in created_pages if entry[0] not in completed]
+        print(
+            f"[Resume] Checkpoint vom {data['run_started']}: {len(completed)} Seiten erledigt, "
+            f"{len(remaining)} offen - Schritte 1-3 werden übersprungen."
+        )
+        summary["book_ids"] = data["book_ids"]
+        summary["resumed_pages"] = len(completed)
+        page_map = {entry[0]: {"id": entry[0]} for entry in remaining}
+        return self._transfer_pages(
+            summary,
+            page_map,
+            remaining,
+            data["book_ids"],
+            datetime.fromisoformat(data["run_started"]),
+            completed=completed,
+            completed_links=completed_links,
+        )
 
-            norm_name = self._normalize_title(safe_title)
-            index_key = (int(book_id), int(chapter_id or 0), norm_name)
+    def _last_sync_time(self) -> Optional[datetime]:
+        if self.sync_state_file is None:
+            return None
+        entry = load_sync_state(self.sync_state_file).get(self.space_key) or {}
+        value = entry.get("last_success")
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
 
-            if index_key in existing_index:
-                bs_page_id = existing_index[index_key]
-                self.bs.update_page_html(bs_page_id, safe_title, rendered_html)
-                confluence_to_bookstack_page[conf_page_id] = bs_page_id
+    def _store_sync_time(self, started: datetime) -> None:
+        if self.sync_state_file is None:
+            return
+        with SYNC_STATE_LOCK:
+            state = load_sync_state(self.sync_state_file)
+            state[self.space_key] = {"last_success": started.isoformat()}
+            save_sync_state(self.sync_state_file, state)
+
+    def _load_changed_pages(self, modified_since: datetime) -> Tuple[List[dict], Set[str], int]:
+        """Lädt das Skelett des Space plus die seit dem letzten Sync geänderten Seiten mit Inhalt."""
+        query_since = (modified_since - SYNC_OVERLAP).astimezone(timezone.utc)
+        print(f"  Delta-Sync: nur Seiten geändert seit {modified_since.isoformat()}", flush=True)
+        changed, pages_without_content = self._load_pages(
+            self.conf.iter_pages_in_space(self.space_key, modified_since=query_since)
+        )
+        changed_by_id = {page["id"]: page for page in changed}
+        print(f"  Geändert: {len(changed_by_id)} Seiten", flush=True)
 
-                html_with_local_images, image_count = self._migrate_images(rendered_html, bs_page_id)
-                if image_count > 0 and html_with_local_images and html_with_local_images.strip():
-                    self.bs.update_page_html(bs_page_id, safe_title, html_with_local_images)
+        pages: List[dict] = []
+        for batch in self.conf.iter_pages_in_space(self.space_key, include_body=False):
+            pages.extend(changed_by_id.pop(page["id"], page) for page in batch)
+        pages.extend(changed_by_id.values())
+        return pages, {page["id"] for page in changed}, pages_without_content
 
-                migration_stats["updated"] += 1
-                print(f"  ({idx}/{len(created_pages)}) Aktualisiert: {safe_title} -> Seite {bs_page_id}, Bilder: {image_count}")
+    def _index_existing_pages(
+        self,
+        book_ids: List[int],
+        created_pages: List[Tuple[str, str, int, int]],
+    ) -> Tuple[Dict[Tuple[int, int, str], int], Dict[str, int]]:
+        """Baut Titel- und Marker-Index der Zielbücher.
+
+        Mit Migrationszustand genügt die Seitenliste; einzelne Seiten werden nur für die optionale Suche geladen.
+        Ohne Zustand - bzw. für Zielbücher, zu denen der Zustand noch keine Zuordnung kennt - werden wie bisher
+        alle Seiten nach Markern durchsucht.
+        """
+        existing_index: Dict[Tuple[int, int, str], int] = {}
+        marker_index: Dict[str, int] = {}
+        live_pages: Dict[int, int] = {}
+        for item in get_all_bookstack_items(self.bs, "/api/pages"):
+            b_id = int(item.get("book_id", -1))
+            if b_id not in book_ids:
+                continue
+            if self.is_image_holder(item):
+                # Bildablage: nur als Bildziel merken, nie als Titel- oder Marker-Treffer
+                self._image_anchors.setdefault(b_id, int(item.get("id", -1)))
+                continue
+            ch_id = int(item.get("chapter_id") or 0)
+            name_key = self._normalize_title(item.get("name", ""))
+            if name_key:
+                existing_index[(b_id, ch_id, name_key)] = int(item.get("id", -1))
+            page_id = int(item.get("id", -1))
+            if page_id > 0:
+                live_pages[page_id] = b_id
+
+        if self.state is None:
+            self._scan_page_markers(live_pages, marker_index)
+            return existing_index, marker_index
+
+        for conf_id, entry in self.state.items("page"):
+            page_id = int(entry["bookstack_id"])
+            if page_id in live_pages:
+                marker_index[conf_id] = page_id
+                if entry.get("content_hash"):
+                    self._content_hashes[conf_id] = entry["content_hash"]
+            elif entry.get("book_id") in book_ids:
+                self.state.forget("page", conf_id)
+
+        # Zielbücher ohne eine einzige Zuordnung (z. B. der nächste Space eines Mehr-Space-Laufs) einmalig scannen
+        mapped_books = {live_pages[page_id] for page_id in marker_index.values()}
+        unscanned = {page_id: b_id for page_id, b_id in live_pages.items() if b_id not in mapped_books}
+        if unscanned:
+            print(f"  Marker-Scan für Bücher ohne Migrationszustand: {len(unscanned)} Seiten", flush=True)
+            self._scan_page_markers(unscanned, marker_index)
+
+        found = 0
+        if self.marker_search:
+            for conf_page_id, _, _, _ in created_pages:
+                conf_id = str(conf_page_id)
+                if conf_id in marker_index:
+                    continue
+                page_id, content_hash = self._search_marker_page(conf_id, live_pages)
+                if page_id:
+                    found += 1
+                    marker_index[conf_id] = page_id
+                    if content_hash:
+                        self._content_hashes[conf_id] = content_hash
+                    self.state.record("page", conf_id, page_id, live_pages[page_id], content_hash=content_hash or None)
+        print(f"  Migrationszustand: {len(marker_index)} Zuordnungen, per Suche gefunden: {found}", flush=True)
+        return existing_index, marker_index
+
+    def _scan_page_markers(self, live_pages: Dict[int, int], marker_index: Dict[str, int]) -> None:
+        """Lädt jede Seite und liest die confluence_id-Marker aus (füllt dabei den Migrationszustand initial)."""
+        for page_id, book_id in live_pages.items():
+            try:
+                detail = self.bs._request("GET", f"/api/pages/{page_id}")
+                html_text = detail.get("raw_html") or detail.get("html") or ""
+                for conf_id, content_hash in self.MARKER_PATTERN.findall(html_text):
+                    if marker_index.setdefault(conf_id, page_id) != page_id:
+                        continue
+                    if content_hash:
+                        self._content_hashes[conf_id] = content_hash
+                    if self.state is not None:
+                        self.state.record("page", conf_id, page_id, book_id, content_hash=content_hash or None)
+            except Exception:
                 continue
 
-            if chapter_id > 0:
-                try:
-                    created = self.bs.create_page(safe_title, rendered_html, chapter_id=chapter_id)
-                except requests.HTTPError as exc:
-                    status = exc.response.status_code if exc.response is not None else "?"
-                    print(f"  [WARN] Seite übersprungen (HTTP {status}): {safe_title}", flush=True)
-                    migration_stats["skipped_error"] += 1
+    def _search_marker_page(self, conf_id: str, live_pages: Dict[int, int]) -> Tuple[Optional[int], str]:
+        """Sucht die Seite über den sichtbaren Footer "Confluence-ID: …" und prüft den Marker im HTML."""
+        try:
+            for item in self.bs.search_pages(f'"Confluence-ID: {conf_id}"'):
+                page_id = int(item.get("id", -1))
+                if page_id not in live_pages:
                     continue
-            else:
+                detail = self.bs._request("GET", f"/api/pages/{page_id}")
+                html_text = detail.get("raw_html") or detail.get("html") or ""
+                for found_id, content_hash in self.MARKER_PATTERN.findall(html_text):
+                    if found_id == conf_id:
+                        return page_id, content_hash
+        except requests.RequestException as exc:
+            print(f"  [WARN] Suche nach Confluence-ID {conf_id} fehlgeschlagen: {exc}", flush=True)
+        return None, ""
+
+    def _page_has_content(self, page: dict) -> bool:
+        return self._page_facts(page).has_content
+
+    def _load_pages(self, batches: Iterable[List[dict]]) -> Tuple[List[dict], int]:
+        """Sammelt Seiten-Batches und lädt fehlende Details parallel, während weitere Batches eintreffen."""
+        pages: List[dict] = []
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as pool:
+            futures = {}
+            for batch in batches:
+                for page in batch:
+                    if not self.skeleton and not self._page_has_content(page):
+                        futures[pool.submit(self.conf.get_page_detail, str(page.get("id", "")))] = len(pages)
+                    pages.append(page)
+                print(f"  Geladen: {len(pages)} Seiten...", flush=True)
+
+            if pages:
+                print(f"Gefunden: {len(pages)} Seiten")
+                # Fetch full content for pages missing body data
+                print(f"[1b/7] Prüfe Seitencontent...")
+                self._collect_page_details(pages, futures)
+        return pages, len(futures)
+
+    def _ensure_page_bodies(self, page_map: Dict[str, dict], page_ids: Iterable[str]) -> None:
+        """Lädt im Skelett-Modus die Inhalte der angegebenen Seiten parallel nach."""
+        missing = [page_id for page_id in page_ids if "body" not in page_map[page_id]]
+        if not missing:
+            return
+
+        print(f"  Lade Seiteninhalte für {len(missing)} Seiten...", flush=True)
+        with ThreadPoolExecutor(max_workers=min(self.fetch_workers, len(missing))) as pool:
+            futures = {pool.submit(self.conf.get_page_detail, page_id): page_id for page_id in missing}
+            for future in as_completed(futures):
+                page_id = futures[future]
                 try:
-                    created = self.bs.create_page(safe_title, rendered_html, book_id=book_id)
-                except requests.HTTPError as exc:
-                    status = exc.response.status_code if exc.response is not None else "?"
-                    print(f"  [WARN] Seite übersprungen (HTTP {status}): {safe_title}", flush=True)
-                    migration_stats["skipped_error"] += 1
-                    continue
+                    page_map[page_id] = future.result()
+                except Exception as exc:
+                    print(f"  [WARN] Fehler beim Laden von Page {page_id}: {exc}", flush=True)
 
-            bs_page_id = created["id"]
-            confluence_to_bookstack_page[conf_page_id] = bs_page_id
-            marker_index[str(conf_page_id)] = bs_page_id
+    def _collect_page_details(self, pages: List[dict], futures: Dict[Future, int]) -> None:
+        total = len(futures)
+        if total > 1 and self.fetch_workers > 1:
+            print(f"  Lade fehlenden Content für {total} Seiten ({self.fetch_workers} parallel)...", flush=True)
 
-            html_with_local_images, image_count = self._migrate_images(rendered_html, bs_page_id)
-            if image_count > 0 and html_with_local_images and html_with_local_images.strip():
-                self.bs.update_page_html(bs_page_id, safe_title, html_with_local_images)
+        for done, future in enumerate(as_completed(futures), start=1):
+            idx = futures[future]
+            page_id = str(pages[idx].get("id", ""))
+            try:
+                pages[idx] = future.result()  # Replace with full detail
+            except Exception as exc:
+                print(f"  [WARN] Fehler beim Laden von Page {page_id}: {exc}", flush=True)
+            if done % 10 == 0:
+                print(f"  Lade fehlenden Content: {done}/{total}...", flush=True)
 
-            migration_stats["created"] += 1
-            print(f"  ({idx}/{len(created_pages)}) {safe_title} -> Seite {bs_page_id}, Bilder: {image_count}")
+    def _run_page_pipeline(
+        self,
+        created_pages: List[Tuple[str, str, int, int]],
+        page_map: Dict[str, dict],
+        existing_index: Dict[Tuple[int, int, str], int],
+        marker_index: Dict[str, int],
+    ) -> List[dict]:
+        """Laden, Aufbereiten und Schreiben der Seiten als überlappende Stufen; Ergebnisse in Eingabereihenfolge.
+
+        Aktualisierungen und Bilder laufen mit ``write_workers`` parallel, neue Seiten legt ein einzelner Thread
+        in Eingabereihenfolge an - BookStack sortiert Geschwister ohne ``priority`` nach Anlagezeitpunkt.
+        """
+        total = len(created_pages)
+        if self.write_workers > 1:
+            print(f"  Schreibe Seiten mit {self.write_workers} parallelen Workern...", flush=True)
+        return run_pipeline(
+            list(enumerate(created_pages, start=1)),
+            [
+                (lambda task: self._fetch_page_body(task, page_map), self.fetch_workers),
+                (lambda task: self._transform_page(task[0], total, task[1], page_map, marker_index), self.fetch_workers),
+                (lambda item: self._update_existing_page(item, existing_index, marker_index), self.write_workers, True),
+                (self._create_new_page, 1, True),
+                (lambda item: self._journal_page(item["entry"], self._finish_page(item)), self.write_workers),
+            ],
+            queue_size=max(PIPELINE_QUEUE_SIZE, 2 * self.write_workers),
+        )
 
-        print("[6/7] Interne Links umschreiben...")
-        if not self.dry_run:
-            self._rewrite_internal_links(page_map, confluence_to_bookstack_page)
+    def _fetch_page_body(self, task: Tuple[int, Tuple[str, str, int, int]], page_map: Dict[str, dict]) -> Tuple[int, Tuple[str, str, int, int]]:
+        conf_page_id = task[1][0]
+        if "body" not in page_map[conf_page_id]:
+            try:
+                page_map[conf_page_id] = self.conf.get_page_detail(str(conf_page_id))
+            except Exception as exc:
+                print(f"  [WARN] Fehler beim Laden von Page {conf_page_id}: {exc}", flush=True)
+            else:
+                facts = self._page_facts(page_map[conf_page_id])
+                if not facts.has_view and facts.has_storage:
+                    self.converter.submit(page_map[conf_page_id]["body"]["storage"]["value"], facts.content_hash)
+        return task
 
-        summary["migration_stats"] = migration_stats
-        print(f"\n[7/7] Migration abgeschlossen!")
-        print(f"  Erstellt: {migration_stats['created']}")
-        print(f"  Aktualisiert: {migration_stats['updated']}")
-        print(f"  Platzhalter (kein Content): {migration_stats['placeholder_content']}")
-        print(f"  Übersprungen (kein Content): {migration_stats['skipped_no_content']}")
-        print(f"  Übersprungen (Fehler): {migration_stats['skipped_error']}")
+    def _transform_page(
+        self,
+        idx: int,
+        total: int,
+        entry: Tuple[str, str, int, int],
+        page_map: Dict[str, dict],
+        marker_index: Dict[str, int],
+    ) -> dict:
+        """Bereitet das HTML einer Seite auf und entscheidet, ob überhaupt geschrieben werden muss."""
+        conf_page_id, target_title, _, _ = entry
+        result = {"stat": None, "bs_page_id": None, "placeholder": False, "pending_links": set(), "content_hash": None}
+        page_data = page_map[conf_page_id]
+        view_html = page_data.get("body", {}).get("view", {}).get("value", "")
+        storage_html = page_data.get("body", {}).get("storage", {}).get("value", "")
+
+        # Check if we have meaningful content
+        facts = self._page_facts(page_data)
+        has_view, has_storage = facts.has_view, facts.has_storage
         
-        if self.dry_run:
-            print("\nDry-run beendet. Keine Änderungen in BookStack vorgenommen.")
-        return summary
+        if not has_view and not has_storage:
+            try:
+                detail = self.conf.get_page_detail(str(conf_page_id))
+                view_html = detail.get("body", {}).get("view", {}).get("value", "")
+                storage_html = detail.get("body", {}).get("storage", {}).get("value", "")
+                facts = self._page_facts(detail)
+                has_view, has_storage = facts.has_view, facts.has_storage
+            except Exception as exc:
+                print(f"  [WARN] Confluence-Detail nicht geladen ({conf_page_id}): {exc}", flush=True)
+        
+        # Still no content? Use placeholder instead of skipping
+        if not has_view and not has_storage:
+            print(
+                f"  [WARN] ({idx}/{total}) Keine Inhalte für '{target_title}' gefunden - Platzhalter wird erstellt",
+                flush=True,
+            )
+            rendered_html = "<p><em>Hinweis: Kein Inhalt in Confluence gefunden.</em></p>"
+            result["placeholder"] = True
+            image_total = 0
+        elif view_html and has_view:
+            rendered_html = view_html
+            image_total = facts.image_count
+        elif storage_html and has_storage:
+            rendered_html = self.converter.convert(storage_html, facts.content_hash)
+            image_total = len(self._image_sources(rendered_html))
+        else:
+            rendered_html = "<p>Kein Inhalt verfügbar</p>"
+            image_total = 0
 
-    def _build_trail_under_chapter(self, page_id: str, page_map: Dict[str, dict], chapter_id: str) -> str:
-        page = page_map[page_id]
-        ancestors = page.get("ancestors", []) or []
-        titles: List[str] = []
-        for anc in ancestors:
-            anc_id = anc.get("id")
-            if anc_id in page_map:
-                anc_title = page_map[anc_id].get("title")
-                if anc_title:
-                    titles.append(anc_title)
-        titles.append(page.get("title", "Untitled"))
+        safe_title = self.bs._trim_name(target_title, "page")
+
+        rendered_html = self._normalize_html_links(rendered_html)
+        content_hash = result["content_hash"] = self._content_hash(safe_title, rendered_html)
+        rendered_html = self._inject_confluence_marker(rendered_html, str(conf_page_id), content_hash)
+        if not rendered_html or not rendered_html.strip():
+            rendered_html = "<p></p>"
+
+        item = {"idx": idx, "total": total, "entry": entry, "title": safe_title, "html": rendered_html, "result": result}
+        item["image_total"] = image_total
+        item["done"] = self.dry_run
+        if self.dry_run:
+            print(f"  [dry-run] ({idx}/{total}) {safe_title}")
+            return item
+
+        marker_page_id = marker_index.get(str(conf_page_id))
+        if marker_page_id and self._content_hashes.get(str(conf_page_id)) == content_hash:
+            result["stat"] = "unchanged"
+            result["bs_page_id"] = marker_page_id
+            print(f"  ({idx}/{total}) Unverändert: {safe_title} -> Seite {marker_page_id}")
+            item["done"] = True
+            return item
+
+        # Bilder schon hier aus Confluence laden, damit der Download die BookStack-Schreibzugriffe überlappt
+        item["images"] = self._prefetch_images(rendered_html)
+        return item
+
+    def _update_existing_page(
+        self,
+        item: dict,
+        existing_index: Dict[Tuple[int, int, str], int],
+        marker_index: Dict[str, int],
+    ) -> dict:
+        """Schreibstufe 1 (parallel): aktualisiert vorhandene Seiten; neue Seiten bleiben für die Anlage offen."""
+        result = item["result"]
+        if item["done"]:
+            return item
+        idx, total, entry = item["idx"], item["total"], item["entry"]
+        conf_page_id, _, chapter_id, book_id = entry
+        safe_title, rendered_html = item["title"], item["html"]
+
+        if self.single_write:
+            return self._prepare_single_write(item)
+
+        marker_page_id = marker_index.get(str(conf_page_id))
+
+        if marker_page_id:
+            bs_page_id = marker_page_id
+            self.bs.update_page_html(bs_page_id, safe_title, rendered_html)
+            result["bs_page_id"] = bs_page_id
+
+            image_count = self._attach_images(bs_page_id, item)
+
+            result["stat"] = "updated"
+            print(f"  ({idx}/{total}) Aktualisiert (Marker): {safe_title} -> Seite {bs_page_id}, Bilder: {image_count}")
+            item["done"] = True
+            return item
+
+        norm_name = self._normalize_title(safe_title)
+        index_key = (int(book_id), int(chapter_id or 0), norm_name)
+
+        if index_key in existing_index:
+            bs_page_id = existing_index[index_key]
+            self.bs.update_page_html(bs_page_id, safe_title, rendered_html)
+            result["bs_page_id"] = bs_page_id
+
+            image_count = self._attach_images(bs_page_id, item)
+
+            result["stat"] = "updated"
+            print(f"  ({idx}/{total}) Aktualisiert: {safe_title} -> Seite {bs_page_id}, Bilder: {image_count}")
+            item["done"] = True
+        return item
+
+    def _create_new_page(self, item: dict) -> dict:
+        """Schreibstufe 2 (ein Thread, Eingabereihenfolge): legt neue Seiten an, damit die Geschwisterfolge stimmt."""
+        result = item["result"]
+        if item["done"]:
+            return item
+        idx, total, entry = item["idx"], item["total"], item["entry"]
+        _, _, chapter_id, book_id = entry
+        safe_title, rendered_html = item["title"], item["html"]
+        if self.single_write:
+            rendered_html, result["pending_links"] = self._resolve_links_to_known_pages(rendered_html)
 
-        chapter_title = page_map.get(chapter_id, {}).get("title", "")
-        if chapter_title and chapter_title in titles:
-            idx = titles.index(chapter_title)
-            titles = titles[idx + 1 :]
+        try:
+            if chapter_id > 0:
+                created = self.bs.create_page(safe_title, rendered_html, chapter_id=chapter_id)
+            else:
+                created = self.bs.create_page(safe_title, rendered_html, book_id=book_id)
+        except requests.HTTPError as exc:
+            status = exc.response.status_code if exc.response is not None else "?"
+            print(f"  [WARN] Seite übersprungen (HTTP {status}): {safe_title}", flush=True)
+            result["stat"] = "skipped_error"
+            item["done"] = True
+            return item
+
+        result["bs_page_id"] = created["id"]
+        result["stat"] = "created"
+        if self.single_write:
+            # Ab sofort Linkziel: nur Vorwärtslinks bleiben für Schritt 6 offen
+            with self._link_targets_lock:
+                self._link_targets[str(entry[0])] = int(created["id"])
+            print(f"  ({idx}/{total}) {safe_title} -> Seite {created['id']}, Bilder: {item['image_count']}")
+            item["done"] = True
+        return item
+
+    def _finish_page(self, item: dict) -> dict:
+        """Schreibstufe 3 (parallel): überträgt die Bilder frisch angelegter Seiten."""
+        result = item["result"]
+        if item["done"]:
+            return result
+        bs_page_id, safe_title = result["bs_page_id"], item["title"]
+        image_count = self._attach_images(bs_page_id, item)
+        print(f"  ({item['idx']}/{item['total']}) {safe_title} -> Seite {bs_page_id}, Bilder: {image_count}")
+        return result
+
+    def _attach_images(self, bs_page_id: int, item: dict) -> int:
+        """Überträgt die Bilder einer bereits geschriebenen Seite und aktualisiert sie bei Bedarf erneut."""
+        html_with_local_images, image_count = self._migrate_images(item["html"], bs_page_id, item.get("images"))
+        complete = image_count >= item["image_total"]
+        if not complete:
+            html_with_local_images = self._drop_content_hash(html_with_local_images, item["result"])
+        if (image_count > 0 or not complete) and html_with_local_images and html_with_local_images.strip():
+            self.bs.update_page_html(bs_page_id, item["title"], html_with_local_images)
+        return image_count
+
+    def _drop_content_hash(self, html: str, result: dict) -> str:
+        """Entfernt den Inhalts-Hash (Marker und Zustand), wenn Bilder fehlen - der nächste Lauf schreibt die Seite neu."""
+        content_hash = result.get("content_hash")
+        result["content_hash"] = None
+        if not content_hash:
+            return html
+        return html.replace(f" content_hash:{content_hash}", "")
 
-        if len(titles) <= 1:
-            return titles[0]
-        return " / ".join(titles)
+    def _preallocate_page_ids(
+        self,
+        created_pages: List[Tuple[str, str, int, int]],
+        existing_index: Dict[Tuple[int, int, str], int],
+        marker_index: Dict[str, int],
+    ) -> None:
+        """Ermittelt vorab alle bereits bekannten BookStack-IDs (Marker/Titel) als Link- und Bildziele."""
+        self._link_targets = dict(marker_index)
+        for conf_page_id, target_title, chapter_id, book_id in created_pages:
+            if str(conf_page_id) in self._link_targets:
+                continue
+            norm_name = self._normalize_title(self.bs._trim_name(target_title, "page"))
+            bs_page_id = existing_index.get((int(book_id), int(chapter_id or 0), norm_name))
+            if bs_page_id:
+                self._link_targets[str(conf_page_id)] = bs_page_id
+        print(f"  Vorab bekannte Seiten-IDs: {len(self._link_targets)}", flush=True)
+
+    def _resolve_links_to_known_pages(self, html: str) -> Tuple[str, Set[str]]:
+        """Löst Links gegen alle bisher bekannten Seiten-IDs auf (vorab ermittelt oder in diesem Lauf angelegt)."""
+        with self._link_targets_lock:
+            return self._resolve_internal_links(html, self._link_targets)
+
+    @classmethod
+    def is_image_holder(cls, page: dict) -> bool:
+        """Die Bildablage eines Buchs zählt weder als migrierte Seite noch als Duplikat."""
+        return page.get("name") == cls.IMAGE_HOLDER_TITLE and not page.get("chapter_id")
+
+    def _image_anchor_page(self, book_id: int) -> int:
+        """Liefert die Bildablage des Buchs (vorhanden oder neu angelegt) für Bilder noch nicht angelegter Seiten.
+
+        Die Bildablage bleibt dauerhaft im Buch: BookStack löscht Galerie-Bilder zusammen mit der Seite, auf die
+        sie hochgeladen wurden, die migrierten Seiten verweisen aber weiter auf diese Bilder.
+        """
+        with self._image_anchor_lock:
+            anchor = self._image_anchors.get(book_id)
+            if not anchor:
+                created = self.bs.create_page(
+                    self.IMAGE_HOLDER_TITLE,
+                    "<p>Ablage für Bilder migrierter Confluence-Seiten.</p>",
+                    book_id=book_id,
+                )
+                anchor = self._image_anchors[book_id] = int(created["id"])
+            return anchor
+
+    def _prepare_single_write(self, item: dict) -> dict:
+        """Single-Write: Bilder vorab übertragen; vorhandene Seiten gleich mit genau einem Request aktualisieren."""
+        result = item["result"]
+        idx, total, entry = item["idx"], item["total"], item["entry"]
+        conf_page_id, _, _, book_id = entry
+        safe_title, rendered_html = item["title"], item["html"]
+        bs_page_id = self._link_targets.get(str(conf_page_id))
+
+        image_count = 0
+        if self.IMG_SRC_PATTERN.search(rendered_html):
+            image_target = bs_page_id or self._image_anchor_page(int(book_id))
+            rendered_html, image_count = self._migrate_images(rendered_html, image_target, item.get("images"))
+            if image_count < item["image_total"]:
+                rendered_html = self._drop_content_hash(rendered_html, result)
+        item["html"], item["image_count"] = rendered_html, image_count
+        if not bs_page_id:
+            return item
+
+        rendered_html, result["pending_links"] = self._resolve_links_to_known_pages(rendered_html)
+        self.bs.update_page_html(bs_page_id, safe_title, rendered_html)
+        result["stat"] = "updated"
+        result["bs_page_id"] = bs_page_id
+        print(f"  ({idx}/{total}) Aktualisiert: {safe_title} -> Seite {bs_page_id}, Bilder: {image_count}")
+        item["done"] = True
+        return item
+
+    def _submit_storage_conversions(self, page_map: Dict[str, dict], created_pages: List[Tuple[str, str, int, int]]) -> None:
+        """Startet die Storage->View-Umwandlung für alle Seiten ohne View-Inhalt vorab im Hintergrund."""
+        submitted = 0
+        for conf_page_id, _, _, _ in created_pages:
+            facts = self._page_facts(page_map[conf_page_id])
+            if facts.has_view or not facts.has_storage:
+                continue
+            self.converter.submit(page_map[conf_page_id]["body"]["storage"]["value"], facts.content_hash)
+            submitted += 1
+        if submitted:
+            print(f"  Storage-Konvertierung im Hintergrund gestartet: {submitted} Seiten", flush=True)
 
     def _normalize_title(self, value: str) -> str:
         return re.sub(r"\s+", " ", (value or "").strip().lower())
 
     def _build_structure(
         self,
-        pages: List[dict],
+        pages: Iterable[dict],
         space_name: str,
-    ) -> Tuple[Dict[str, dict], Dict[str, List[str]], List[str]]:
-        page_map = {p["id"]: p for p in pages}
-        children: Dict[str, List[str]] = {p["id"]: [] for p in pages}
+    ) -> Tuple[Dict[str, dict], SpaceTree, List[str]]:
+        page_map: Dict[str, dict] = {}
+        for page in pages:
+            page_map[page["id"]] = page
+        children: Dict[str, List[str]] = {page_id: [] for page_id in page_map}
         top_level_raw: List[str] = []
 
-        for page in pages:
+        for page in page_map.values():
             parent_id = self._find_parent_in_space(page, page_map)
             if parent_id:
                 children[parent_id].append(page["id"])
@@ -808,23 +2383,22 @@ class Migrator:
             } and children[root_id]:
                 top_level = list(children[root_id])
 
-        return page_map, children, top_level
+        return page_map, SpaceTree(children, top_level_raw), top_level
 
     def _compute_structure_stats(
         self,
         page_map: Dict[str, dict],
-        children: Dict[str, List[str]],
+        tree: SpaceTree,
         top_level: List[str],
     ) -> Dict[str, int]:
         chapter_count = 0
         pages_level_3_plus = 0
 
         for book_id in top_level:
-            chapter_ids = children.get(book_id, [])
+            chapter_ids = tree.get(book_id, [])
             chapter_count += len(chapter_ids)
             for chapter_id in chapter_ids:
-                descendants = self._collect_descendants(chapter_id, children)
-                pages_level_3_plus += max(0, len(descendants) - 1)
+                pages_level_3_plus += tree.subtree_size(chapter_id) - 1
 
         return {
             "total_pages": len(page_map),
@@ -833,150 +2407,164 @@ class Migrator:
             "pages_level_3_plus": pages_level_3_plus,
         }
 
-    def _extract_sample_words(self, html_text: str, max_words: int = 12) -> str:
-        if not html_text:
-            return ""
-        stripped = re.sub(r"<[^>]+>", " ", html_text)
-        stripped = html.unescape(stripped)
-        stripped = re.sub(r"\s+", " ", stripped).strip()
-        if not stripped:
-            return ""
-        words = stripped.split(" ")
-        if len(words) <= max_words:
-            return stripped
-        return " ".join(words[:max_words]) + "..."
-
-    def _build_overview_markdown(
+    def _build_page_facts(self, view_html: str, storage_html: str, max_words: int = 12) -> PageFacts:
+        has_view = self.conf._has_meaningful_content(view_html)
+        has_storage = self.conf._has_meaningful_content(storage_html)
+        from_view = has_view or not has_storage
+        source = (view_html if from_view else storage_html) or ""
+        text = re.sub(r"\s+", " ", html.unescape(re.sub(r"<[^>]+>", " ", source))).strip()
+        words = text.split(" ") if text else []
+        sample = text if len(words) <= max_words else " ".join(words[:max_words]) + "..."
+        if from_view:
+            image_count = len(self._image_sources(source))
+        else:
+            image_count = len(set(re.findall(r"<ac:image\b.*?</ac:image>", source, flags=re.IGNORECASE | re.DOTALL)))
+        return PageFacts(
+            has_view=has_view,
+            has_storage=has_storage,
+            image_count=image_count,
+            text_length=len(text),
+            sample=sample,
+            content_hash=hashlib.sha256(source.encode("utf-8")).hexdigest(),
+        )
+
+    def _page_facts(self, page: dict) -> PageFacts:
+        """Kennzahlen einer Seite; je Seitenversion und Body nur einmal berechnet.
+
+        Der Schlüssel enthält, ob View- und Storage-Body vorhanden sind: Listen-Stubs ohne Body und das später
+        geladene Detail derselben Version dürfen sich nicht gegenseitig überdecken.
+        """
+        body = page.get("body", {})
+        view_html = body.get("view", {}).get("value", "")
+        storage_html = body.get("storage", {}).get("value", "")
+        key = (str(page.get("id")), _page_version(page), bool(view_html), bool(storage_html))
+        with self._facts_lock:
+            facts = self._facts.get(key)
+        if facts is None:
+            facts = self._build_page_facts(view_html, storage_html)
+            with self._facts_lock:
+                self._facts[key] = facts
+        return facts
+
+    def _overview_marker(self, page: dict) -> Tuple[str, str]:
+        if "body" not in page:
+            return "·", ""
+        facts = self._page_facts(page)
+        return ("✓" if facts.has_content else "⚠"), facts.sample
+
+    def _write_overview_markdown(
+        self,
+        space_name: str,
+        book_name: str,
+        page_map: Dict[str, dict],
+        tree: SpaceTree,
+        top_level: List[str],
+    ) -> None:
+        """Schreibt die Übersicht zeilenweise, ohne den gesamten Markdown-Text im Speicher aufzubauen."""
+        with self.overview_file.open("w", encoding="utf-8") as handle:
+            for idx, line in enumerate(self._iter_overview_lines(space_name, book_name, page_map, tree, top_level)):
+                if idx:
+                    handle.write("\n")
+                handle.write(line)
+
+    def _iter_overview_lines(
         self,
         space_name: str,
         book_name: str,
         page_map: Dict[str, dict],
-        children: Dict[str, List[str]],
+        tree: SpaceTree,
         top_level: List[str],
-    ) -> str:
-        stats = self._compute_structure_stats(page_map, children, top_level)
-        lines: List[str] = []
-
-        lines.append("# Confluence Migrationsübersicht")
-        lines.append("")
-        lines.append(f"- Space-Key: `{self.space_key}`")
-        lines.append(f"- Space-Name: `{space_name}`")
-        lines.append(f"- Ziel-Book in BookStack: `{book_name}`")
-        lines.append("")
-        lines.append("## Statistik")
-        lines.append("")
-        lines.append(f"- Gesamtseiten im Space: **{stats['total_pages']}**")
-        lines.append(f"- Bücher (Top-Level): **{stats['books']}**")
-        lines.append(f"- Chapter (Ebene 2): **{stats['chapters']}**")
-        lines.append(f"- Seiten (ab Ebene 3): **{stats['pages_level_3_plus']}**")
-        lines.append("")
-        lines.append("## Top-Level Übersicht")
-        lines.append("")
+    ) -> Iterator[str]:
+        stats = self._compute_structure_stats(page_map, tree, top_level)
+
+        yield "# Confluence Migrationsübersicht"
+        yield ""
+        yield f"- Space-Key: `{self.space_key}`"
+        yield f"- Space-Name: `{space_name}`"
+        yield f"- Ziel-Book in BookStack: `{book_name}`"
+        yield ""
+        yield "## Statistik"
+        yield ""
+        yield f"- Gesamtseiten im Space: **{stats['total_pages']}**"
+        yield f"- Bücher (Top-Level): **{stats['books']}**"
+        yield f"- Chapter (Ebene 2): **{stats['chapters']}**"
+        yield f"- Seiten (ab Ebene 3): **{stats['pages_level_3_plus']}**"
+        yield ""
+        yield "## Top-Level Übersicht"
+        yield ""
 
         if not top_level:
-            lines.append("- Keine Top-Level-Knoten erkannt.")
+            yield "- Keine Top-Level-Knoten erkannt."
         else:
             for book_id in top_level:
                 book_title = page_map[book_id].get("title", "Untitled")
-                book_view = page_map[book_id].get("body", {}).get("view", {}).get("value", "")
-                book_storage = page_map[book_id].get("body", {}).get("storage", {}).get("value", "")
-                book_has_content = self.conf._has_meaningful_content(book_view) or self.conf._has_meaningful_content(
-                    book_storage
-                )
-                book_sample_source = book_view or book_storage
-                book_sample = self._extract_sample_words(book_sample_source)
-                book_marker = "✓" if book_has_content else "⚠"
-                chapter_ids = children.get(book_id, [])
-                page_count = 0
-                for chapter_id in chapter_ids:
-                    descendants = self._collect_descendants(chapter_id, children)
-                    page_count += max(0, len(descendants) - 1)
+                book_marker, book_sample = self._overview_marker(page_map[book_id])
+                chapter_ids = tree.get(book_id, [])
+                page_count = sum(tree.subtree_size(chapter_id) - 1 for chapter_id in chapter_ids)
                 if book_sample:
-                    lines.append(
+                    yield (
                         f"- {book_marker} {book_title} (Chapter: {len(chapter_ids)}, Seiten unterhalb Chapter: {page_count}) — {book_sample}"
                     )
                 else:
-                    lines.append(
+                    yield (
                         f"- {book_marker} {book_title} (Chapter: {len(chapter_ids)}, Seiten unterhalb Chapter: {page_count})"
                     )
 
-        lines.append("")
-        lines.append("## Strukturzuordnung")
-        lines.append("")
-        lines.append("Format: Buch (oberste Ebene) → Chapter (Ebene darunter) → Seite (darunter)")
-        lines.append("Legende: ✓ = Inhalt vorhanden, ⚠ = leer/kein Inhalt")
-        lines.append("")
+        yield ""
+        yield "## Strukturzuordnung"
+        yield ""
+        yield "Format: Buch (oberste Ebene) → Chapter (Ebene darunter) → Seite (darunter)"
+        if self.skeleton or self.since_last_run:
+            yield "Legende: ✓ = Inhalt vorhanden, ⚠ = leer/kein Inhalt, · = Inhalt nicht geladen"
+        else:
+            yield "Legende: ✓ = Inhalt vorhanden, ⚠ = leer/kein Inhalt"
+        yield ""
 
-        def add_pages_recursive(node_id: str, depth: int) -> int:
-            count = 0
-            for child_id in children.get(node_id, []):
+        def add_pages(chapter_id: str) -> Iterator[str]:
+            base_depth = tree.depth(chapter_id)
+            for child_id in tree.descendants(chapter_id)[1:]:
                 page_title = page_map[child_id].get("title", "Untitled")
-                view_html = page_map[child_id].get("body", {}).get("view", {}).get("value", "")
-                storage_html = page_map[child_id].get("body", {}).get("storage", {}).get("value", "")
-                has_content = self.conf._has_meaningful_content(view_html) or self.conf._has_meaningful_content(
-                    storage_html
-                )
-                sample_source = view_html or storage_html
-                sample = self._extract_sample_words(sample_source)
-                marker = "✓" if has_content else "⚠"
-                indent = "  " * depth
+                marker, sample = self._overview_marker(page_map[child_id])
+                indent = "  " * (tree.depth(child_id) - base_depth)
                 if sample:
-                    lines.append(f"{indent}- {marker} Seite: {page_title} — {sample}")
+                    yield f"{indent}- {marker} Seite: {page_title} — {sample}"
                 else:
-                    lines.append(f"{indent}- {marker} Seite: {page_title}")
-                count += 1
-                count += add_pages_recursive(child_id, depth + 1)
-            return count
+                    yield f"{indent}- {marker} Seite: {page_title}"
 
         if not top_level:
-            lines.append("- Keine Strukturzuordnung möglich.")
+            yield "- Keine Strukturzuordnung möglich."
         else:
             for book_id in top_level:
                 book_title = page_map[book_id].get("title", "Untitled")
-                chapter_ids = children.get(book_id, [])
+                chapter_ids = tree.get(book_id, [])
 
-                lines.append(f"### Buch: {book_title}")
+                yield f"### Buch: {book_title}"
                 if not chapter_ids:
-                    book_view = page_map[book_id].get("body", {}).get("view", {}).get("value", "")
-                    book_storage = page_map[book_id].get("body", {}).get("storage", {}).get("value", "")
-                    book_has_content = self.conf._has_meaningful_content(book_view) or self.conf._has_meaningful_content(
-                        book_storage
-                    )
-                    book_sample_source = book_view or book_storage
-                    book_sample = self._extract_sample_words(book_sample_source)
-                    book_marker = "✓" if book_has_content else "⚠"
+                    book_marker, book_sample = self._overview_marker(page_map[book_id])
                     if book_sample:
-                        lines.append(f"- {book_marker} Buch-Inhalt — {book_sample}")
+                        yield f"- {book_marker} Buch-Inhalt — {book_sample}"
                     else:
-                        lines.append(f"- {book_marker} Buch-Inhalt")
-                    lines.append("- _(Keine Chapter)_")
-                    lines.append("")
+                        yield f"- {book_marker} Buch-Inhalt"
+                    yield "- _(Keine Chapter)_"
+                    yield ""
                     continue
 
                 for chapter_id in chapter_ids:
                     chapter_title = page_map[chapter_id].get("title", "Untitled")
-                    chapter_view = page_map[chapter_id].get("body", {}).get("view", {}).get("value", "")
-                    chapter_storage = page_map[chapter_id].get("body", {}).get("storage", {}).get("value", "")
-                    chapter_has_content = self.conf._has_meaningful_content(chapter_view) or self.conf._has_meaningful_content(
-                        chapter_storage
-                    )
-                    chapter_sample_source = chapter_view or chapter_storage
-                    chapter_sample = self._extract_sample_words(chapter_sample_source)
-                    chapter_marker = "✓" if chapter_has_content else "⚠"
+                    chapter_marker, chapter_sample = self._overview_marker(page_map[chapter_id])
                     if chapter_sample:
-                        lines.append(f"- {chapter_marker} Chapter: {chapter_title} — {chapter_sample}")
+                        yield f"- {chapter_marker} Chapter: {chapter_title} — {chapter_sample}"
                     else:
-                        lines.append(f"- {chapter_marker} Chapter: {chapter_title}")
-                    page_count = add_pages_recursive(chapter_id, 1)
-                    if page_count == 0:
-                        lines.append("  - _(Keine Seiten)_")
+                        yield f"- {chapter_marker} Chapter: {chapter_title}"
+                    yield from add_pages(chapter_id)
+                    if not tree.get(chapter_id):
+                        yield "  - _(Keine Seiten)_"
 
-                lines.append("")
+                yield ""
 
-        lines.append("")
-        lines.append("> Hinweis: Diese Übersicht wird vor jeder Migration erstellt. Bitte erst prüfen, dann bestätigen.")
-        lines.append("")
-        return "\n".join(lines)
+        yield ""
+        yield "> Hinweis: Diese Übersicht wird vor jeder Migration erstellt. Bitte erst prüfen, dann bestätigen."
+        yield ""
 
     def _find_parent_in_space(self, page: dict, page_map: Dict[str, dict]) -> Optional[str]:
         ancestors = page.get("ancestors", []) or []
@@ -986,36 +2574,6 @@ class Migrator:
                 return anc_id
         return None
 
-    def _collect_descendants(self, root_id: str, children: Dict[str, List[str]]) -> List[str]:
-        order = [root_id]
-        stack = list(children[root_id])
-        while stack:
-            node = stack.pop(0)
-            order.append(node)
-            stack[0:0] = children[node]
-        return order
-
-    def _build_trail_title(self, page_id: str, page_map: Dict[str, dict], root_id: str) -> str:
-        page = page_map[page_id]
-        ancestors = page.get("ancestors", []) or []
-        titles: List[str] = []
-        for anc in ancestors:
-            anc_id = anc.get("id")
-            if anc_id in page_map:
-                anc_title = page_map[anc_id].get("title")
-                if anc_title:
-                    titles.append(anc_title)
-        titles.append(page.get("title", "Untitled"))
-
-        root_title = page_map.get(root_id, {}).get("title", "")
-        if root_title and root_title in titles:
-            root_index = titles.index(root_title)
-            titles = titles[root_index + 1 :]
-
-        if len(titles) <= 1:
-            return titles[0]
-        return " / ".join(titles)
-
     def _normalize_html_links(self, html: str) -> str:
         def repl(match: re.Match) -> str:
             prefix, src, suffix = match.groups()
@@ -1026,32 +2584,71 @@ class Migrator:
 
         return self.IMG_SRC_PATTERN.sub(repl, html)
 
-    def _inject_confluence_marker(self, html: str, confluence_id: str) -> str:
-        marker = f"<!-- confluence_id:{confluence_id} -->"
+    def _content_hash(self, title: str, html: str) -> str:
+        return hashlib.sha256(f"{title}\n{html}".encode("utf-8")).hexdigest()
+
+    def _inject_confluence_marker(self, html: str, confluence_id: str, content_hash: Optional[str] = None) -> str:
+        if content_hash:
+            marker = f"<!-- confluence_id:{confluence_id} content_hash:{content_hash} -->"
+        else:
+            marker = f"<!-- confluence_id:{confluence_id} -->"
         footer = f"<p><small>Confluence-ID: {confluence_id}</small></p>"
         if marker in html or footer in html:
             return html
         return f"{html}\n{footer}\n{marker}"
 
-    def _migrate_images(self, html: str, bookstack_page_id: int) -> Tuple[str, int]:
-        replacements: Dict[str, str] = {}
-        unique_sources = []
+    def _prefetch_images(self, html: str) -> Dict[str, bytes]:
+        """Lädt noch nicht übertragene Bilder einer Seite vorab; Fehler werden beim Übertragen erneut versucht."""
+        binaries: Dict[str, bytes] = {}
+        for _, src, _ in self.IMG_SRC_PATTERN.findall(html):
+            if src in binaries or src.startswith("data:") or self.image_registry.lookup(normalize_image_identity(src)):
+                continue
+            try:
+                binaries[src] = self.conf.download_binary(src)
+            except Exception:
+                continue
+        return binaries
 
+    def _image_sources(self, html: str) -> List[str]:
+        """Eindeutige, zu übertragende Bildquellen (ohne eingebettete data:-URLs) in Dokumentreihenfolge."""
+        sources: List[str] = []
         for _, src, _ in self.IMG_SRC_PATTERN.findall(html):
-            if src not in replacements and src not in unique_sources:
-                unique_sources.append(src)
+            if not src.startswith("data:") and src not in sources:
+                sources.append(src)
+        return sources
+
+    def _migrate_images(
+        self, html: str, bookstack_page_id: int, binaries: Optional[Dict[str, bytes]] = None
+    ) -> Tuple[str, int]:
+        replacements: Dict[str, str] = {}
+        unique_sources = self._image_sources(html)
 
         migrated = 0
         for src in unique_sources:
-            if src.startswith("data:"):
-                continue
             try:
-                content = self.conf.download_binary(src)
                 filename = Path(src.split("?")[0]).name or f"image_{migrated + 1}.bin"
-                new_url = self.bs.upload_gallery_image(bookstack_page_id, filename, content)
+                identity = normalize_image_identity(src)
+                new_url = self.image_registry.lookup(identity)
+                if new_url and self.image_registry.verify(new_url, self.bs.gallery_image_exists):
+                    replacements[src] = new_url
+                    migrated += 1
+                    print(f"    Bild wiederverwendet ({migrated}/{len(unique_sources)}): {filename}", flush=True)
+                    continue
+
+                content = (binaries or {}).get(src)
+                if content is None:
+                    content = self.conf.download_binary(src)
+                digest = hashlib.sha256(content).hexdigest()
+                new_url = self.image_registry.lookup_hash(digest)
+                if new_url and self.image_registry.verify(new_url, self.bs.gallery_image_exists):
+                    action = "wiederverwendet (gleicher Inhalt)"
+                else:
+                    new_url = self.bs.upload_gallery_image(bookstack_page_id, filename, content)
+                    action = "migriert"
+                self.image_registry.record(identity, digest, new_url)
                 replacements[src] = new_url
                 migrated += 1
-                print(f"    Bild migriert ({migrated}/{len(unique_sources)}): {filename}", flush=True)
+                print(f"    Bild {action} ({migrated}/{len(unique_sources)}): {filename}", flush=True)
             except Exception as exc:
                 print(f"    Bild konnte nicht übertragen werden ({src}): {exc}")
 
@@ -1065,29 +2662,41 @@ class Migrator:
         updated = self.IMG_SRC_PATTERN.sub(repl, html)
         return updated, migrated
 
-    def _rewrite_internal_links(self, page_map: Dict[str, dict], conf_to_bs: Dict[str, int]) -> None:
+    def _resolve_internal_links(self, html: str, conf_to_bs: Dict[str, int]) -> Tuple[str, Set[str]]:
+        """Ersetzt Links auf Confluence-Seiten (.../pages/{id}/...) durch BookStack-Permalinks.
+
+        Liefert das neue HTML und die Confluence-IDs, für die noch keine BookStack-Seite bekannt ist.
+        """
+        unresolved: Set[str] = set()
+        base_url = self.config.bookstack_base_url.rstrip("/")
+
+        def repl(match: re.Match) -> str:
+            target_id = match.group(2)
+            bs_page_id = conf_to_bs.get(target_id)
+            if bs_page_id:
+                return f'href="{base_url}/link/{bs_page_id}"'
+            unresolved.add(target_id)
+            return match.group(0)
+
+        return self.INTERNAL_LINK_PATTERN.sub(repl, html), unresolved
+
+    def _rewrite_internal_links(
+        self,
+        page_map: Dict[str, dict],
+        conf_to_bs: Dict[str, int],
+        page_ids: Optional[Iterable[str]] = None,
+    ) -> None:
         # Optionaler Schritt: Link-Rewrite ist stark abhängig vom Link-Format.
         # Hier nur Basis-Support für .../pages/{id}/... Links.
-        link_pattern = re.compile(r'href=["\']([^"\']+/pages/(\\d+)[^"\']*)["\']', flags=re.IGNORECASE)
+        targets = conf_to_bs.items() if page_ids is None else [(conf_id, conf_to_bs[conf_id]) for conf_id in page_ids]
 
-        for conf_id, bs_page_id in conf_to_bs.items():
+        for conf_id, bs_page_id in targets:
             page = self.bs._request("GET", f"/api/pages/{bs_page_id}")
             name = page.get("name", "Untitled")
             html = page.get("raw_html") or page.get("html") or ""
 
-            changed = False
-
-            def repl(match: re.Match) -> str:
-                nonlocal changed
-                whole_url = match.group(1)
-                target_id = match.group(2)
-                if target_id in conf_to_bs:
-                    changed = True
-                    return f'href="{self.config.bookstack_base_url}/books/{page.get("book_slug", "")}/page/{conf_to_bs[target_id]}"'
-                return f'href="{whole_url}"'
-
-            new_html = link_pattern.sub(repl, html)
-            if changed:
+            new_html, _ = self._resolve_internal_links(html, conf_to_bs)
+            if new_html != html:
                 self.bs.update_page_html(bs_page_id, name, new_html)
 
 
@@ -1297,10 +2906,16 @@ def test_apis(config: Config) -> int:
     return 0
 
 
-def list_confluence_spaces(config: Config) -> int:
+def list_confluence_spaces(config: Config, space_cache_file: str = "", space_cache_ttl: int = 3600) -> int:
     try:
-        conf = ConfluenceClient(config.confluence_base_url, config.confluence_email, config.confluence_api_token)
-        spaces = conf.list_all_spaces()
+        conf = ConfluenceClient(
+            config.confluence_base_url,
+            config.confluence_email,
+            config.confluence_api_token,
+            space_directory_file=space_cache_file or None,
+            space_directory_ttl=space_cache_ttl,
+        )
+        spaces = list(conf.get_space_directory().values())
     except Exception as exc:
         print(f"Fehler beim Laden der Spaces: {exc}")
         return 30
@@ -1334,6 +2949,27 @@ def pick_overview_file(base_value: str, total_spaces: int, index: int, resolved_
     return str(base.with_name(f"{stem}_{resolved_space_key.lower()}{suffix}"))
 
 
+# Parallel laufende Spaces schreiben dieselbe Sync-Datei (lesen-ändern-schreiben)
+SYNC_STATE_LOCK = threading.Lock()
+
+
+def load_sync_state(path: Path) -> Dict[str, dict]:
+    if not path.exists():
+        return {}
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data.get("spaces", {}) if isinstance(data, dict) else {}
+
+
+def save_sync_state(path: Path, spaces: Dict[str, dict]) -> None:
+    payload = {"updated_at": datetime.now(timezone.utc).isoformat(), "spaces": spaces}
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
 def get_all_bookstack_items(bs: BookStackClient, endpoint: str, count: int = 500) -> List[dict]:
     items: List[dict] = []
     offset = 0
@@ -1377,8 +3013,15 @@ def build_expected_book_names(prefix: str, space_name: str) -> List[str]:
     return [c.strip() for c in candidates if c and c.strip()]
 
 
-def check_migration_completeness(config: Config, resolved_spaces: List[Tuple[str, str, str]], shelf_name: str) -> int:
-    conf = ConfluenceClient(config.confluence_base_url, config.confluence_email, config.confluence_api_token)
+def check_migration_completeness(
+    config: Config,
+    resolved_spaces: List[Tuple[str, str, str]],
+    shelf_name: str,
+    page_cache: Optional[PageCache] = None,
+) -> int:
+    conf = ConfluenceClient(
+        config.confluence_base_url, config.confluence_email, config.confluence_api_token, cache=page_cache
+    )
     bs = BookStackClient(config.bookstack_base_url, config.bookstack_token_id, config.bookstack_token_secret)
 
     shelf = bs.find_shelf_by_name(shelf_name)
@@ -1395,15 +3038,11 @@ def check_migration_completeness(config: Config, resolved_spaces: List[Tuple[str
     shelf_book_ids = {int(book.get("id", -1)) for book in shelf_books if int(book.get("id", -1)) > 0}
 
     all_books = [book for book in bs.list_books() if int(book.get("id", -1)) in shelf_book_ids]
-    all_chapters = [
-        chapter
-        for chapter in get_all_bookstack_items(bs, "/api/chapters")
-        if int(chapter.get("book_id", -1)) in shelf_book_ids
-    ]
+    all_chapters = [chapter for chapter in bs.list_chapters() if int(chapter.get("book_id", -1)) in shelf_book_ids]
     all_pages = [
         page
         for page in get_all_bookstack_items(bs, "/api/pages")
-        if int(page.get("book_id", -1)) in shelf_book_ids
+        if int(page.get("book_id", -1)) in shelf_book_ids and not Migrator.is_image_holder(page)
     ]
 
     has_error = False
@@ -1415,7 +3054,6 @@ def check_migration_completeness(config: Config, resolved_spaces: List[Tuple[str
 
     print(f"[Check] Prüfe Vollständigkeit je Space (Shelf: {shelf_detail.get('name', shelf_name)})...")
     for _, resolved_space, resolved_name in resolved_spaces:
-        expected_space_pages = conf.list_pages_in_space(resolved_space)
         run_cfg = Config(
             confluence_base_url=config.confluence_base_url,
             confluence_email=config.confluence_email,
@@ -1426,8 +3064,20 @@ def check_migration_completeness(config: Config, resolved_spaces: List[Tuple[str
             bookstack_token_secret=config.bookstack_token_secret,
             book_name_prefix=config.book_name_prefix,
         )
-        inspector = Migrator(run_cfg, space_key=resolved_space, dry_run=True, auto_confirm=True, overview_only=True)
-        page_map, children, top_level = inspector._build_structure(expected_space_pages, resolved_name)
+        inspector = Migrator(
+            run_cfg,
+            space_key=resolved_space,
+            dry_run=True,
+            auto_confirm=True,
+            overview_only=True,
+            skeleton=True,
+        )
+        inspector.conf = conf
+        page_map, tree, top_level = inspector._build_structure(
+            (page for batch in conf.iter_pages_in_space(resolved_space, include_body=False) for page in batch),
+            resolved_name,
+        )
+        inspector._ensure_page_bodies(page_map, [chapter_id for root_id in top_level for chapter_id in tree[root_id]])
 
         for root_id in top_level:
             root_title = page_map[root_id].get("title", "Untitled")
@@ -1439,15 +3089,12 @@ def check_migration_completeness(config: Config, resolved_spaces: List[Tuple[str
                     target_book = book
                     break
 
-            expected_chapters = len(children.get(root_id, []))
+            expected_chapters = len(tree.get(root_id, []))
             expected_direct_pages = 1 if expected_chapters == 0 else 0
             expected_pages = 0
-            for chapter_id in children.get(root_id, []):
-                descendants = inspector._collect_descendants(chapter_id, children)
-                expected_pages += max(0, len(descendants) - 1)
-                chapter_view = page_map[chapter_id].get("body", {}).get("view", {}).get("value", "")
-                chapter_storage = page_map[chapter_id].get("body", {}).get("storage", {}).get("value", "")
-                if conf._has_meaningful_content(chapter_view) or conf._has_meaningful_content(chapter_storage):
+            for chapter_id in tree.get(root_id, []):
+                expected_pages += tree.subtree_size(chapter_id) - 1
+                if inspector._page_facts(page_map[chapter_id]).has_content:
                     expected_pages += 1
             if expected_chapters == 0:
                 expected_pages = 1
@@ -1534,8 +3181,38 @@ def check_migration_completeness(config: Config, resolved_spaces: List[Tuple[str
     return 0
 
 
-def verify_confluence_id_markers(config: Config, resolved_spaces: List[Tuple[str, str, str]], shelf_name: str, report_file: str) -> int:
-    conf = ConfluenceClient(config.confluence_base_url, config.confluence_email, config.confluence_api_token)
+def scan_bookstack_markers(bs: BookStackClient, pages: List[dict], limit: int = HTTP_POOL_SIZE) -> List[Tuple[dict, str, Optional[str]]]:
+    """Lädt die Seiten gleichzeitig und liefert (Seite, Confluence-ID, Inhalts-Hash) in Seitenreihenfolge."""
+
+    async def scan(client: AsyncBookStackClient, page: dict) -> List[Tuple[dict, str, Optional[str]]]:
+        try:
+            detail = await client.get_page(int(page.get("id", -1)))
+        except Exception:
+            return []
+        html_text = detail.get("raw_html") or detail.get("html") or ""
+        return [(page, conf_id, content_hash or None) for conf_id, content_hash in Migrator.MARKER_PATTERN.findall(html_text)]
+
+    async def scan_all() -> List[List[Tuple[dict, str, Optional[str]]]]:
+        return await asyncio.gather(*(scan(client, page) for page in pages if int(page.get("id", -1)) > 0))
+
+    client = AsyncBookStackClient(bs, limit=limit)
+    try:
+        return [marker for found in asyncio.run(scan_all()) for marker in found]
+    finally:
+        client.close()
+
+
+def verify_confluence_id_markers(
+    config: Config,
+    resolved_spaces: List[Tuple[str, str, str]],
+    shelf_name: str,
+    report_file: str,
+    page_cache: Optional[PageCache] = None,
+    state: Optional[MigrationState] = None,
+) -> int:
+    conf = ConfluenceClient(
+        config.confluence_base_url, config.confluence_email, config.confluence_api_token, cache=page_cache
+    )
     bs = BookStackClient(config.bookstack_base_url, config.bookstack_token_id, config.bookstack_token_secret)
 
     shelf = bs.find_shelf_by_name(shelf_name)
@@ -1554,7 +3231,6 @@ def verify_confluence_id_markers(config: Config, resolved_spaces: List[Tuple[str
     expected_ids: Set[str] = set()
     expected_titles: Dict[str, str] = {}
     for _, resolved_space, resolved_name in resolved_spaces:
-        pages = conf.list_pages_in_space(resolved_space)
         run_cfg = Config(
             confluence_base_url=config.confluence_base_url,
             confluence_email=config.confluence_email,
@@ -1565,48 +3241,54 @@ def verify_confluence_id_markers(config: Config, resolved_spaces: List[Tuple[str
             bookstack_token_secret=config.bookstack_token_secret,
             book_name_prefix=config.book_name_prefix,
         )
-        inspector = Migrator(run_cfg, space_key=resolved_space, dry_run=True, auto_confirm=True, overview_only=True)
-        page_map, children, top_level = inspector._build_structure(pages, resolved_name)
+        inspector = Migrator(
+            run_cfg,
+            space_key=resolved_space,
+            dry_run=True,
+            auto_confirm=True,
+            overview_only=True,
+            skeleton=True,
+        )
+        inspector.conf = conf
+        page_map, tree, top_level = inspector._build_structure(
+            (page for batch in conf.iter_pages_in_space(resolved_space, include_body=False) for page in batch),
+            resolved_name,
+        )
+        inspector._ensure_page_bodies(page_map, [chapter_id for root_id in top_level for chapter_id in tree[root_id]])
 
         for root_id in top_level:
-            has_children = len(children.get(root_id, [])) > 0
+            has_children = len(tree.get(root_id, [])) > 0
             if not has_children:
                 expected_ids.add(str(root_id))
                 expected_titles.setdefault(str(root_id), page_map[root_id].get("title", "Untitled"))
                 continue
 
-            for chapter_id in children.get(root_id, []):
-                chapter_view = page_map[chapter_id].get("body", {}).get("view", {}).get("value", "")
-                chapter_storage = page_map[chapter_id].get("body", {}).get("storage", {}).get("value", "")
-                chapter_has_content = conf._has_meaningful_content(chapter_view) or conf._has_meaningful_content(
-                    chapter_storage
-                )
-                if chapter_has_content:
+            for chapter_id in tree.get(root_id, []):
+                if inspector._page_facts(page_map[chapter_id]).has_content:
                     expected_ids.add(str(chapter_id))
                     expected_titles.setdefault(str(chapter_id), page_map[chapter_id].get("title", "Untitled"))
 
-                descendants = inspector._collect_descendants(chapter_id, children)
-                for child_id in descendants:
-                    if child_id == chapter_id:
-                        continue
+                for child_id in tree.descendants(chapter_id)[1:]:
                     expected_ids.add(str(child_id))
                     expected_titles.setdefault(str(child_id), page_map[child_id].get("title", "Untitled"))
 
-    pages = [p for p in get_all_bookstack_items(bs, "/api/pages") if int(p.get("book_id", -1)) in book_ids]
-    marker_pattern = re.compile(r"confluence_id:(\d+)")
+    pages = [
+        p
+        for p in get_all_bookstack_items(bs, "/api/pages")
+        if int(p.get("book_id", -1)) in book_ids and not Migrator.is_image_holder(p)
+    ]
     found_map: Dict[str, List[int]] = {}
+    found_pages: Dict[str, Tuple[dict, Optional[str]]] = {}
 
-    for page in pages:
-        pid = int(page.get("id", -1))
-        if pid <= 0:
-            continue
-        try:
-            detail = bs._request("GET", f"/api/pages/{pid}")
-        except Exception:
-            continue
-        html_text = detail.get("raw_html") or detail.get("html") or ""
-        for match in marker_pattern.findall(html_text):
-            found_map.setdefault(match, []).append(pid)
+    for page, match, content_hash in scan_bookstack_markers(bs, pages):
+        found_map.setdefault(match, []).append(int(page["id"]))
+        found_pages[match] = (page, content_hash)
+
+    if state is not None:
+        for conf_id, ids in found_map.items():
+            if len(ids) == 1:
+                page, content_hash = found_pages[conf_id]
+                state.record("page", conf_id, ids[0], int(page.get("book_id", -1)), page.get("name", ""), content_hash)
 
     missing = sorted([pid for pid in expected_ids if pid not in found_map])
     duplicates = {pid: ids for pid, ids in found_map.items() if len(ids) > 1}
@@ -1651,8 +3333,12 @@ def cleanup_duplicate_content(config: Config, shelf_name: str, assume_yes: bool,
         print("[Cleanup] Keine Books im Shelf gefunden.")
         return 0
 
-    chapters = [c for c in get_all_bookstack_items(bs, "/api/chapters") if int(c.get("book_id", -1)) in book_ids]
-    pages = [p for p in get_all_bookstack_items(bs, "/api/pages") if int(p.get("book_id", -1)) in book_ids]
+    chapters = [c for c in bs.list_chapters() if int(c.get("book_id", -1)) in book_ids]
+    pages = [
+        p
+        for p in get_all_bookstack_items(bs, "/api/pages")
+        if int(p.get("book_id", -1)) in book_ids and not Migrator.is_image_holder(p)
+    ]
 
     pages_by_chapter: Dict[int, List[dict]] = {}
     for page in pages:
@@ -1755,7 +3441,7 @@ def cleanup_duplicate_content(config: Config, shelf_name: str, assume_yes: bool,
 
     deleted_chapters = 0
     for chapter_id in sorted(delete_chapter_ids):
-        bs._request("DELETE", f"/api/chapters/{chapter_id}")
+        bs.delete_chapter(chapter_id)
         deleted_chapters += 1
 
     deleted_pages = 0
@@ -1772,6 +3458,203 @@ def parse_space_keys(value: str) -> List[str]:
     return [part for part in parts if part]
 
 
+def migrate_space(
+    args: argparse.Namespace,
+    cfg: Config,
+    idx: int,
+    resolved_spaces: List[Tuple[str, str, str]],
+    page_cache: Optional[PageCache],
+    state: Optional[MigrationState],
+    catalog: Optional[BookStackCatalog],
+    image_registry: ImageRegistry,
+) -> dict:
+    """Migriert einen Space mit eigenem Migrator; Katalog, Bildregister und Zustand werden geteilt."""
+    requested_space, resolved_space, resolved_name = resolved_spaces[idx - 1]
+    print(f"\n=== Space {idx}/{len(resolved_spaces)}: {resolved_space} ({resolved_name}) ===", flush=True)
+    if requested_space.lower() != resolved_space.lower():
+        print(f"Alias aufgelöst: {requested_space} -> {resolved_space}", flush=True)
+
+    run_cfg = Config(
+        confluence_base_url=cfg.confluence_base_url,
+        confluence_email=cfg.confluence_email,
+        confluence_api_token=cfg.confluence_api_token,
+        confluence_space_key=resolved_space,
+        bookstack_base_url=cfg.bookstack_base_url,
+        bookstack_token_id=cfg.bookstack_token_id,
+        bookstack_token_secret=cfg.bookstack_token_secret,
+        book_name_prefix=cfg.book_name_prefix,
+    )
+    overview_path = pick_overview_file(args.overview_file, len(resolved_spaces), idx, resolved_space)
+    migrator = Migrator(
+        run_cfg,
+        space_key=resolved_space,
+        dry_run=args.dry_run,
+        auto_confirm=args.yes,
+        overview_only=args.overview_only,
+        overview_file=overview_path,
+        fetch_workers=args.fetch_workers,
+        skeleton=args.skeleton,
+        page_cache=page_cache,
+        since_last_run=args.since_last_run,
+        sync_state_file=args.sync_state_file,
+        write_workers=args.write_workers,
+        single_write=args.single_write,
+        state=state,
+        marker_search=args.marker_search,
+        resume=args.resume,
+        catalog=catalog,
+        image_registry=image_registry,
+    )
+    try:
+        return migrator.run()
+    finally:
+        migrator.converter.shutdown()
+
+
+def describe_error(exc: Exception) -> str:
+    if isinstance(exc, requests.HTTPError):
+        status = exc.response.status_code if exc.response is not None else "?"
+        text = exc.response.text[:500] if exc.response is not None else ""
+        return f"HTTP-Fehler ({status}): {text}"
+    return f"Fehler: {exc}"
+
+
+def print_space_summary(
+    resolved_spaces: List[Tuple[str, str, str]],
+    results: List[Optional[dict]],
+    errors: List[Optional[Exception]],
+) -> None:
+    """Konsolidierte Übersicht aller migrierten Spaces (auch bei paralleler Ausführung in Space-Reihenfolge)."""
+    keys = ("created", "updated", "unchanged", "skipped_error")
+    totals = {key: 0 for key in keys}
+    print("\n=== Zusammenfassung ===")
+    for idx, (_, resolved_space, resolved_name) in enumerate(resolved_spaces):
+        result = results[idx]
+        if result is None:
+            status = "FEHLER" if errors[idx] is not None else "nicht ausgeführt"
+            print(f"  {resolved_space} ({resolved_name}): {status}")
+            continue
+        stats = result.get("migration_stats") or {}
+        for key in keys:
+            totals[key] += int(stats.get(key, 0))
+        print(
+            f"  {resolved_space} ({resolved_name}): Seiten {result.get('pages_total', 0)}, "
+            f"Bücher {len(result.get('book_ids') or [])}, Erstellt {stats.get('created', 0)}, "
+            f"Aktualisiert {stats.get('updated', 0)}, Unverändert {stats.get('unchanged', 0)}, "
+            f"Fehler {stats.get('skipped_error', 0)}"
+        )
+    print(
+        f"  Gesamt: Erstellt {totals['created']}, Aktualisiert {totals['updated']}, "
+        f"Unverändert {totals['unchanged']}, Fehler {totals['skipped_error']}"
+    )
+
+
+def run_migration(
+    args: argparse.Namespace,
+    cfg: Config,
+    page_cache: Optional[PageCache],
+    state: Optional[MigrationState],
+) -> int:
+    """Löst die Spaces auf und führt Prüfung bzw. Migration aus; Cache und Zustand schließt der Aufrufer."""
+    requested_spaces = parse_space_keys(args.spaces)
+    if not requested_spaces:
+        requested_spaces = [cfg.confluence_space_key]
+
+    try:
+        conf_resolver = ConfluenceClient(
+            cfg.confluence_base_url,
+            cfg.confluence_email,
+            cfg.confluence_api_token,
+            space_directory_file=args.space_cache_file or None,
+            space_directory_ttl=args.space_cache_ttl,
+        )
+        resolved_spaces: List[Tuple[str, str, str]] = []
+        for requested_space in requested_spaces:
+            resolved_space = conf_resolver.resolve_space_key(requested_space)
+            resolved_name = conf_resolver.get_space_name(resolved_space)
+            resolved_spaces.append((requested_space, resolved_space, resolved_name))
+    except Exception as exc:
+        print(f"Fehler bei Space-Auflösung: {exc}")
+        return 1
+
+    if args.verify_ids:
+        return verify_confluence_id_markers(
+            cfg, resolved_spaces, args.shelf_name, args.verify_report, page_cache=page_cache, state=state
+        )
+
+    if args.check_credentials or args.debug_auth:
+        print("[Auth-Check] Aufgelöste Spaces:")
+        for requested_space, resolved_space, resolved_name in resolved_spaces:
+            alias = f" (angefragt als {requested_space})" if requested_space.lower() != resolved_space.lower() else ""
+            print(f"  - {resolved_space}: {resolved_name}{alias}")
+        return check_credentials(cfg, debug_auth=args.debug_auth)
+
+    if args.check_only:
+        return check_migration_completeness(cfg, resolved_spaces, args.shelf_name, page_cache=page_cache)
+
+    writes = not (args.dry_run or args.overview_only)
+    space_workers = max(1, min(int(args.space_workers or 1), len(resolved_spaces)))
+    if space_workers > 1 and writes and not args.yes:
+        print("[WARN] --space-workers > 1 benötigt --yes (keine parallelen Rückfragen) - Spaces laufen sequentiell.")
+        space_workers = 1
+
+    shared_bs = BookStackClient(cfg.bookstack_base_url, cfg.bookstack_token_id, cfg.bookstack_token_secret)
+    catalog = shared_bs.catalog if writes else None
+    image_registry = ImageRegistry(args.image_registry, state=state, namespace=cfg.bookstack_base_url)
+    results: List[Optional[dict]] = [None] * len(resolved_spaces)
+    errors: List[Optional[Exception]] = [None] * len(resolved_spaces)
+
+    def run_space(idx: int) -> None:
+        try:
+            results[idx] = migrate_space(
+                args, cfg, idx + 1, resolved_spaces, page_cache, state, catalog, image_registry
+            )
+        except Exception as exc:
+            errors[idx] = exc
+            print(f"[FEHLER] Space {resolved_spaces[idx][1]}: {describe_error(exc)}", flush=True)
+
+    if space_workers > 1:
+        print(f"Migriere {len(resolved_spaces)} Spaces mit {space_workers} parallelen Workern.")
+        with ThreadPoolExecutor(max_workers=space_workers) as pool:
+            list(pool.map(run_space, range(len(resolved_spaces))))
+    else:
+        for idx in range(len(resolved_spaces)):
+            run_space(idx)
+            if errors[idx] is not None:
+                break
+
+    migrated_book_ids: List[int] = []
+    for result in results:
+        for bid in (result or {}).get("book_ids") or []:
+            if int(bid) > 0 and int(bid) not in migrated_book_ids:
+                migrated_book_ids.append(int(bid))
+
+    try:
+        if writes and migrated_book_ids:
+            shelf = shared_bs.ensure_shelf_books(
+                args.shelf_name,
+                migrated_book_ids,
+                description="Isoliertes Shelf für Confluence-Migrationen",
+            )
+            print(
+                f"Shelf synchronisiert: {shelf.get('name', args.shelf_name)} "
+                f"(ID {shelf.get('id')}, Bücher: {len(migrated_book_ids)})"
+            )
+    except Exception as exc:
+        errors.append(exc)
+        print(f"[FEHLER] Shelf-Synchronisation: {describe_error(exc)}")
+
+    if len(resolved_spaces) > 1:
+        print_space_summary(resolved_spaces, results, errors)
+
+    failures = [exc for exc in errors if exc is not None]
+    if any(isinstance(exc, requests.HTTPError) for exc in failures):
+        return 2
+    if failures:
+        return 3
+    return 0
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description="Confluence Cloud -> BookStack Migration (inkl. Bilder)")
     parser.add_argument("--dry-run", action="store_true", help="Nur Struktur prüfen, nichts in BookStack schreiben")
@@ -1855,6 +3738,86 @@ def main() -> int:
         default="duplicate_cleanup_report.json",
         help="Pfad fuer den Duplikat-Report (Default: duplicate_cleanup_report.json)",
     )
+    parser.add_argument(
+        "--fetch-workers",
+        type=int,
+        default=int(os.getenv("CONFLUENCE_FETCH_WORKERS", "8")),
+        help="Anzahl paralleler Confluence-Abrufe für fehlende Seiteninhalte (Default: 8)",
+    )
+    parser.add_argument(
+        "--write-workers",
+        type=int,
+        default=int(os.getenv("BOOKSTACK_WRITE_WORKERS", "1")),
+        help="Anzahl paralleler BookStack-Schreib-Worker in Schritt 5 für Aktualisierungen und Bilder; neue Seiten werden weiter in Eingabereihenfolge angelegt (Default: 1 = sequentiell)",
+    )
+    parser.add_argument(
+        "--space-workers",
+        type=int,
+        default=int(os.getenv("CONFLUENCE_SPACE_WORKERS", "1")),
+        help="Anzahl parallel migrierter Spaces bei --spaces (Default: 1 = sequentiell; parallel nur mit --yes)",
+    )
+    parser.add_argument(
+        "--state-db",
+        default=os.getenv("MIGRATION_STATE_DB", "migration_state.db"),
+        help="SQLite-Migrationszustand (Zuordnungen Confluence -> BookStack, Bilder, Fortschritt); leer = deaktiviert",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Setzt einen abgebrochenen Lauf anhand des Checkpoint-Journals im Migrationszustand fort",
+    )
+    parser.add_argument(
+        "--marker-search",
+        action="store_true",
+        help="Sucht nicht gemappte Seiten über die BookStack-Suche nach dem Footer 'Confluence-ID:'",
+    )
+    parser.add_argument(
+        "--single-write",
+        action="store_true",
+        help="Lädt Bilder und löst Links vor dem Schreiben auf, sodass jede Seite genau einen Inhalts-Request erhält (Bilder neuer Seiten liegen dauerhaft auf der Seite 'Confluence-Bildablage' je Buch)",
+    )
+    parser.add_argument(
+        "--skeleton",
+        action="store_true",
+        help="Lädt zunächst nur die Seitenstruktur (ohne HTML) und Inhalte nur für die tatsächlich benötigten Seiten",
+    )
+    parser.add_argument(
+        "--cache-file",
+        default=os.getenv("CONFLUENCE_CACHE_FILE", ""),
+        help="SQLite-Datei für den lokalen Confluence-Seitencache (Invalidierung über Versionsnummer)",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=int(os.getenv("CONFLUENCE_CACHE_MAX_MB", "512")),
+        help="Maximale Größe des Seitencaches in MB; älteste Einträge werden verdrängt (Default: 512)",
+    )
+    parser.add_argument(
+        "--since-last-run",
+        action="store_true",
+        help="Nur seit dem letzten erfolgreichen Lauf geänderte Seiten übertragen (Löschungen werden nicht erkannt)",
+    )
+    parser.add_argument(
+        "--sync-state-file",
+        default=os.getenv("SYNC_STATE_FILE", "migration_sync_state.json"),
+        help="JSON-Datei mit dem Zeitpunkt des letzten erfolgreichen Syncs je Space",
+    )
+    parser.add_argument(
+        "--image-registry",
+        default=os.getenv("IMAGE_REGISTRY_FILE", "image_transfer_registry.json"),
+        help="JSON-Register bereits übertragener Bilder; identische Bilder werden nur einmal hochgeladen",
+    )
+    parser.add_argument(
+        "--space-cache-file",
+        default=os.getenv("CONFLUENCE_SPACE_CACHE_FILE", ".confluence_spaces.json"),
+        help="JSON-Cache des Confluence Space-Verzeichnisses (leer = nur im Speicher)",
+    )
+    parser.add_argument(
+        "--space-cache-ttl",
+        type=int,
+        default=int(os.getenv("CONFLUENCE_SPACE_CACHE_TTL", "3600")),
+        help="Gültigkeit des Space-Verzeichnis-Caches in Sekunden (Default: 3600)",
+    )
     args = parser.parse_args()
 
     if args.preview_structure and not args.overview_only:
@@ -1873,90 +3836,22 @@ def main() -> int:
         return cleanup_duplicate_content(cfg, args.shelf_name, args.yes, args.cleanup_report)
 
     if args.list_spaces:
-        return list_confluence_spaces(cfg)
+        return list_confluence_spaces(cfg, args.space_cache_file, args.space_cache_ttl)
 
     if args.test_apis:
         return test_apis(cfg)
 
-    requested_spaces = parse_space_keys(args.spaces)
-    if not requested_spaces:
-        requested_spaces = [cfg.confluence_space_key]
+    page_cache = PageCache(args.cache_file, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_file else None
+    # Dry-run/Übersicht schreiben nichts nach BookStack und legen daher auch keinen Zustand an
+    state = MigrationState(args.state_db) if args.state_db and not (args.dry_run or args.overview_only) else None
 
     try:
-        conf_resolver = ConfluenceClient(cfg.confluence_base_url, cfg.confluence_email, cfg.confluence_api_token)
-        resolved_spaces: List[Tuple[str, str, str]] = []
-        for requested_space in requested_spaces:
-            resolved_space = conf_resolver.resolve_space_key(requested_space)
-            resolved_name = conf_resolver.get_space_name(resolved_space)
-            resolved_spaces.append((requested_space, resolved_space, resolved_name))
-    except Exception as exc:
-        print(f"Fehler bei Space-Auflösung: {exc}")
-        return 1
-
-    if args.verify_ids:
-        return verify_confluence_id_markers(cfg, resolved_spaces, args.shelf_name, args.verify_report)
-
-    if args.check_credentials or args.debug_auth:
-        print("[Auth-Check] Aufgelöste Spaces:")
-        for requested_space, resolved_space, resolved_name in resolved_spaces:
-            alias = f" (angefragt als {requested_space})" if requested_space.lower() != resolved_space.lower() else ""
-            print(f"  - {resolved_space}: {resolved_name}{alias}")
-        return check_credentials(cfg, debug_auth=args.debug_auth)
-
-    if args.check_only:
-        return check_migration_completeness(cfg, resolved_spaces, args.shelf_name)
-
-    migrated_book_ids: List[int] = []
-    try:
-        for idx, (requested_space, resolved_space, resolved_name) in enumerate(resolved_spaces, start=1):
-            print(f"\n=== Space {idx}/{len(resolved_spaces)}: {resolved_space} ({resolved_name}) ===")
-            if requested_space.lower() != resolved_space.lower():
-                print(f"Alias aufgelöst: {requested_space} -> {resolved_space}")
-
-            run_cfg = Config(
-                confluence_base_url=cfg.confluence_base_url,
-                confluence_email=cfg.confluence_email,
-                confluence_api_token=cfg.confluence_api_token,
-                confluence_space_key=resolved_space,
-                bookstack_base_url=cfg.bookstack_base_url,
-                bookstack_token_id=cfg.bookstack_token_id,
-                bookstack_token_secret=cfg.bookstack_token_secret,
-                book_name_prefix=cfg.book_name_prefix,
-            )
-            overview_path = pick_overview_file(args.overview_file, len(resolved_spaces), idx, resolved_space)
-            result = Migrator(
-                run_cfg,
-                space_key=resolved_space,
-                dry_run=args.dry_run,
-                auto_confirm=args.yes,
-                overview_only=args.overview_only,
-                overview_file=overview_path,
-            ).run()
-
-            book_ids = result.get("book_ids") or []
-            migrated_book_ids.extend([int(bid) for bid in book_ids if int(bid) > 0])
-
-            if not args.dry_run and not args.overview_only and migrated_book_ids:
-                bs = BookStackClient(cfg.bookstack_base_url, cfg.bookstack_token_id, cfg.bookstack_token_secret)
-                shelf = bs.ensure_shelf_books(
-                    args.shelf_name,
-                    migrated_book_ids,
-                    description="Isoliertes Shelf für Confluence-Migrationen",
-                )
-                print(
-                    f"Shelf synchronisiert: {shelf.get('name', args.shelf_name)} "
-                    f"(ID {shelf.get('id')}, Bücher: {len(migrated_book_ids)})"
-                )
-    except requests.HTTPError as exc:
-        status = exc.response.status_code if exc.response else "?"
-        text = exc.response.text[:500] if exc.response is not None else ""
-        print(f"HTTP-Fehler ({status}): {text}")
-        return 2
-    except Exception as exc:
-        print(f"Fehler: {exc}")
-        return 3
-
-    return 0
+        return run_migration(args, cfg, page_cache, state)
+    finally:
+        if state is not None:
+            state.close()
+        if page_cache is not None:
+            page_cache.close()
 
 
 if __name__ == "__main__":
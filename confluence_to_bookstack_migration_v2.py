@@ -20,6 +20,8 @@ from urllib.parse import parse_qs, urljoin, urlparse
 
 import requests
 
+from bookstack_rate_limiter import RateLimiter
+
 
 @dataclass
 class Config:
@@ -151,23 +153,40 @@ class BookStackClient:
             "Accept": "application/json",
             "Content-Type": "application/json"
         })
+        self.limiter = RateLimiter.for_host(self.base_url)
 
-    def _request(self, method: str, path: str, json_data: Optional[dict] = None, retry_count: int = 3) -> dict:
+    def _request(
+        self,
+        method: str,
+        path: str,
+        json_data: Optional[dict] = None,
+        retry_count: int = 3,
+        data: Optional[dict] = None,
+        files: Optional[dict] = None,
+        timeout: int = 30,
+    ) -> dict:
         """HTTP Request mit Retry-Logik"""
         url = f"{self.base_url}{path}"
+        # Multipart: Content-Type der Session entfernen, requests setzt die Boundary selbst
+        headers = {"Content-Type": None} if files is not None else None
         
         for attempt in range(1, retry_count + 1):
             try:
+                self.limiter.acquire()
                 response = self.session.request(
                     method=method,
                     url=url,
                     json=json_data,
-                    timeout=30
+                    data=data,
+                    files=files,
+                    headers=headers,
+                    timeout=timeout
                 )
+                self.limiter.on_response(response.status_code, response.headers)
                 
                 if response.status_code in (429, 500, 502, 503, 504) and attempt < retry_count:
-                    wait_time = min(2 * attempt, 10)
-                    print(f"  [Retry {attempt}/{retry_count}] Status {response.status_code}, warte {wait_time}s", flush=True)
+                    wait_time = self.limiter.retry_delay(attempt, response.headers)
+                    print(f"  [Retry {attempt}/{retry_count}] Status {response.status_code}, warte {wait_time:.1f}s", flush=True)
                     time.sleep(wait_time)
                     continue
                 
@@ -180,8 +199,8 @@ class BookStackClient:
             except (requests.Timeout, requests.ConnectionError) as exc:
                 if attempt >= retry_count:
                     raise
-                wait_time = min(2 * attempt, 10)
-                print(f"  [Retry {attempt}/{retry_count}] {type(exc).__name__}, warte {wait_time}s", flush=True)
+                wait_time = self.limiter.retry_delay(attempt)
+                print(f"  [Retry {attempt}/{retry_count}] {type(exc).__name__}, warte {wait_time:.1f}s", flush=True)
                 time.sleep(wait_time)
         
         return {}
@@ -280,26 +299,12 @@ class BookStackClient:
 
     def upload_image(self, page_id: int, filename: str, image_data: bytes) -> dict:
         """Upload Bild zu Page"""
-        url = f"{self.base_url}/api/image-gallery"
         files = {"image": (filename, image_data, "image/png")}
         data = {
             "type": "gallery",
             "uploaded_to": page_id
         }
-        
-        # Temporarily remove Content-Type header for multipart
-        headers = dict(self.session.headers)
-        headers.pop("Content-Type", None)
-        
-        response = requests.post(
-            url,
-            headers=headers,
-            files=files,
-            data=data,
-            timeout=60
-        )
-        response.raise_for_status()
-        return response.json()
+        return self._request("POST", "/api/image-gallery", data=data, files=files, timeout=60)
 
     def list_shelves(self) -> List[dict]:
         """Liste alle Shelves"""
@@ -790,7 +795,6 @@ def run_migration(config: Config, space_keys: List[str], shelf_name: str, dry_ru
                         book_id = book["id"]
                         migrated_book_ids.append(book_id)
                         print(f"      Book erstellt: ID {book_id}")
-                        time.sleep(0.3)  # Rate limiting
                 
                 # Process chapters (level 2)
                 if children[root_id]:
@@ -825,7 +829,6 @@ def run_migration(config: Config, space_keys: List[str], shelf_name: str, dry_ru
                                 chapter_bs = bs.create_chapter(book_id, chapter_title)
                                 chapter_bs_id = chapter_bs["id"]
                                 print(f" ✓ (ID {chapter_bs_id})")
-                                time.sleep(0.2)
                             except Exception as exc:
                                 print(f" ✗ Fehler: {exc}")
                                 continue
@@ -869,7 +872,6 @@ def run_migration(config: Config, space_keys: List[str], shelf_name: str, dry_ru
                                             chapter_id=chapter_bs_id
                                         )
                                         print(f"              [{page_idx}/{len(children[chapter_id])}] {status} {page_title} ✓ (ID {created_page['id']})")
-                                        time.sleep(0.15)
                                     except Exception as exc:
                                         print(f"              [{page_idx}/{len(children[chapter_id])}] ✗ {page_title}: {exc}")
             
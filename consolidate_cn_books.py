@@ -7,7 +7,13 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from confluence_to_bookstack_migration import BookStackClient, ConfluenceClient, Migrator, load_config_from_env
+from confluence_to_bookstack_migration import (
+    BookStackClient,
+    ConfluenceClient,
+    Migrator,
+    SpaceTree,
+    load_config_from_env,
+)
 
 REPORT_PATH = Path("cn_books_consolidation_report.json")
 TARGET_BOOK_NAME = "Confluence - Computer & Netzwerk"
@@ -105,6 +111,7 @@ def build_confluence_order(conf: ConfluenceClient, space_key: str) -> Tuple[List
         else:
             top_level.append(page["id"])
 
+    tree = SpaceTree(children, top_level)
     order: List[Tuple[str, bool]] = []
     trail_title_by_id: Dict[str, str] = {}
 
@@ -116,24 +123,9 @@ def build_confluence_order(conf: ConfluenceClient, space_key: str) -> Tuple[List
         order.append((root_title, has_children))
 
         if has_children:
-            queue = list(children[root_id])
-            while queue:
-                node = queue.pop(0)
-                chain = []
-                node_page = page_map[node]
-                anc = node_page.get("ancestors", []) or []
-                for a in anc:
-                    aid = a.get("id")
-                    if aid in page_map:
-                        chain.append(page_map[aid].get("title", ""))
-                chain.append(node_page.get("title", "Untitled"))
-                if len(chain) > 1:
-                    trail = " / ".join(chain[1:])
-                else:
-                    trail = chain[0]
+            for node, trail in tree.trail_titles(page_map, root_id).items():
                 trail_title_by_id[node] = trail
                 order.append((trail, False))
-                queue[0:0] = children[node]
 
     return order, trail_title_by_id, children
 
@@ -1,7 +1,8 @@
+import argparse
 import os
 from pathlib import Path
 
-from confluence_to_bookstack_migration import BookStackClient, load_config_from_env
+from confluence_to_bookstack_migration import BookStackClient, MigrationState, load_config_from_env
 
 
 def load_dotenv(path: Path) -> None:
@@ -14,11 +15,29 @@ def load_dotenv(path: Path) -> None:
 
 
 def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-id", type=int, default=220)
+    parser.add_argument("--confluence-id", default="", help="Confluence-Seiten-ID, Auflösung über den Migrationszustand")
+    parser.add_argument("--state-db", default=os.getenv("MIGRATION_STATE_DB", "migration_state.db"))
+    args = parser.parse_args()
+
     load_dotenv(Path(".env"))
     cfg = load_config_from_env()
     bs = BookStackClient(cfg.bookstack_base_url, cfg.bookstack_token_id, cfg.bookstack_token_secret)
 
-    page = bs._request("GET", "/api/pages/220")
+    page_id = args.page_id
+    if args.confluence_id:
+        state = MigrationState(args.state_db)
+        try:
+            entry = state.lookup("page", args.confluence_id)
+        finally:
+            state.close()
+        if not entry:
+            print(f"NOT_MIGRATED={args.confluence_id}")
+            return 1
+        page_id = entry["bookstack_id"]
+
+    page = bs._request("GET", f"/api/pages/{page_id}")
 
     base = cfg.bookstack_base_url.rstrip("/")
     book_slug = page.get("book_slug")
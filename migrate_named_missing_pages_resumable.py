@@ -4,11 +4,18 @@ import os
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Set
 
 import requests
 
-from confluence_to_bookstack_migration import BookStackClient, ConfluenceClient, Migrator, load_config_from_env
+from confluence_to_bookstack_migration import (
+    BookStackClient,
+    Config,
+    ConfluenceClient,
+    MigrationState,
+    Migrator,
+    load_config_from_env,
+)
 
 TARGETS = [
     "Web Cam",
@@ -20,6 +27,7 @@ TARGETS = [
 ]
 ROOTS_WITH_DESCENDANTS = {"Anleitungsartikel", "Moved to bookstack"}
 REPORT = Path("named_missing_migration_report.json")
+TOOL = "named_missing_pages"
 
 
 def load_dotenv(path: Path) -> None:
@@ -101,8 +109,24 @@ def write_report(report: dict) -> None:
     REPORT.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
 
 
-def already_processed(report: dict, page_id: str) -> bool:
+def bookstack_page_exists(bs: BookStackClient, page_id: int) -> bool:
+    try:
+        bs.get_page(int(page_id))
+    except requests.HTTPError as exc:
+        if exc.response is not None and exc.response.status_code == 404:
+            return False
+        raise
+    return True
+
+
+def already_processed(report: dict, page_id: str, state: MigrationState, progress: Set[str], bs: BookStackClient) -> bool:
     pid = str(page_id)
+    if pid in progress:
+        return True
+    # Zustandseintrag zählt nur, solange die Seite in BookStack noch existiert
+    entry = state.lookup("page", pid)
+    if entry and bookstack_page_exists(bs, entry["bookstack_id"]):
+        return True
     for item in report.get("migrated", []):
         if str(item.get("confluence_page_id")) == pid:
             return True
@@ -112,17 +136,10 @@ def already_processed(report: dict, page_id: str) -> bool:
     return False
 
 
-def main() -> int:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--max-pages", type=int, default=10)
-    args = parser.parse_args()
-
-    load_dotenv(Path(".env"))
-    cfg = load_config_from_env()
-
+def migrate_named_pages(args: argparse.Namespace, cfg: Config, state: MigrationState) -> int:
     conf = ConfluenceClient(cfg.confluence_base_url, cfg.confluence_email, cfg.confluence_api_token)
     bs = BookStackClient(cfg.bookstack_base_url, cfg.bookstack_token_id, cfg.bookstack_token_secret)
-    migrator = Migrator(cfg, dry_run=False)
+    migrator = Migrator(cfg, dry_run=False, state=state)
 
     space_name = conf.get_space_name(cfg.confluence_space_key)
     book_name = f"{cfg.book_name_prefix}{space_name}" if cfg.book_name_prefix else space_name
@@ -164,12 +181,13 @@ def main() -> int:
     existing_pages = bs._request("GET", "/api/pages?count=500").get("data", [])
     existing_names = {(p.get("name") or "") for p in existing_pages}
 
+    progress = set(state.progress(TOOL))
     migrated_now = 0
     for page_id, page in to_migrate.items():
         if migrated_now >= args.max_pages:
             break
 
-        if already_processed(report, page_id):
+        if already_processed(report, page_id, state, progress, bs):
             continue
 
         title = page.get("title", "Untitled")
@@ -195,6 +213,8 @@ def main() -> int:
                         "migrated_images": image_count,
                     }
                 )
+                state.record("page", page_id, new_page_id, book["id"], title)
+                state.mark_progress(TOOL, page_id, "migrated", str(new_page_id))
                 existing_names.add(title)
                 migrated_now += 1
                 retry_error = None
@@ -214,6 +234,7 @@ def main() -> int:
                     "error": retry_error,
                 }
             )
+            state.mark_progress(TOOL, page_id, "error", retry_error)
             write_report(report)
 
     targets_after = []
@@ -239,5 +260,21 @@ def main() -> int:
     return 0
 
 
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-pages", type=int, default=10)
+    parser.add_argument("--state-db", default=os.getenv("MIGRATION_STATE_DB", "migration_state.db"))
+    args = parser.parse_args()
+
+    load_dotenv(Path(".env"))
+    cfg = load_config_from_env()
+
+    state = MigrationState(args.state_db)
+    try:
+        return migrate_named_pages(args, cfg, state)
+    finally:
+        state.close()
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
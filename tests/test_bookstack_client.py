@@ -0,0 +1,227 @@
+import asyncio
+import re
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+import confluence_to_bookstack_migration as mig
+
+
+class ScriptedBookStackClient(mig.BookStackClient):
+    def __init__(self, books=None, chapters=None, shelves=None):
+        super().__init__("https://bookstack.example.com", "token_id", "token_secret")
+        self.store = {"books": books or [], "chapters": chapters or [], "shelves": shelves or []}
+        self.calls = []
+        self.next_id = 10000
+
+    def _request(self, method, path, json_data=None):
+        self.calls.append((method, path))
+        match = re.match(r"/api/(books|chapters|shelves)\?count=(\d+)&offset=(\d+)$", path)
+        if method == "GET" and match:
+            kind, count, offset = match.group(1), int(match.group(2)), int(match.group(3))
+            return {"data": self.store[kind][offset : offset + count]}
+        match = re.match(r"/api/books/(\d+)$", path)
+        if method == "GET" and match:
+            book_id = int(match.group(1))
+            contents = [
+                {"type": "chapter", **chapter} for chapter in self.store["chapters"] if chapter["book_id"] == book_id
+            ]
+            return {"id": book_id, "contents": contents}
+        if method == "POST":
+            self.next_id += 1
+            item = {"id": self.next_id, **(json_data or {})}
+            self.store[path.rsplit("/", 1)[-1]].append(item)
+            return item
+        return {}
+
+
+class BookStackCatalogTests(unittest.TestCase):
+    def test_find_book_by_name_loads_all_pages_once(self):
+        books = [{"id": i, "name": f"Book {i}"} for i in range(1, 1203)]
+        bs = ScriptedBookStackClient(books=books)
+
+        self.assertEqual(bs.find_book_by_name("Book 1100")["id"], 1100)
+        self.assertEqual(bs.find_book_by_name("Book 3")["id"], 3)
+        self.assertIsNone(bs.find_book_by_name("Missing"))
+        self.assertEqual(len(bs.calls), 3)
+
+    def test_catalog_is_updated_on_create_and_delete(self):
+        bs = ScriptedBookStackClient(chapters=[{"id": 5, "book_id": 1, "name": "Intro"}])
+
+        self.assertIsNone(bs.find_book_by_name("New Book"))
+        created = bs.create_book("New Book")
+        self.assertIs(bs.find_book_by_name("New Book"), created)
+
+        bs.list_chapters()
+        chapter = bs.create_chapter(1, "Setup")
+        self.assertIs(bs.catalog.find("chapters", "Setup", book_id=1), chapter)
+        self.assertIsNone(bs.catalog.find("chapters", "Setup", book_id=2))
+
+        bs.delete_chapter(5)
+        self.assertIsNone(bs.catalog.find("chapters", "Intro", book_id=1))
+        self.assertEqual(bs.list_chapters(), [chapter])
+
+    def test_find_chapter_in_book_fetches_contents_once_per_book(self):
+        bs = ScriptedBookStackClient(chapters=[{"id": 5, "book_id": 1, "name": "Getting  Started"}])
+
+        self.assertEqual(bs.find_chapter_in_book(1, "getting started")["id"], 5)
+        self.assertIsNone(bs.find_chapter_in_book(1, "Setup"))
+        created = bs.create_chapter(1, "Setup")
+        self.assertIs(bs.find_chapter_in_book(1, "Setup"), created)
+        self.assertEqual([call for call in bs.calls if call[0] == "GET"], [("GET", "/api/books/1")])
+
+        bs.find_chapter_in_book(1, "Setup", refresh=True)
+        self.assertEqual(bs.calls.count(("GET", "/api/books/1")), 2)
+
+
+class CapturingAdapter(requests.adapters.BaseAdapter):
+    def __init__(self, statuses):
+        super().__init__()
+        self.statuses = list(statuses)
+        self.requests = []
+
+    def send(self, request, **kwargs):
+        self.requests.append(request)
+        response = requests.Response()
+        response.status_code = self.statuses.pop(0)
+        response._content = b'{"url": "https://bookstack.example.com/uploads/a.png", "id": 5}'
+        response.request = request
+        response.url = request.url
+        return response
+
+    def close(self):
+        pass
+
+
+class MultipartUploadTests(unittest.TestCase):
+    def build_client(self, statuses):
+        client = mig.BookStackClient("https://bookstack.example.com", "token_id", "token_secret")
+        client.limiter = mig.RateLimiter(rate=1000, burst=1000)
+        adapter = CapturingAdapter(statuses)
+        client.session.mount("https://", adapter)
+        return client, adapter
+
+    @patch("confluence_to_bookstack_migration.time.sleep", lambda seconds: None)
+    def test_upload_streams_bytes_through_session_with_retry(self):
+        client, adapter = self.build_client([503, 200])
+
+        url = client.upload_gallery_image(7, "a.png", b"\x89PNG-bytes")
+
+        self.assertEqual(url, "https://bookstack.example.com/uploads/a.png")
+        self.assertEqual(len(adapter.requests), 2)
+        sent = adapter.requests[-1]
+        self.assertTrue(sent.headers["Content-Type"].startswith("multipart/form-data"))
+        self.assertTrue(sent.headers["Authorization"].startswith("Token "))
+        self.assertIn(b"\x89PNG-bytes", sent.body)
+        self.assertIn(b'name="uploaded_to"', sent.body)
+
+    def test_update_page_html_falls_back_to_form_data_on_422(self):
+        client, adapter = self.build_client([422, 200])
+
+        client.update_page_html(3, "Seite", "<p>Hallo</p>")
+
+        self.assertEqual(len(adapter.requests), 2)
+        self.assertEqual(adapter.requests[0].headers["Content-Type"], "application/json")
+        self.assertEqual(adapter.requests[1].headers["Content-Type"], "application/x-www-form-urlencoded")
+        self.assertIn("html=%3Cp%3EHallo%3C%2Fp%3E", adapter.requests[1].body)
+
+
+class SlowPageClient(mig.BookStackClient):
+    def __init__(self):
+        super().__init__("https://bookstack.example.com", "token_id", "token_secret")
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+
+    def get_page(self, page_id):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(0.01)
+        with self.lock:
+            self.active -= 1
+        if page_id == 3:
+            raise RuntimeError("gone")
+        return {"id": page_id, "html": f"<p>x</p><!-- confluence_id:{page_id * 100} -->"}
+
+
+class AsyncClientTests(unittest.TestCase):
+    def test_scan_markers_runs_concurrently_within_limit_and_keeps_order(self):
+        client = SlowPageClient()
+        pages = [{"id": page_id, "book_id": 1} for page_id in range(1, 21)]
+
+        found = mig.scan_bookstack_markers(client, pages, limit=5)
+
+        self.assertEqual([conf_id for _, conf_id, _ in found], [str(i * 100) for i in range(1, 21) if i != 3])
+        self.assertGreater(client.peak, 1)
+        self.assertLessEqual(client.peak, 5)
+
+    def test_facade_limits_concurrency_and_returns_results_and_errors_through_await(self):
+        client = SlowPageClient()
+        adapters = dict(client.session.adapters)
+        facade = mig.AsyncBookStackClient(client, limit=3)
+
+        async def run():
+            pages = await asyncio.gather(*(facade.get_page(page_id) for page_id in (1, 2, 4, 5, 6, 7)))
+            with self.assertRaisesRegex(RuntimeError, "gone"):
+                await facade.get_page(3)
+            return pages
+
+        try:
+            pages = asyncio.run(run())
+        finally:
+            facade.close()
+
+        self.assertEqual([page["id"] for page in pages], [1, 2, 4, 5, 6, 7])
+        self.assertGreater(client.peak, 1)
+        self.assertLessEqual(client.peak, 3)
+        self.assertEqual(client.session.adapters, adapters)
+
+    def test_facades_with_different_limits_do_not_share_a_semaphore(self):
+        narrow, wide = SlowPageClient(), SlowPageClient()
+        narrow_facade = mig.AsyncBookStackClient(narrow, limit=2)
+        wide_facade = mig.AsyncBookStackClient(wide, limit=6)
+
+        async def run():
+            await narrow_facade.get_page(1)
+            await asyncio.gather(*(wide_facade.get_page(page_id) for page_id in (1, 2, 4, 5, 6, 7)))
+
+        try:
+            asyncio.run(run())
+        finally:
+            narrow_facade.close()
+            wide_facade.close()
+
+        self.assertGreater(wide.peak, 2)
+        self.assertLessEqual(wide.peak, 6)
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_rate_adapts_to_headers_and_throttling(self):
+        limiter = mig.RateLimiter(rate=5.0, max_rate=25.0)
+
+        limiter.on_response(200, {"X-RateLimit-Limit": "180", "X-RateLimit-Remaining": "170"})
+        self.assertAlmostEqual(limiter.max_rate, 2.7)
+        self.assertAlmostEqual(limiter.rate, 2.7)
+
+        limiter.on_response(429, {"Retry-After": "7"})
+        self.assertAlmostEqual(limiter.rate, 1.35)
+        self.assertEqual(limiter.retry_delay(1, {"Retry-After": "7"}), 7.0)
+
+    def test_healthy_responses_ramp_up(self):
+        limiter = mig.RateLimiter(rate=1.0, max_rate=2.0)
+        for _ in range(5):
+            limiter.on_response(200, {})
+        self.assertAlmostEqual(limiter.rate, 1.5)
+
+    def test_retry_delay_without_header_uses_jittered_backoff(self):
+        limiter = mig.RateLimiter()
+        delays = [limiter.retry_delay(3) for _ in range(20)]
+        self.assertTrue(all(2.0 <= delay <= 6.0 for delay in delays))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,7 @@ import confluence_to_bookstack_migration as mig
 class FakeConfluenceClient:
     pages = []
 
-    def __init__(self, base_url, email, api_token):
+    def __init__(self, base_url, email, api_token, **kwargs):
         self.base_url = base_url
         self.email = email
         self.api_token = api_token
@@ -23,6 +23,9 @@ class FakeConfluenceClient:
     def list_pages_in_space(self, space_key):
         return list(self.pages)
 
+    def iter_pages_in_space(self, space_key, include_body=True):
+        yield list(self.pages)
+
     def get_page_detail(self, page_id):
         for page in self.pages:
             if str(page.get("id")) == str(page_id):
@@ -105,6 +108,53 @@ class CliDryRunTests(unittest.TestCase):
             self.assertEqual(exit_code, 0)
             self.assertTrue(os.path.exists(overview_path))
 
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_cli_closes_page_cache_and_converter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            argv = [
+                "confluence_to_bookstack_migration.py",
+                "--dry-run",
+                "--yes",
+                "--spaces",
+                "SPACE",
+                "--overview-file",
+                os.path.join(tmpdir, "overview.md"),
+                "--cache-file",
+                os.path.join(tmpdir, "cache.sqlite"),
+            ]
+            with patch.dict(os.environ, build_env(), clear=True), patch("sys.argv", argv), patch.object(
+                mig.PageCache, "close", autospec=True, side_effect=mig.PageCache.close
+            ) as cache_close, patch.object(mig.StorageConverter, "shutdown", autospec=True) as converter_shutdown:
+                exit_code = mig.main()
+
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(cache_close.call_count, 1)
+        self.assertEqual(converter_shutdown.call_count, 1)
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_cli_dry_run_migrates_spaces_in_parallel(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            overview_path = os.path.join(tmpdir, "overview.md")
+            argv = [
+                "confluence_to_bookstack_migration.py",
+                "--dry-run",
+                "--yes",
+                "--spaces",
+                "SPACE,OTHER",
+                "--space-workers",
+                "2",
+                "--overview-file",
+                overview_path,
+            ]
+            with patch.dict(os.environ, build_env(), clear=True), patch("sys.argv", argv):
+                exit_code = mig.main()
+
+            self.assertEqual(exit_code, 0)
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "overview_space.md")))
+            self.assertTrue(os.path.exists(os.path.join(tmpdir, "overview_other.md")))
+
 
 if __name__ == "__main__":
     unittest.main()
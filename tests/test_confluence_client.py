@@ -0,0 +1,216 @@
+import os
+import tempfile
+import unittest
+
+import confluence_to_bookstack_migration as mig
+
+
+class ScriptedConfluenceClient(mig.ConfluenceClient):
+    def __init__(self, responses, cache=None):
+        super().__init__("https://acme.atlassian.net", "user@acme.local", "token", cache=cache)
+        self.responses = list(responses)
+        self.calls = []
+
+    def _get_json(self, path, params=None):
+        self.calls.append((path, dict(params or {})))
+        return self.responses.pop(0)
+
+
+def search_response(ids, cursor=None, version=1, body=False):
+    links = {"next": f"/wiki/rest/api/content/search?cursor={cursor}"} if cursor else {}
+    results = []
+    for page_id in ids:
+        page = {"id": page_id, "title": f"Page {page_id}", "version": {"number": version}}
+        if body:
+            page["body"] = {"view": {"value": f"<p>{page_id} v{version}</p>"}}
+        results.append(page)
+    return {"results": results, "_links": links}
+
+
+class IterPagesInSpaceTests(unittest.TestCase):
+    def test_yields_batches_and_skips_duplicates(self):
+        client = ScriptedConfluenceClient(
+            [
+                search_response(["1", "2"], cursor="a"),
+                search_response(["2", "3"], cursor="b"),
+                search_response(["4"]),
+            ]
+        )
+        batches = [[page["id"] for page in batch] for batch in client.iter_pages_in_space("SPACE")]
+
+        self.assertEqual(batches, [["1", "2"], ["3"], ["4"]])
+        self.assertEqual(client.calls[1][1].get("cursor"), "a")
+
+    def test_stops_on_repeated_cursor(self):
+        client = ScriptedConfluenceClient(
+            [
+                search_response(["1"], cursor="a"),
+                search_response(["2"], cursor="a"),
+            ]
+        )
+        pages = client.list_pages_in_space("SPACE")
+
+        self.assertEqual([page["id"] for page in pages], ["1", "2"])
+        self.assertEqual(len(client.calls), 2)
+
+
+class PageCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_entries_are_invalidated_by_version(self):
+        cache = mig.PageCache(self.path)
+        cache.put({"id": "1", "version": {"number": 3}, "title": "A"})
+
+        self.assertEqual(cache.get("1", 3)["title"], "A")
+        self.assertIsNone(cache.get("1", 4))
+        self.assertIsNone(cache.get("1", 3))
+        cache.close()
+
+    def test_least_recently_used_entries_are_evicted(self):
+        cache = mig.PageCache(self.path, max_bytes=300)
+        for page_id in ("1", "2", "3"):
+            cache.put({"id": page_id, "version": {"number": 1}, "body": "x" * 80})
+            cache.get("1", 1)
+
+        self.assertIsNotNone(cache.get("1", 1))
+        self.assertIsNone(cache.get("2", 1))
+        cache.close()
+
+    def test_conversions_do_not_compete_with_pages(self):
+        cache = mig.PageCache(self.path, max_bytes=300)
+        cache.put({"id": "1", "version": {"number": 1}, "body": "x" * 80})
+        for digest in ("a", "b", "c", "d"):
+            cache.put_conversion(digest, "<p>" + "y" * 90 + "</p>")
+
+        self.assertIsNotNone(cache.get("1", 1))
+        self.assertIsNone(cache.get_conversion("a"))
+        self.assertEqual(cache.get_conversion("d"), "<p>" + "y" * 90 + "</p>")
+        self.assertEqual(cache._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0], 1)
+        cache.close()
+
+    def test_repeat_listing_is_served_from_cache(self):
+        cache = mig.PageCache(self.path)
+        first = ScriptedConfluenceClient([search_response(["1", "2"]), search_response(["1", "2"], body=True)], cache=cache)
+        first.list_pages_in_space("SPACE")
+
+        second = ScriptedConfluenceClient([search_response(["1", "2"])], cache=cache)
+        pages = second.list_pages_in_space("SPACE")
+
+        self.assertEqual(len(second.calls), 1)
+        self.assertEqual(second.calls[0][1]["expand"], mig.ConfluenceClient.SKELETON_EXPAND)
+        self.assertEqual(pages[1]["body"]["view"]["value"], "<p>2 v1</p>")
+        self.assertEqual(second.get_page_detail("1")["id"], "1")
+        cache.close()
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, payload=None, content=b""):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.content = content
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class AttachmentSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, params=None, timeout=None):
+        self.urls.append(url)
+        if url.endswith("/child/attachment"):
+            results = [{"id": "att1", "title": "a b.png"}, {"id": "att2", "title": "c.png"}]
+            return FakeResponse(payload={"results": results})
+        if url.endswith("/download"):
+            return FakeResponse(content=url.encode("utf-8"))
+        return FakeResponse(status_code=401)
+
+
+class AttachmentIndexTests(unittest.TestCase):
+    def test_denied_downloads_use_one_listing_per_page(self):
+        client = mig.ConfluenceClient("https://acme.atlassian.net", "user@acme.local", "token")
+        client.session = AttachmentSession()
+
+        first = client.download_binary("/wiki/download/attachments/42/a%20b.png?version=1")
+        second = client.download_binary("/wiki/download/attachments/42/c.png?version=2")
+
+        self.assertTrue(first.endswith(b"/att1/download"))
+        self.assertTrue(second.endswith(b"/att2/download"))
+        listings = [url for url in client.session.urls if url.endswith("/child/attachment")]
+        self.assertEqual(len(listings), 1)
+        self.assertEqual(len(client.session.urls), 4)
+
+
+class SpaceDirectoryTests(unittest.TestCase):
+    def setUp(self):
+        mig.ConfluenceClient._space_directories.clear()
+        self.spaces = {"results": [{"key": "CN", "name": "Customer Network"}, {"key": "AUTO", "name": "Automation"}]}
+
+    def tearDown(self):
+        mig.ConfluenceClient._space_directories.clear()
+
+    def test_resolution_and_names_use_one_listing(self):
+        client = ScriptedConfluenceClient([self.spaces])
+
+        self.assertEqual(client.resolve_space_key("cs"), "CN")
+        self.assertEqual(client.resolve_space_key("auto"), "AUTO")
+        self.assertEqual(client.get_space_name("CN"), "Customer Network")
+        self.assertEqual(ScriptedConfluenceClient([]).get_space_name("AUTO"), "Automation")
+        self.assertEqual([path for path, _ in client.calls], ["/wiki/rest/api/space"])
+
+    def test_directory_is_read_from_disk_within_ttl(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "spaces.json")
+            first = ScriptedConfluenceClient([self.spaces])
+            first.space_directory_file = mig.Path(path)
+            first.get_space_directory()
+            mig.ConfluenceClient._space_directories.clear()
+
+            second = ScriptedConfluenceClient([])
+            second.space_directory_file = mig.Path(path)
+            self.assertEqual(second.get_space_name("CN"), "Customer Network")
+            self.assertEqual(second.calls, [])
+
+
+class CountingConverterClient:
+    def __init__(self):
+        self.calls = []
+
+    def convert_storage_to_view(self, storage_html):
+        self.calls.append(storage_html)
+        return storage_html.replace("ac:", "")
+
+
+class StorageConverterTests(unittest.TestCase):
+    def test_identical_bodies_are_converted_once_and_persisted(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = mig.PageCache(os.path.join(tmpdir, "cache.sqlite"))
+            client = CountingConverterClient()
+            converter = mig.StorageConverter(client, workers=2, cache=cache)
+            converter.submit("<ac:p>A</ac:p>")
+            converter.submit("<ac:p>A</ac:p>")
+
+            self.assertEqual(converter.convert("<ac:p>A</ac:p>"), "<p>A</p>")
+            self.assertEqual(client.calls, ["<ac:p>A</ac:p>"])
+            converter.shutdown()
+
+            other_client = CountingConverterClient()
+            rerun = mig.StorageConverter(other_client, cache=cache)
+            self.assertEqual(rerun.convert("<ac:p>A</ac:p>"), "<p>A</p>")
+            self.assertEqual(other_client.calls, [])
+            rerun.shutdown()
+            cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 import os
 import re
 import tempfile
+import time
 import unittest
 from unittest.mock import patch
 
+import requests
+
 import confluence_to_bookstack_migration as mig
 
 
@@ -21,6 +24,9 @@ class FakeConfluenceClient:
     def list_pages_in_space(self, space_key):
         return list(self.pages)
 
+    def iter_pages_in_space(self, space_key, include_body=True):
+        yield list(self.pages)
+
     def get_page_detail(self, page_id):
         for page in self.pages:
             if str(page.get("id")) == str(page_id):
@@ -57,6 +63,11 @@ class FakeBookStackClient:
         raise AssertionError(f"BookStack method should not be called in dry-run: {name}")
 
 
+def write_page(migrator, item, existing_index, marker_index):
+    item = migrator._update_existing_page(item, existing_index, marker_index)
+    return migrator._finish_page(migrator._create_new_page(item))
+
+
 def build_config():
     return mig.Config(
         confluence_base_url="https://example.atlassian.net",
@@ -128,6 +139,82 @@ class DryRunTests(unittest.TestCase):
         self.assertEqual(children.get("1"), ["2", "3"])
         self.assertIn("2", page_map)
 
+    def test_space_tree_slices_descendants_of_deep_trees(self):
+        depth = 5000
+        children = {str(i): [str(i + 1)] for i in range(depth)}
+        children[str(depth)] = []
+        children["0"].append("side")
+        children["side"] = []
+        tree = mig.SpaceTree(children, ["0"])
+
+        self.assertEqual(tree.subtree_size("0"), depth + 2)
+        self.assertEqual(tree.descendants("4998"), ["4998", "4999", "5000"])
+        self.assertEqual(tree.descendants("0")[-1], "side")
+        self.assertEqual(tree.depth("5000"), depth)
+        self.assertEqual(tree.parent("side"), "0")
+        self.assertIsNone(tree.parent("0"))
+        self.assertEqual(tree["0"], ["1", "side"])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_page_facts_are_computed_once_per_version(self):
+        migrator = mig.Migrator(build_config(), space_key="SPACE", dry_run=True, auto_confirm=True)
+        calls = []
+        original = migrator.conf._has_meaningful_content
+        migrator.conf._has_meaningful_content = lambda html_text: calls.append(html_text) or original(html_text)
+        page = {
+            "id": "7",
+            "version": {"number": 3},
+            "body": {"view": {"value": "<p>Eins &amp; zwei</p><img src='a.png'>"}, "storage": {"value": ""}},
+        }
+
+        facts = migrator._page_facts(page)
+        self.assertIs(migrator._page_facts(dict(page)), facts)
+        self.assertEqual(len(calls), 2)
+        self.assertTrue(facts.has_content)
+        self.assertEqual((facts.image_count, facts.text_length, facts.sample), (1, 11, "Eins & zwei"))
+
+        storage_html = "<p>S</p><ac:image><ri:attachment ri:filename='b.png'/></ac:image>"
+        storage_only = {"id": "9", "version": {"number": 1}, "body": {"storage": {"value": storage_html}}}
+        storage_facts = migrator._page_facts(storage_only)
+        self.assertEqual(storage_facts.image_count, 1)
+        self.assertEqual(storage_facts.content_hash, mig.StorageConverter._digest(storage_html))
+
+        newer = dict(page, version={"number": 4}, body={"view": {"value": ""}, "storage": {"value": ""}})
+        self.assertFalse(migrator._page_facts(newer).has_content)
+        self.assertEqual(migrator._overview_marker(page)[0], "✓")
+        self.assertEqual(len(calls), 6)
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_page_facts_of_listing_stub_do_not_hide_refetched_detail(self):
+        migrator = mig.Migrator(build_config(), space_key="SPACE", dry_run=True, auto_confirm=True)
+        stub = {"id": "8", "title": "Detail", "version": {"number": 2}, "body": {"view": {"value": ""}}}
+        detail = dict(stub, body={"view": {"value": "<p>Echter Inhalt</p>"}, "storage": {"value": ""}})
+        migrator.conf.get_page_detail = lambda page_id: detail
+
+        self.assertFalse(migrator._page_has_content(stub))
+        self.assertTrue(migrator._page_facts(detail).has_content)
+
+        item = migrator._transform_page(1, 1, ("8", "Detail", 0, 0), {"8": stub}, {})
+        self.assertFalse(item["result"]["placeholder"])
+        self.assertIn("Echter Inhalt", item["html"])
+
+    def test_space_tree_trail_titles_reuse_parent_prefix(self):
+        page_map = {
+            "c": {"id": "c", "title": "Chapter"},
+            "a": {"id": "a", "title": "A"},
+            "b": {"id": "b", "title": ""},
+            "d": {"id": "d", "title": "D"},
+            "e": {"id": "e"},
+        }
+        tree = mig.SpaceTree({"c": ["a", "e"], "a": ["b"], "b": ["d"], "d": [], "e": []}, ["c"])
+
+        self.assertEqual(
+            tree.trail_titles(page_map, "c"),
+            {"a": "A", "b": "A / ", "d": "A / D", "e": "Untitled"},
+        )
+
     @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
     @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
     def test_overview_only_skips_bookstack_calls(self):
@@ -144,6 +231,470 @@ class DryRunTests(unittest.TestCase):
             )
             migrator.run()
 
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_load_pages_fetches_missing_details_in_order_and_reports_failures(self):
+        config = build_config()
+        migrator = mig.Migrator(config, space_key="SPACE", dry_run=True, auto_confirm=True, fetch_workers=4)
+        details = {
+            str(i): {"id": str(i), "title": f"Page {i}", "body": {"view": {"value": f"<p>{i}</p>"}}}
+            for i in range(10)
+        }
+
+        def fake_detail(page_id):
+            if page_id == "5":
+                raise RuntimeError("boom")
+            return details[page_id]
+
+        migrator.conf.get_page_detail = fake_detail
+        batches = [[{"id": str(i), "title": f"Page {i}"} for i in range(start, start + 5)] for start in (0, 5)]
+        pages, fetched = migrator._load_pages(iter(batches))
+
+        self.assertEqual(fetched, 10)
+        self.assertEqual([p["id"] for p in pages], [str(i) for i in range(10)])
+        self.assertEqual(pages[3]["body"]["view"]["value"], "<p>3</p>")
+        self.assertNotIn("body", pages[5])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_write_overview_markdown_indents_pages_below_chapter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            overview_path = os.path.join(tmpdir, "overview.md")
+            migrator = mig.Migrator(
+                build_config(), space_key="SPACE", dry_run=True, auto_confirm=True, overview_file=overview_path
+            )
+            page_map = {
+                page_id: {"id": page_id, "title": title, "body": {"view": {"value": f"<p>{title}</p>"}}}
+                for page_id, title in (("b", "Buch"), ("c", "Kapitel"), ("p", "Seite"), ("q", "Unterseite"))
+            }
+            tree = mig.SpaceTree({"b": ["c"], "c": ["p"], "p": ["q"], "q": []}, ["b"])
+            migrator._write_overview_markdown("Space Name", "Book", page_map, tree, ["b"])
+            with open(overview_path, "r", encoding="utf-8") as handle:
+                lines = handle.read().splitlines()
+
+        self.assertIn("- Seiten (ab Ebene 3): **2**", lines)
+        self.assertIn("- ✓ Chapter: Kapitel — Kapitel", lines)
+        self.assertIn("  - ✓ Seite: Seite — Seite", lines)
+        self.assertIn("    - ✓ Seite: Unterseite — Unterseite", lines)
+
+    def test_run_pipeline_keeps_input_order_and_bounds_queues(self):
+        in_flight = []
+        peak = [0]
+
+        def fetch(value):
+            in_flight.append(value)
+            peak[0] = max(peak[0], len(in_flight))
+            return value
+
+        def write(value):
+            time.sleep(0.001 * (12 - value))
+            in_flight.remove(value)
+            return value * 10
+
+        results = mig.run_pipeline(list(range(12)), [(fetch, 4), (write, 2)], queue_size=2)
+
+        self.assertEqual(results, [value * 10 for value in range(12)])
+        self.assertLessEqual(peak[0], 4 + 2 + 2)
+
+    def test_run_pipeline_reraises_first_failure_after_draining(self):
+        written = []
+
+        def transform(value):
+            if value in (3, 7):
+                raise RuntimeError(f"boom {value}")
+            return value
+
+        with self.assertRaisesRegex(RuntimeError, "boom 3"):
+            mig.run_pipeline(list(range(10)), [(transform, 3), (written.append, 1)])
+        self.assertEqual(sorted(written), [0, 1, 2, 4, 5, 6, 8, 9])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_page_pipeline_creates_pages_in_input_order_despite_uneven_delays(self):
+        config = build_config()
+        migrator = mig.Migrator(config, space_key="SPACE", dry_run=False, auto_confirm=True, fetch_workers=8)
+        page_map = {
+            str(number): {"id": str(number), "title": f"Seite {number}", "body": {"view": {"value": f"<p>Text {number}</p>"}}}
+            for number in range(10, 22)
+        }
+        created_pages = [(page_id, page["title"], 0, 1) for page_id, page in page_map.items()]
+        bs = migrator.bs
+        bs.__dict__["created"] = []
+        bs.__dict__["create_page"] = lambda title, html_text, **kwargs: bs.created.append(title) or {"id": len(bs.created)}
+        fetch_page_body, transform_page = migrator._fetch_page_body, migrator._transform_page
+
+        def slow_fetch(task, pages):
+            time.sleep(0.002 * (task[0] % 3))
+            return fetch_page_body(task, pages)
+
+        def slow_transform(idx, *args):
+            time.sleep(0.001 * (len(created_pages) - idx))
+            return transform_page(idx, *args)
+
+        migrator._fetch_page_body, migrator._transform_page = slow_fetch, slow_transform
+        results = migrator._run_page_pipeline(created_pages, page_map, {}, {})
+
+        self.assertEqual(bs.created, [title for _, title, _, _ in created_pages])
+        self.assertEqual([result["bs_page_id"] for result in results], list(range(1, len(created_pages) + 1)))
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_parallel_writers_keep_sibling_order_and_update_in_parallel(self):
+        config = build_config()
+        migrator = mig.Migrator(config, space_key="SPACE", dry_run=False, auto_confirm=True, write_workers=4)
+        page_map = {
+            str(number): {"id": str(number), "title": f"Seite {number}", "body": {"view": {"value": f"<p>Text {number}</p>"}}}
+            for number in range(10, 22)
+        }
+        created_pages = [(page_id, page["title"], 100 + int(page_id) % 2, 1) for page_id, page in page_map.items()]
+        marker_index = {"12": 512, "17": 517}
+        bs = migrator.bs
+        bs.__dict__["created"] = []
+        bs.__dict__["updated"] = []
+
+        def create_page(title, html_text, chapter_id=None, book_id=None):
+            time.sleep(0.003 if int(title.split()[-1]) % 3 == 0 else 0.0005)
+            bs.created.append((chapter_id, title))
+            return {"id": len(bs.created)}
+
+        bs.__dict__["create_page"] = create_page
+        bs.__dict__["update_page_html"] = lambda page_id, title, html_text: bs.updated.append(page_id)
+
+        migrator._run_page_pipeline(created_pages, page_map, {}, marker_index)
+
+        expected = [(chapter_id, title) for page_id, title, chapter_id, _ in created_pages if page_id not in marker_index]
+        self.assertEqual(bs.created, expected)
+        self.assertEqual(sorted(bs.updated), [512, 517])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_load_page_reports_result_without_touching_shared_state(self):
+        config = build_config()
+        migrator = mig.Migrator(config, space_key="SPACE", dry_run=False, auto_confirm=True)
+        page_map = {page["id"]: page for page in FakeConfluenceClient.pages}
+        marker_index = {"3": 77}
+        bs = migrator.bs
+        bs.__dict__["updated"] = []
+        bs.__dict__["create_page"] = lambda title, html_text, **kwargs: {"id": 42}
+        bs.__dict__["update_page_html"] = lambda page_id, title, html_text: bs.updated.append(page_id)
+
+        created = write_page(
+            migrator, migrator._transform_page(1, 2, ("2", "Book A", 0, 1), page_map, marker_index), {}, marker_index
+        )
+        updated = write_page(
+            migrator, migrator._transform_page(2, 2, ("3", "Book B", 0, 1), page_map, marker_index), {}, marker_index
+        )
+
+        self.assertEqual((created["stat"], created["bs_page_id"], created["placeholder"]), ("created", 42, False))
+        self.assertEqual((updated["stat"], updated["bs_page_id"], updated["placeholder"]), ("updated", 77, False))
+        self.assertEqual(marker_index, {"3": 77})
+        self.assertEqual(bs.updated, [77])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_transform_page_skips_unchanged_content(self):
+        config = build_config()
+        migrator = mig.Migrator(config, space_key="SPACE", dry_run=False, auto_confirm=True)
+        page_map = {page["id"]: page for page in FakeConfluenceClient.pages}
+        migrator._content_hashes["3"] = migrator._content_hash("Book B", "<p>Beta</p>")
+
+        item = migrator._transform_page(1, 1, ("3", "Book B", 0, 1), page_map, {"3": 77})
+        self.assertTrue(item["done"])
+        result = write_page(migrator, item, {}, {"3": 77})
+
+        self.assertEqual((result["stat"], result["bs_page_id"]), ("unchanged", 77))
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_failed_image_transfer_drops_content_hash(self):
+        migrator = mig.Migrator(build_config(), space_key="SPACE", dry_run=False, auto_confirm=True)
+        FakeConfluenceClient.pages[1]["body"]["view"]["value"] = '<p>Alpha <img src="/download/attachments/2/a.png"></p>'
+        page_map = {page["id"]: page for page in FakeConfluenceClient.pages}
+        updates = []
+        bs = migrator.bs
+        bs.__dict__["update_page_html"] = lambda page_id, title, html_text: updates.append(html_text)
+
+        def broken_download(src):
+            raise requests.ConnectionError("timeout")
+
+        migrator.conf.download_binary = broken_download
+
+        item = migrator._transform_page(1, 1, ("2", "Book A", 0, 1), page_map, {"2": 77})
+        self.assertIn("content_hash:", item["html"])
+        result = write_page(migrator, item, {}, {"2": 77})
+
+        self.assertEqual(result["stat"], "updated")
+        self.assertIsNone(result["content_hash"])
+        self.assertEqual(len(updates), 2)
+        self.assertNotIn("content_hash:", updates[-1])
+        self.assertIn("confluence_id:2", updates[-1])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_marker_carries_content_hash(self):
+        migrator = mig.Migrator(build_config(), space_key="SPACE", dry_run=True, auto_confirm=True)
+        html_text = migrator._inject_confluence_marker("<p>x</p>", "42", "ab" * 32)
+        self.assertIn(f"<!-- confluence_id:42 content_hash:{'ab' * 32} -->", html_text)
+        self.assertEqual(re.findall(r"confluence_id:(\d+)", html_text), ["42"])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_single_write_uploads_images_and_links_before_one_create(self):
+        config = build_config()
+        migrator = mig.Migrator(config, space_key="SPACE", dry_run=False, auto_confirm=True, single_write=True)
+        FakeConfluenceClient.pages[1]["body"]["view"]["value"] = (
+            '<p>Alpha <img src="/download/attachments/2/a.png?version=1">'
+            ' <a href="https://example.atlassian.net/wiki/spaces/SPACE/pages/3/Book+B">B</a>'
+            ' <a href="https://example.atlassian.net/wiki/spaces/SPACE/pages/9/Later">L</a></p>'
+        )
+        page_map = {page["id"]: page for page in FakeConfluenceClient.pages}
+        calls = []
+        bs = migrator.bs
+        bs.__dict__["create_page"] = lambda title, html_text, **kwargs: calls.append(("create", title, html_text)) or {"id": 50 + len(calls)}
+        bs.__dict__["update_page_html"] = lambda page_id, title, html_text: calls.append(("update", page_id, html_text))
+        bs.__dict__["upload_gallery_image"] = lambda page_id, filename, content: calls.append(("image", page_id)) or "https://bookstack.example.com/a.png"
+        migrator.conf.download_binary = lambda src: b"png"
+
+        migrator._preallocate_page_ids([("2", "Book A", -1, 7)], {}, {"3": 30})
+        item = migrator._transform_page(1, 1, ("2", "Book A", -1, 7), page_map, {"3": 30})
+        result = write_page(migrator, item, {}, {"3": 30})
+
+        self.assertEqual([call[0] for call in calls], ["create", "image", "create"])
+        self.assertEqual(calls[0][1], mig.Migrator.IMAGE_HOLDER_TITLE)
+        self.assertEqual(calls[1], ("image", 51))
+        html_text = calls[2][2]
+        self.assertIn("https://bookstack.example.com/a.png", html_text)
+        self.assertIn('href="https://bookstack.example.com/link/30"', html_text)
+        self.assertEqual(result["stat"], "created")
+        self.assertEqual(result["pending_links"], {"9"})
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_single_write_links_back_to_pages_created_in_the_same_run(self):
+        migrator = mig.Migrator(build_config(), space_key="SPACE", dry_run=False, auto_confirm=True, single_write=True)
+        FakeConfluenceClient.pages[1]["body"]["view"]["value"] = (
+            '<p><a href="https://example.atlassian.net/wiki/spaces/SPACE/pages/3/Book+B">B</a></p>'
+        )
+        FakeConfluenceClient.pages[2]["body"]["view"]["value"] = (
+            '<p><a href="https://example.atlassian.net/wiki/spaces/SPACE/pages/2/Book+A">A</a></p>'
+        )
+        page_map = {page["id"]: page for page in FakeConfluenceClient.pages}
+        created = []
+        migrator.bs.__dict__["create_page"] = lambda title, html_text, **kwargs: created.append(html_text) or {"id": 40 + len(created)}
+        created_pages = [("2", "Book A", 0, 7), ("3", "Book B", 0, 7)]
+
+        migrator._preallocate_page_ids(created_pages, {}, {})
+        results = migrator._run_page_pipeline(created_pages, page_map, {}, {})
+
+        self.assertEqual([result["pending_links"] for result in results], [{"3"}, set()])
+        self.assertIn('href="https://bookstack.example.com/link/41"', created[1])
+        self.assertEqual(migrator._link_targets, {"2": 41, "3": 42})
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_existing_image_holder_is_reused_and_not_indexed(self):
+        migrator = mig.Migrator(build_config(), space_key="SPACE", dry_run=False, auto_confirm=True, single_write=True)
+        listing = [
+            {"id": 61, "book_id": 7, "chapter_id": 0, "name": "Book B"},
+            {"id": 62, "book_id": 7, "chapter_id": 0, "name": mig.Migrator.IMAGE_HOLDER_TITLE},
+        ]
+
+        def fake_request(method, path, json_data=None):
+            if path.startswith("/api/pages?"):
+                return {"data": listing}
+            if path == "/api/pages/61":
+                return {"html": "<p>Beta</p><!-- confluence_id:3 -->"}
+            raise AssertionError(f"unexpected request: {path}")
+
+        migrator.bs.__dict__["_request"] = fake_request
+        migrator.bs.__dict__["create_page"] = lambda *args, **kwargs: self.fail("holder must not be recreated")
+
+        existing_index, marker_index = migrator._index_existing_pages([7], [("3", "Book B", -1, 7)])
+        migrator._preallocate_page_ids([("3", "Book B", -1, 7)], existing_index, marker_index)
+
+        self.assertEqual(marker_index, {"3": 61})
+        self.assertEqual(list(existing_index.values()), [61])
+        self.assertEqual(migrator._image_anchor_page(7), 62)
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_state_replaces_marker_scan_and_search_fills_gaps(self):
+        config = build_config()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state = mig.MigrationState(os.path.join(tmpdir, "state.db"))
+            state.record("page", "3", 77, 1, "Book B", "ab" * 32)
+            state.record("page", "8", 88, 1, "Gone")
+
+            migrator = mig.Migrator(
+                config,
+                space_key="SPACE",
+                dry_run=False,
+                auto_confirm=True,
+                state=state,
+                marker_search=True,
+            )
+            requests_made = []
+
+            def fake_request(method, path, json_data=None):
+                requests_made.append(path)
+                if path.startswith("/api/pages?"):
+                    return {"data": [
+                        {"id": 77, "book_id": 1, "chapter_id": 0, "name": "Book B"},
+                        {"id": 90, "book_id": 1, "chapter_id": 0, "name": "Book A"},
+                        {"id": 95, "book_id": 2, "chapter_id": 0, "name": "Umbenannt"},
+                    ]}
+                if path == "/api/pages/95":
+                    return {"html": "<p>Gamma</p><!-- confluence_id:5 -->"}
+                if path == "/api/pages/90":
+                    return {"html": "<p>Alpha</p><!-- confluence_id:2 -->"}
+                raise AssertionError(f"unexpected request: {path}")
+
+            migrator.bs.__dict__["_request"] = fake_request
+            migrator.bs.__dict__["search_pages"] = lambda query: [{"id": 90, "type": "page"}] if "2" in query else []
+
+            created_pages = [("2", "Book A", -1, 1), ("3", "Book B", -1, 1), ("5", "Book C", -1, 2)]
+            existing_index, marker_index = migrator._index_existing_pages([1, 2], created_pages)
+            forgotten = state.lookup("page", "8")
+            found = state.lookup("page", "2")
+            state.close()
+
+        # Book 2 hat noch keine Zuordnung im Zustand und wird gescannt; Book 1 nicht
+        self.assertEqual(marker_index, {"3": 77, "5": 95, "2": 90})
+        self.assertEqual(migrator._content_hashes, {"3": "ab" * 32})
+        self.assertEqual(
+            requests_made, ["/api/pages?count=500&offset=0", "/api/pages/95", "/api/pages/90"]
+        )
+        self.assertEqual(existing_index[(1, 0, "book a")], 90)
+        self.assertIsNone(forgotten)
+        self.assertEqual(found["bookstack_id"], 90)
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_resume_skips_planning_and_finished_pages(self):
+        config = build_config()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state = mig.MigrationState(os.path.join(tmpdir, "state.db"))
+            first = mig.Migrator(config, space_key="SPACE", dry_run=False, auto_confirm=True, state=state)
+            created_pages = [("2", "Book A", -1, 7), ("3", "Book B", -1, 7)]
+            started = mig.datetime(2026, 1, 2, tzinfo=mig.timezone.utc)
+            first._write_checkpoint(created_pages, [7], started)
+            first._journal_page(
+                created_pages[0], {"bs_page_id": 41, "content_hash": "ab" * 32, "pending_links": {"3", "9"}}
+            )
+
+            resumed = mig.Migrator(config, space_key="SPACE", dry_run=False, auto_confirm=True, state=state, resume=True)
+            resumed.conf.iter_pages_in_space = lambda *args, **kwargs: self.fail("resume must not list the space")
+            captured = {}
+
+            def fake_transfer(summary, page_map, pages, book_ids, run_started, completed=None, completed_links=None):
+                captured.update(
+                    pages=pages,
+                    page_map=page_map,
+                    book_ids=book_ids,
+                    run_started=run_started,
+                    completed=completed,
+                    completed_links=completed_links,
+                )
+                return summary
+
+            resumed._transfer_pages = fake_transfer
+            resumed.run()
+            page_state = state.lookup("page", "2")
+            state.close()
+
+        self.assertEqual(captured["pages"], [("3", "Book B", -1, 7)])
+        self.assertEqual(captured["page_map"], {"3": {"id": "3"}})
+        self.assertEqual(captured["completed"], {"2": 41})
+        self.assertEqual(captured["completed_links"], {"2": {"3", "9"}})
+        self.assertEqual(captured["book_ids"], [7])
+        self.assertEqual(captured["run_started"], started)
+        self.assertEqual(page_state["bookstack_id"], 41)
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_resume_rewrites_links_of_pages_finished_before_the_abort(self):
+        migrator = mig.Migrator(build_config(), space_key="SPACE", dry_run=False, auto_confirm=True, single_write=True)
+        migrator._index_existing_pages = lambda book_ids, created_pages: ({}, {})
+        migrator._preallocate_page_ids = lambda *args: None
+        migrator._run_page_pipeline = lambda *args: [
+            {"stat": "created", "bs_page_id": 53, "placeholder": False, "pending_links": set(), "content_hash": None}
+        ]
+        rewritten = []
+        migrator._rewrite_internal_links = lambda page_map, conf_to_bs, page_ids=None: rewritten.append(
+            (list(page_ids), dict(conf_to_bs))
+        )
+        migrator.image_registry.save = lambda: None
+
+        migrator._transfer_pages(
+            {},
+            {"3": {"id": "3"}},
+            [("3", "Book B", -1, 7)],
+            [7],
+            mig.datetime(2026, 1, 2, tzinfo=mig.timezone.utc),
+            completed={"2": 41},
+            completed_links={"2": {"3"}},
+        )
+
+        self.assertEqual(rewritten, [(["2"], {"2": 41, "3": 53})])
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_skeleton_overview_loads_no_bodies(self):
+        config = build_config()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            overview_path = os.path.join(tmpdir, "overview.md")
+            migrator = mig.Migrator(
+                config,
+                space_key="SPACE",
+                dry_run=False,
+                auto_confirm=True,
+                overview_only=True,
+                overview_file=overview_path,
+                skeleton=True,
+            )
+            skeleton_pages = [{key: value for key, value in page.items() if key != "body"} for page in FakeConfluenceClient.pages]
+            migrator.conf.iter_pages_in_space = lambda space_key, include_body=True: iter([skeleton_pages])
+            migrator.conf.get_page_detail = lambda page_id: self.fail(f"unexpected detail fetch: {page_id}")
+            migrator.run()
+
+            with open(overview_path, "r", encoding="utf-8") as handle:
+                content = handle.read()
+            self.assertIn("- · Buch-Inhalt", content)
+
+    @patch("confluence_to_bookstack_migration.ConfluenceClient", FakeConfluenceClient)
+    @patch("confluence_to_bookstack_migration.BookStackClient", FakeBookStackClient)
+    def test_since_last_run_merges_changed_pages_into_skeleton(self):
+        config = build_config()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            state_path = os.path.join(tmpdir, "sync_state.json")
+            mig.save_sync_state(mig.Path(state_path), {"SPACE": {"last_success": "2026-01-02T03:04:00+00:00"}})
+            migrator = mig.Migrator(
+                config,
+                space_key="SPACE",
+                dry_run=True,
+                auto_confirm=True,
+                since_last_run=True,
+                sync_state_file=state_path,
+            )
+            calls = []
+
+            def fake_iter(space_key, include_body=True, modified_since=None):
+                calls.append(modified_since)
+                if modified_since is not None:
+                    yield [FakeConfluenceClient.pages[2]]
+                else:
+                    yield [{k: v for k, v in page.items() if k != "body"} for page in FakeConfluenceClient.pages]
+
+            migrator.conf.iter_pages_in_space = fake_iter
+            since = migrator._last_sync_time()
+            pages, changed_ids, _ = migrator._load_changed_pages(since)
+
+        self.assertEqual(changed_ids, {"3"})
+        self.assertEqual([page["id"] for page in pages], ["1", "2", "3"])
+        self.assertIn("body", pages[2])
+        self.assertNotIn("body", pages[1])
+        self.assertEqual(calls[0], since - mig.SYNC_OVERLAP)
+
 
 if __name__ == "__main__":
     unittest.main()
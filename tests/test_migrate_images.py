@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+import confluence_to_bookstack_migration as mig
+
+
+def build_config():
+    return mig.Config(
+        confluence_base_url="https://example.atlassian.net",
+        confluence_email="user@example.com",
+        confluence_api_token="token",
+        confluence_space_key="SPACE",
+        bookstack_base_url="https://bookstack.example.com",
+        bookstack_token_id="token_id",
+        bookstack_token_secret="token_secret",
+        book_name_prefix="Confluence - ",
+    )
+
+
+class MigrateImagesTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.registry_path = os.path.join(self.tmpdir.name, "registry.json")
+        self.downloads = []
+        self.uploads = []
+        self.checks = []
+        self.gone = set()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def build_migrator(self, config=None):
+        migrator = mig.Migrator(config or build_config(), space_key="SPACE", image_registry_file=self.registry_path)
+        binaries = {"logo.png": b"logo", "copy.png": b"logo", "chart.png": b"chart"}
+
+        def download(src):
+            self.downloads.append(src)
+            return binaries[src.split("?")[0].rsplit("/", 1)[-1]]
+
+        def upload(page_id, filename, binary):
+            self.uploads.append((page_id, filename))
+            return f"https://bookstack.example.com/uploads/{filename}"
+
+        def exists(url):
+            self.checks.append(url)
+            return url not in self.gone
+
+        migrator.conf.download_binary = download
+        migrator.bs.upload_gallery_image = upload
+        migrator.bs.gallery_image_exists = exists
+        return migrator
+
+    def test_images_are_transferred_once_across_pages_and_runs(self):
+        logo = "https://example.atlassian.net/wiki/download/attachments/1/logo.png?version=1&api=v2"
+        copy = "https://example.atlassian.net/wiki/download/attachments/2/copy.png?version=1"
+        migrator = self.build_migrator()
+
+        html_a, count_a = migrator._migrate_images(f'<img src="{logo}">', 10)
+        html_b, count_b = migrator._migrate_images(f'<img src="{logo.replace("api=v2", "api=v1")}"><img src="{copy}">', 11)
+        migrator.image_registry.save()
+
+        self.assertEqual((count_a, count_b), (1, 2))
+        self.assertIn("/uploads/logo.png", html_b)
+        self.assertNotIn("copy.png", html_b)
+        self.assertEqual(self.uploads, [(10, "logo.png")])
+        self.assertEqual(len(self.downloads), 2)
+
+        self.assertEqual(self.checks, [])
+
+        rerun = self.build_migrator()
+        rerun._migrate_images(f'<img src="{copy}">', 12)
+        rerun._migrate_images(f'<img src="{logo}">', 13)
+        self.assertEqual(len(self.downloads), 2)
+        self.assertEqual(len(self.uploads), 1)
+        self.assertEqual(self.checks, ["https://bookstack.example.com/uploads/logo.png"])
+
+    def test_deleted_uploads_are_forgotten_and_transferred_again(self):
+        logo = "https://example.atlassian.net/wiki/download/attachments/1/logo.png?version=1"
+        first = self.build_migrator()
+        first._migrate_images(f'<img src="{logo}">', 10)
+        first.image_registry.save()
+        self.gone.add("https://bookstack.example.com/uploads/logo.png")
+
+        rerun = self.build_migrator()
+        html_text, count = rerun._migrate_images(f'<img src="{logo}">', 11)
+        rerun.image_registry.save()
+
+        self.assertEqual(count, 1)
+        self.assertEqual(self.uploads, [(10, "logo.png"), (11, "logo.png")])
+        self.assertEqual(len(self.downloads), 2)
+
+    def test_registry_entries_are_scoped_to_the_bookstack_instance(self):
+        logo = "https://example.atlassian.net/wiki/download/attachments/1/logo.png?version=1"
+        first = self.build_migrator()
+        first._migrate_images(f'<img src="{logo}">', 10)
+        first.image_registry.save()
+
+        other_config = build_config()
+        other_config.bookstack_base_url = "https://wiki.example.org"
+        other = self.build_migrator(other_config)
+        other._migrate_images(f'<img src="{logo}">', 20)
+        other.image_registry.save()
+        self.assertEqual(self.uploads, [(10, "logo.png"), (20, "logo.png")])
+
+        rerun = self.build_migrator()
+        rerun._migrate_images(f'<img src="{logo}">', 11)
+        self.assertEqual(len(self.uploads), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
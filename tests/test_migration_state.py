@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+
+import confluence_to_bookstack_migration as mig
+
+
+class MigrationStateTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "state.db")
+        self.state = mig.MigrationState(self.path)
+
+    def tearDown(self):
+        self.state.close()
+        self.tmpdir.cleanup()
+
+    def test_lookups_by_confluence_id_bookstack_id_and_title(self):
+        self.state.record("page", "100", 7, 1, "Netzwerk  Setup", "ab" * 32)
+        self.state.record("chapter", "100", 3, 1, "Netzwerk Setup")
+
+        self.assertEqual(self.state.lookup("page", "100")["bookstack_id"], 7)
+        self.assertEqual(self.state.find_by_bookstack_id("page", 7)["confluence_id"], "100")
+        self.assertEqual([row["bookstack_id"] for row in self.state.find_by_title("page", "netzwerk setup")], [7])
+        self.assertEqual(self.state.lookup("chapter", "100")["bookstack_id"], 3)
+        self.assertEqual(self.state.count("page"), 1)
+
+    def test_state_survives_reopen_and_forget(self):
+        self.state.record("page", "100", 7, 1, "A")
+        self.state.record("page", "101", 8, 1, "B")
+        self.state.mark_progress("tool", "101", "error", "HTTP 500")
+        self.state.forget("page", "100")
+        self.state.close()
+
+        self.state = mig.MigrationState(self.path)
+        self.assertIsNone(self.state.lookup("page", "100"))
+        self.assertEqual(self.state.lookup("page", "101")["title"], "B")
+        self.assertEqual(self.state.progress("tool")["101"]["status"], "error")
+
+    def test_image_registry_reuses_uploads_from_state(self):
+        mig.ImageRegistry(state=self.state).record("attachment:1/a.png@version=1", "d1", "https://bs/a.png")
+
+        registry = mig.ImageRegistry(state=self.state)
+        self.assertEqual(registry.lookup("attachment:1/a.png@version=1"), "https://bs/a.png")
+        self.assertEqual(registry.lookup_hash("d1"), "https://bs/a.png")
+        self.assertIsNone(registry.lookup("attachment:1/b.png"))
+
+
+if __name__ == "__main__":
+    unittest.main()